@@ -6,12 +6,58 @@ try:
     from . import mediapipe_compat
 except ImportError:
     import mediapipe_compat
+try:
+    from .hands_pool import HandsPool, HandsPoolExhausted, HandsPoolFull
+except ImportError:
+    from hands_pool import HandsPool, HandsPoolExhausted, HandsPoolFull
+try:
+    from .frame_admission import FrameAdmission
+except ImportError:
+    from frame_admission import FrameAdmission
+try:
+    from .inference_workers import InferenceWorkerPool, InferenceWorkerError
+except ImportError:
+    from inference_workers import InferenceWorkerPool, InferenceWorkerError
+try:
+    from .motion_gate import MotionGate, hand_roi
+except ImportError:
+    from motion_gate import MotionGate, hand_roi
+try:
+    from .session_registry import SessionRegistry
+except ImportError:
+    from session_registry import SessionRegistry
+try:
+    from . import gesture_features
+except ImportError:
+    import gesture_features
+try:
+    from .temporal_gestures import TemporalGestures
+except ImportError:
+    from temporal_gestures import TemporalGestures
+try:
+    from .state_snapshot import StateSnapshot
+except ImportError:
+    from state_snapshot import StateSnapshot
+try:
+    from .versioned_state import VersionedState
+except ImportError:
+    from versioned_state import VersionedState
+try:
+    from . import binary_state
+except ImportError:
+    import binary_state
+try:
+    from .frame_broadcaster import FrameBroadcaster, FrameSignal
+except ImportError:
+    from frame_broadcaster import FrameBroadcaster, FrameSignal
 import mediapipe as mp
 import numpy as np
 import math
 import time
+import json
 import os
 import threading
+import atexit
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_cors import CORS
 try:
@@ -26,7 +72,9 @@ except ImportError:
     from games.pong_game import PongGame
 # --- PRESENTATION MODULE IMPORTS ---
 import uuid
+import secrets
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 from pptx import Presentation
 from PIL import Image
 import shutil
@@ -111,14 +159,112 @@ def _hands_is_compat_impl() -> bool:
 MIN_DETECTION_CONFIDENCE = float(os.environ.get('MIN_DETECTION_CONFIDENCE', 0.5))
 MIN_TRACKING_CONFIDENCE = float(os.environ.get('MIN_TRACKING_CONFIDENCE', 0.5))
 
-# ✅ GLOBAL MEDIAPIPE HANDS INSTANCE (initialized once, reused for all frames)
-hands = mp_hands.Hands(
-    static_image_mode=False,  # Video mode for better tracking
+# Hands detector pool for HTTP/WebSocket frames. Each session is pinned to its own
+# detector so tracking state never mixes between users; requests without a session
+# use the shared image-mode detectors (shared_hands_pool below).
+HANDS_POOL_SIZE = int(os.environ.get('HANDS_POOL_SIZE', min(4, os.cpu_count() or 1)))
+HANDS_POOL_WARM = int(os.environ.get('HANDS_POOL_WARM', 1))
+HANDS_POOL_IDLE_TIMEOUT = float(os.environ.get('HANDS_POOL_IDLE_TIMEOUT', 300))
+HANDS_CHECKOUT_TIMEOUT = float(os.environ.get('HANDS_CHECKOUT_TIMEOUT', 2.0))
+# Optional: run frame inference in separate processes (0 = in-process pool only)
+INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', 0))
+INFERENCE_SLOT_BYTES = int(os.environ.get('INFERENCE_SLOT_BYTES', 1920 * 1080 * 3))
+# CPU cores per inference process (0 = no limit), so several workers on a shared
+# node don't oversubscribe it. Without worker processes the web process does the
+# inference, so the limit applies to it (before any detector is created).
+INFERENCE_THREADS = int(os.environ.get('INFERENCE_THREADS', 0))
+if INFERENCE_WORKERS <= 0 and INFERENCE_THREADS > 0:
+    cores = mediapipe_compat.limit_inference_threads(INFERENCE_THREADS)
+    print(f"✅ In-process inference limited to {INFERENCE_THREADS} threads (cores {cores})")
+# OpenCV threads in the web process for decode/resize (-1 = OpenCV default; overrides
+# the OpenCV part of INFERENCE_THREADS)
+OPENCV_THREADS = int(os.environ.get('OPENCV_THREADS', -1))
+if OPENCV_THREADS >= 0:
+    cv2.setNumThreads(OPENCV_THREADS)
+
+# Running mode of the per-session (pinned) detectors:
+# image = full detection per frame; video = MediaPipe tracks the hand across frames;
+# live_stream = async detection returning the latest finished result (compat layer only).
+# Detectors that serve several clients (shared_hands_pool, worker processes) always
+# use image mode, so one client's frames never feed another's tracker.
+HAND_RUNNING_MODE = os.environ.get('HAND_RUNNING_MODE', 'video')
+
+FRAME_HANDS_KWARGS = dict(
+    static_image_mode=(HAND_RUNNING_MODE == 'image'),
     max_num_hands=1,
     min_detection_confidence=0.7,
     min_tracking_confidence=0.7
 )
-print("✅ MediaPipe Hands initialized globally")
+if HAND_RUNNING_MODE == 'live_stream' and _hands_is_compat_impl():
+    FRAME_HANDS_KWARGS['running_mode'] = 'live_stream'
+
+
+# Track the hand with a crop around the previous frame's landmarks (per pinned detector).
+# Only with HAND_RUNNING_MODE=image: in video/live_stream mode MediaPipe already runs
+# the landmark model on its own crop around the tracked hand, and handing it a crop
+# that moves between frames would break that tracking. So with the default video mode
+# this is off. Shared detectors never use it (the crop would carry between clients).
+HAND_ROI_TRACKING = os.environ.get('HAND_ROI_TRACKING', '1') == '1' and HAND_RUNNING_MODE == 'image'
+if os.environ.get('HAND_ROI_TRACKING') == '1' and not HAND_ROI_TRACKING:
+    print(f"ℹ️ HAND_ROI_TRACKING only applies to HAND_RUNNING_MODE=image (now {HAND_RUNNING_MODE}) - ignored")
+
+# Dummy inferences run on every new detector before it serves frames, so graph
+# init and buffer allocation don't land on the first user's first gesture.
+HAND_MODEL_WARMUP_FRAMES = int(os.environ.get('HAND_MODEL_WARMUP_FRAMES', 2))
+
+
+def _create_frame_hands():
+    detector = mp_hands.Hands(**FRAME_HANDS_KWARGS)
+    mediapipe_compat.warmup_hands(detector, HAND_MODEL_WARMUP_FRAMES)
+    if HAND_ROI_TRACKING:
+        return mediapipe_compat.RoiTracker(detector)
+    return detector
+
+
+hands_pool = HandsPool(
+    _create_frame_hands,
+    size=HANDS_POOL_SIZE,
+    # Worker processes own their detectors; the local pool is then only a fallback
+    warm=HANDS_POOL_WARM if INFERENCE_WORKERS <= 0 else 0,
+    idle_timeout=HANDS_POOL_IDLE_TIMEOUT,
+)
+print(f"✅ MediaPipe Hands pool initialized (size={HANDS_POOL_SIZE}, warm={HANDS_POOL_WARM})")
+
+# Stateless image-mode detectors for frames that can't have a pinned detector:
+# requests without a session id and sessions beyond HANDS_POOL_SIZE. Any frame can use any of them, so no tracking
+# state carries over between clients and no detector is reloaded per session.
+HANDS_SHARED_POOL_SIZE = int(os.environ.get('HANDS_SHARED_POOL_SIZE', max(1, HANDS_POOL_SIZE // 2)))
+SHARED_HANDS_KWARGS = {k: v for k, v in FRAME_HANDS_KWARGS.items() if k != 'running_mode'}
+SHARED_HANDS_KWARGS['static_image_mode'] = True
+
+
+def _create_shared_hands():
+    detector = mp_hands.Hands(**SHARED_HANDS_KWARGS)
+    mediapipe_compat.warmup_hands(detector, HAND_MODEL_WARMUP_FRAMES)
+    return detector
+
+
+# Created on first use; surplus detectors close after HANDS_POOL_IDLE_TIMEOUT
+shared_hands_pool = HandsPool(
+    _create_shared_hands,
+    size=HANDS_SHARED_POOL_SIZE,
+    warm=0,
+    idle_timeout=HANDS_POOL_IDLE_TIMEOUT,
+)
+
+inference_workers = None
+if INFERENCE_WORKERS > 0:
+    inference_workers = InferenceWorkerPool(
+        INFERENCE_WORKERS,
+        # Sessions share worker detectors, so they run stateless (image mode, no ROI)
+        SHARED_HANDS_KWARGS,
+        slot_bytes=INFERENCE_SLOT_BYTES,
+        timeout=float(os.environ.get('INFERENCE_WORKER_TIMEOUT', 5.0)),
+        warmup_frames=HAND_MODEL_WARMUP_FRAMES,
+        threads=INFERENCE_THREADS,
+    )
+    atexit.register(inference_workers.close)
+    print(f"✅ Inference worker pool configured ({INFERENCE_WORKERS} processes, started on first frame)")
 
 # --- CAMERA STREAM CLASS (DISABLED FOR RENDER - NO SERVER-SIDE WEBCAM) ---
 # NOTE: For local development, uncomment this class. For Render, use HTTP frame processing endpoints instead.
@@ -241,6 +387,11 @@ class CameraStream:
     def __init__(self):
         self.active = False
         self.error = "Server-side camera disabled for cloud deployment"
+        self.initializing = False
+        # A capture thread would publish() each new frame. This stub never does, so the
+        # game feeds only render on their heartbeat (and show "CAMERA IS OFF" without
+        # advancing the games); with a real camera, game speed follows its frame rate.
+        self.frames = FrameSignal()
     
     def start(self, max_retries=3):
         return False
@@ -260,6 +411,7 @@ class MediaPipeWorker:
         self.results = None
         self.processed_frame = None
         self.lock = threading.Lock()
+        self.frames = FrameSignal()  # Published after every processed frame
         self.active = False
         self.thread = None
 
@@ -268,12 +420,14 @@ class MediaPipeWorker:
 
         Important: after stop/start cycles, the previous instance may be closed and unusable.
         """
-        return mp_hands.Hands(
+        hands = mp_hands.Hands(
             static_image_mode=False,
             min_detection_confidence=MIN_DETECTION_CONFIDENCE,
             min_tracking_confidence=MIN_TRACKING_CONFIDENCE,
             max_num_hands=1,
         )
+        mediapipe_compat.warmup_hands(hands, HAND_MODEL_WARMUP_FRAMES)
+        return hands
         
     def start(self):
         """Start MediaPipe processing thread."""
@@ -301,22 +455,14 @@ class MediaPipeWorker:
             success, frame = self.camera_stream.read()
             if success and frame is not None:
                 # Resize for faster processing
-                h, w = frame.shape[:2]
-                if w > 640:
-                    scale = 640.0 / w
-                    frame = cv2.resize(frame, (640, int(h * scale)))
+                frame = resize_for_inference(frame, inference_width("whiteboard"))
                 
                 # Flip for natural interaction
                 frame = cv2.flip(frame, 1)
                 
-                # MediaPipe inference
-                # mediapipe_compat.Hands expects a BGR OpenCV frame and converts internally.
-                # Real mp.solutions.hands.Hands expects RGB.
-                if _hands_is_compat_impl():
-                    results = self.hands.process(frame)
-                else:
-                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = self.hands.process(rgb_frame)
+                # MediaPipe inference (process_bgr does the one BGR->RGB conversion).
+                # Not motion-gated: this loop drives the game and whiteboard feeds.
+                results = mediapipe_compat.process_bgr(self.hands, frame)
                 
                 with self.lock:
                     self.results = results
@@ -325,6 +471,7 @@ class MediaPipeWorker:
                 # Update gesture + hand state continuously so /get_gesture works
                 # even if the MJPEG video feed isn't being viewed.
                 update_shared_state_from_results(results)
+                self.frames.publish()
             
             # Maintain target FPS
             elapsed = time.time() - start_time
@@ -361,9 +508,9 @@ class GestureDebouncer:
         self.stable_gesture = None
         self.last_update_time = 0
     
-    def update(self, raw_gesture):
-        """Update with new gesture detection."""
-        current_time = time.time()
+    def update(self, raw_gesture, now=None):
+        """Update with new gesture detection (now: frame timestamp, defaults to time.time())."""
+        current_time = time.time() if now is None else now
         
         if raw_gesture == self.candidate_gesture:
             # Same candidate - check if stable enough
@@ -437,9 +584,9 @@ class ModeGestureFilter:
         self.last_clear = 0
         self.debounce_time = debounce_time
     
-    def filter(self, gesture):
-        """Filter gesture and return action."""
-        current_time = time.time()
+    def filter(self, gesture, now=None):
+        """Filter gesture and return action (now: frame timestamp, defaults to time.time())."""
+        current_time = time.time() if now is None else now
         
         # Ignore open palm and fist completely
         if gesture in ["open_palm", "fist"]:
@@ -475,24 +622,19 @@ class PinchDetector:
         self.last_pinch_time = 0
         self.was_pinched = False
     
-    def detect_pinch(self, hand_landmarks):
-        """Detect if thumb and index finger are pinched together."""
+    def detect_pinch(self, hand_landmarks, now=None):
+        """Detect if thumb and index finger are pinched together (now: frame timestamp)."""
         if not hand_landmarks:
             self.was_pinched = False
             return False
         
-        # Get thumb tip and index finger tip positions
-        thumb_tip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-        index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        
-        # Calculate Euclidean distance between thumb and index finger tips
-        distance = math.sqrt(
-            (thumb_tip.x - index_tip.x)**2 +
-            (thumb_tip.y - index_tip.y)**2 +
-            (thumb_tip.z - index_tip.z)**2
-        )
-        
-        current_time = time.time()
+        # Euclidean distance between thumb and index finger tips
+        features = gesture_features.compute_features(gesture_features.landmarks_array(hand_landmarks))
+        return self.update(float(features.pinch_distance[0]), now)
+    
+    def update(self, distance, now=None):
+        """Pinch trigger from a precomputed thumb-index tip distance."""
+        current_time = time.time() if now is None else now
         is_pinched = distance < self.pinch_threshold
         
         # Detect pinch trigger (transition from not pinched to pinched)
@@ -519,12 +661,13 @@ class PenStabilizer:
         self.last_y = None
         self.pen_down = False
     
-    def update(self, x, y, action):
+    def update(self, x, y, action, now=None):
         """Update pen position with smoothing and filtering.
         
         Args:
             x, y: Normalized coordinates (0-1)
             action: Filtered action from ModeGestureFilter ('draw', 'erase', etc.)
+            now: Frame timestamp (unused - the EMA works per frame)
         """
         # Determine pen state based on action
         self.pen_down = (action == "draw")
@@ -571,33 +714,221 @@ class PenStabilizer:
         
         return self.smoothed_x, self.smoothed_y, True
 
+# --- ONE EURO PEN FILTER (Low-latency whiteboard mode) ---
+class OneEuroPenFilter:
+    """Adaptive pen smoothing with display-time prediction.
+
+    One Euro filter: the cutoff frequency rises with pen speed, so a slow or
+    resting pen is smoothed heavily (no jitter) while fast strokes follow the
+    finger with little lag. The filtered velocity is then used to extrapolate
+    the pen to when the client will draw it, hiding part of the round-trip.
+
+    Args:
+        min_cutoff: Cutoff (Hz) at rest - lower = smoother, laggier when slow.
+        beta: How fast the cutoff rises with speed (normalized units/s).
+        d_cutoff: Cutoff (Hz) for the velocity estimate.
+        prediction: Seconds to extrapolate past the frame's age (0 disables).
+        min_speed: Speed (units/s) below which prediction fades out, so a
+            resting pen isn't pushed around by noise in the velocity.
+        max_prediction: Largest extrapolation step (normalized), so direction
+            changes don't overshoot.
+        min_movement: Output dead zone (normalized) that hides sub-pixel tremor.
+    """
+    def __init__(self, min_cutoff=0.5, beta=8.0, d_cutoff=1.0, prediction=0.06,
+                 min_speed=0.15, max_prediction=0.04, min_movement=0.002):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.prediction = prediction
+        self.min_speed = min_speed
+        self.max_prediction = max_prediction
+        self.min_movement = min_movement
+        self.pen_down = False
+        self.reset()
+
+    def reset(self):
+        self.x = self.y = None  # Filtered position
+        self.vx = self.vy = 0.0  # Filtered velocity (units/s)
+        self.last_time = None
+        self.last_output = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, x, y, action, now=None):
+        """Same contract as PenStabilizer.update; now is the frame timestamp (server clock).
+
+        Results the motion gate reuses come in as ordinary samples at their own
+        frame time: the gate only reuses a result when the hand hasn't moved, so
+        they are stationary samples. The filter's clock keeps advancing and the
+        output keeps settling on the pen instead of freezing until the next
+        inferred frame.
+        """
+        self.pen_down = (action == "draw")
+        if not self.pen_down:
+            self.reset()
+            return None, None, False
+
+        now = time.time() if now is None else now
+        if self.x is None:
+            self.x, self.y, self.last_time = x, y, now
+            self.last_output = (x, y)
+            return x, y, True
+
+        dt = now - self.last_time
+        if dt <= 0:
+            # A repeated frame carries no new information
+            return self.last_output[0], self.last_output[1], True
+        self.last_time = now
+
+        # Smoothed velocity drives the adaptive cutoff
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.vx += a_d * ((x - self.x) / dt - self.vx)
+        self.vy += a_d * ((y - self.y) / dt - self.vy)
+        speed = math.hypot(self.vx, self.vy)
+
+        a = self._alpha(self.min_cutoff + self.beta * speed, dt)
+        self.x += a * (x - self.x)
+        self.y += a * (y - self.y)
+
+        out_x, out_y = self._predict(now, speed)
+        last_x, last_y = self.last_output
+        if math.hypot(out_x - last_x, out_y - last_y) < self.min_movement:
+            return last_x, last_y, True
+        self.last_output = (out_x, out_y)
+        return out_x, out_y, True
+
+    def _predict(self, now, speed):
+        """Extrapolate to display time: the frame's age plus the configured lead."""
+        if not self.prediction or not self.min_speed or speed <= self.min_speed:
+            return self.x, self.y
+        lead = (max(0.0, time.time() - now) + self.prediction) * min(1.0, speed / self.min_speed - 1.0)
+        dx, dy = self.vx * lead, self.vy * lead
+        step = math.hypot(dx, dy)
+        if step > self.max_prediction:
+            dx, dy = dx * self.max_prediction / step, dy * self.max_prediction / step
+        return min(1.0, max(0.0, self.x + dx)), min(1.0, max(0.0, self.y + dy))
+
+
+# "one_euro" (default): adaptive low-latency filter with prediction; "ema": fixed-alpha EMA
+PEN_FILTER = os.environ.get('PEN_FILTER', 'one_euro')
+PEN_PREDICTION_MS = float(os.environ.get('PEN_PREDICTION_MS', 60))
+
+
+def create_pen_filter():
+    if PEN_FILTER == 'ema':
+        # Improved pen stabilizer: lower alpha = smoother, higher min_movement = less jitter, lower max_velocity = more controlled
+        return PenStabilizer(alpha=0.3, min_movement=0.005, max_velocity=0.08)
+    return OneEuroPenFilter(
+        min_cutoff=float(os.environ.get('PEN_MIN_CUTOFF', 0.5)),
+        beta=float(os.environ.get('PEN_BETA', 8.0)),
+        prediction=PEN_PREDICTION_MS / 1000.0,
+    )
+
 # --- GLOBAL INSTANCES ---
 camera_stream = CameraStream()
 mediapipe_worker = MediaPipeWorker(camera_stream)
-gesture_debouncer = GestureDebouncer(stability_time=0.15)  # Stable gesture response (150ms)
-gesture_transition_detector = GestureTransitionDetector(cooldown_time=0.4)
-pinch_detector = PinchDetector(pinch_threshold=0.05, cooldown_time=0.5)  # For Dino Run jump
-# Improved pen stabilizer: lower alpha = smoother, higher min_movement = less jitter, lower max_velocity = more controlled
-pen_stabilizer = PenStabilizer(alpha=0.3, min_movement=0.005, max_velocity=0.08)
-# Whiteboard mode management
-whiteboard_mode = WhiteboardMode()
-mode_gesture_filter = ModeGestureFilter(debounce_time=0.3)
+
+# --- PER-SESSION GESTURE PIPELINE ---
+# Response body of each gesture state endpoint, derived from a StateSnapshot
+STATE_SECTIONS = {
+    "gesture": lambda snap: {"gesture": snap.gesture, "motion": snap.motion},
+    "hand": lambda snap: snap.hand_position,
+    "pen": lambda snap: snap.pen,
+    "whiteboard": lambda snap: {
+        "action": snap.whiteboard["action"],
+        "stroke_size": snap.whiteboard["stroke_size"],
+        "pen": snap.pen,
+        "hand_position": snap.hand_position
+    },
+}
+
+
+class GestureSession:
+    """Gesture/pen pipeline state for one client.
+
+    Every session has its own debounce timers, pen smoothing and whiteboard state,
+    so concurrent users don't reset each other's filters. lock serializes writers
+    only; readers just take self.snapshot.
+    """
+    def __init__(self, lock=None):
+        self.lock = lock or threading.Lock()
+        self.debouncer = GestureDebouncer(stability_time=0.15)  # Stable gesture response (150ms)
+        self.transition_detector = GestureTransitionDetector(cooldown_time=0.4)
+        self.pinch_detector = PinchDetector(pinch_threshold=0.05, cooldown_time=0.5)  # For Dino Run jump
+        self.pen_stabilizer = create_pen_filter()
+        # Whiteboard mode management
+        self.whiteboard_mode = WhiteboardMode()
+        self.mode_filter = ModeGestureFilter(debounce_time=0.3)
+        # Landmark history for swipes / holds / circles
+        self.temporal = TemporalGestures()
+        # Latest frame time fed to the pipeline; keeps the history in time order
+        self.last_frame_time = 0.0
+        # Published state: replaced (never mutated) under self.lock, read without it
+        self.snapshot = StateSnapshot()
+        # Notified on every publish, for streaming / long-polling readers
+        self.changed = threading.Condition(self.lock)
+        # What each state endpoint serves, versioned for conditional GET / long-polls
+        self.sections = {
+            name: VersionedState(view(self.snapshot), self.changed)
+            for name, view in STATE_SECTIONS.items()
+        }
+        # {name: (version, value)} of all sections from the same publish, for batched reads
+        self.section_views = {name: section.current for name, section in self.sections.items()}
+
+    def publish(self, snapshot):
+        """Swap in the next snapshot and wake waiting readers (caller holds self.lock)."""
+        self.snapshot = snapshot
+        for name, view in STATE_SECTIONS.items():
+            self.sections[name].set_locked(view(snapshot))
+        self.section_views = {name: section.current for name, section in self.sections.items()}
+        self.changed.notify_all()
+        return snapshot
+
+    def wait_for_change(self, version, timeout):
+        """Current snapshot once its version differs from version, or after timeout."""
+        snapshot = self.snapshot
+        if snapshot.version == version:
+            with self.changed:
+                self.changed.wait_for(lambda: self.snapshot.version != version, timeout)
+            snapshot = self.snapshot
+        return snapshot
+
 
 # --- SHARED STATE (Thread-safe) ---
+# Writer lock of the default session (readers use default_session.snapshot)
 state_lock = threading.Lock()
-shared_state = {
-    "gesture": None,
-    "gesture_time": 0,
-    "hand_position": {"x": 0, "y": 0, "z": 0, "visible": False},
-    "smoothed_pen": {"x": 0, "y": 0, "pen_down": False},  # For whiteboard
-    "jump_trigger": False,  # For Dino Run
-    "landmarks": None,
-    "results": None,
-    "whiteboard": {  # Whiteboard state
-        "action": None,
-        "stroke_size": 3
-    }
-}
+# The default session serves the server-side camera and clients that send no session id
+DEFAULT_GESTURE_SESSION = "default"
+default_session = GestureSession(lock=state_lock)
+gesture_sessions = SessionRegistry(
+    lambda key: GestureSession(),
+    max_sessions=int(os.environ.get('GESTURE_SESSION_MAX', 256)),
+    ttl=float(os.environ.get('GESTURE_SESSION_TTL', 600)),
+    pinned={DEFAULT_GESTURE_SESSION: default_session},
+)
+
+# Module-level names for the MJPEG generators and other default-session code paths
+gesture_debouncer = default_session.debouncer
+gesture_transition_detector = default_session.transition_detector
+pinch_detector = default_session.pinch_detector
+pen_stabilizer = default_session.pen_stabilizer
+whiteboard_mode = default_session.whiteboard_mode
+mode_gesture_filter = default_session.mode_filter
+
+
+def gesture_session(session_id=None):
+    """Pipeline state for a client session id (the default session when None)."""
+    if not session_id:
+        return default_session
+    return gesture_sessions.get(session_id)
+
+
+def request_gesture_session():
+    """Pipeline state for the current request's X-Session-Id header or ?session= param."""
+    return gesture_session(frame_session_id())
 
 # --- LEGACY COMPATIBILITY ---
 camera_lock = threading.Lock()
@@ -623,12 +954,41 @@ dino_lock = threading.Lock()
 pong_game = PongGame()
 pong_lock = threading.Lock()
 
+# Body of each /<game>_state endpoint: (lock, reader called with the lock held)
+GAME_STATES = {
+    "snake": (snake_lock, lambda: {
+        'score': snake_game.score,
+        'game_over': snake_game.game_over,
+        'snake_length': len(snake_game.points)
+    }),
+    "fruit": (fruit_lock, lambda: {
+        'score': fruit_game.score,
+        'game_over': fruit_game.game_over,
+        'lives': fruit_game.lives
+    }),
+    "dino": (dino_lock, lambda: {
+        'score': dino_game.score,
+        'game_over': dino_game.game_over
+    }),
+    "pong": (pong_lock, pong_game.get_state),
+}
+game_state_sources = {name: VersionedState() for name in GAME_STATES}
+
+
+def publish_game_state(name):
+    """Refresh a game's versioned state, waking long-polling clients if it changed."""
+    lock, read = GAME_STATES[name]
+    with lock:
+        state = read()
+    game_state_sources[name].set(state)
+
 # --- PRESENTATION STATE ---
 presentation_state = {
     "active": False,
     "total_slides": 0,
     "session_id": None
 }
+presentation_state_source = VersionedState()
 
 
 
@@ -691,179 +1051,112 @@ users = {
     }
 }
 
-# --- LEGACY STATE (for compatibility) ---
-gesture_state = {"last_gesture": None, "last_gesture_time": 0}
-hand_position = {"x": 0, "y": 0, "z": 0, "visible": False}
-
 # --- STATE UPDATE FROM MEDIAPIPE ---
-def update_shared_state_from_results(results):
-    """Update shared_state + legacy gesture_state/hand_position from MediaPipe results.
+def update_shared_state_from_results(results, now=None, features=None, session=None):
+    """Run a session's gesture pipeline on MediaPipe results and publish its next snapshot.
 
     This is called from the MediaPipe worker thread so gesture polling is reliable.
+    now is the frame's timestamp (server clock); it defaults to time.time().
+    features are the first hand's gesture_features, if the caller already has them.
+    session is a GestureSession (default: the default session).
+    Returns the published StateSnapshot.
     """
+    if now is None:
+        now = time.time()
+    if session is None:
+        session = default_session
+    with session.lock:
+        # Frames from separate requests can arrive out of order; never go back in time
+        # (the landmark history and the debounce timers assume increasing timestamps)
+        now = max(now, session.last_frame_time)
+        session.last_frame_time = now
     if results and results.multi_hand_landmarks:
         hand_landmarks = results.multi_hand_landmarks[0]
+        landmarks = gesture_features.landmarks_from_results(results)[0]
+        if features is None:
+            features = gesture_features.compute_features(landmarks)
 
-        index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
+        tip_x, tip_y, tip_z = (float(v) for v in features.index_tip[0])
 
-        raw_gesture = detect_gesture(hand_landmarks)
+        raw_gesture = features.gestures[0]
         # Reduce flicker: treat "unknown" as no-gesture
         if raw_gesture == "unknown":
             raw_gesture = None
 
-        stable_gesture = gesture_debouncer.update(raw_gesture)
+        stable_gesture = session.debouncer.update(raw_gesture, now)
         
         # Filter gesture for whiteboard action
-        filtered_action = mode_gesture_filter.filter(stable_gesture)
+        filtered_action = session.mode_filter.filter(stable_gesture, now)
         
         # Get current stroke size (controlled only by dropdown now)
-        current_stroke_size = whiteboard_mode.get_stroke_size()
+        current_stroke_size = session.whiteboard_mode.get_stroke_size()
 
-        smoothed_x, smoothed_y, pen_is_down = pen_stabilizer.update(
-            index_tip.x, index_tip.y, filtered_action
+        smoothed_x, smoothed_y, pen_is_down = session.pen_stabilizer.update(
+            tip_x, tip_y, filtered_action, now
         )
 
         # Detect jump triggers for Dino Run (pinch gesture)
-        pinch_triggered = pinch_detector.detect_pinch(hand_landmarks)
+        pinch_triggered = session.pinch_detector.update(float(features.pinch_distance[0]), now)
         jump_triggered = pinch_triggered  # Use pinch for jump instead of gesture transition
 
-        with state_lock:
-            shared_state["hand_position"] = {
-                "x": index_tip.x,
-                "y": index_tip.y,
-                "z": index_tip.z,
-                "visible": True
-            }
-            shared_state["smoothed_pen"] = {
-                "x": smoothed_x if smoothed_x is not None else index_tip.x,
-                "y": smoothed_y if smoothed_y is not None else index_tip.y,
-                "pen_down": pen_is_down
-            }
-            shared_state["jump_trigger"] = jump_triggered
-            shared_state["gesture"] = stable_gesture
-            shared_state["gesture_time"] = time.time()
-            shared_state["landmarks"] = hand_landmarks
-            shared_state["results"] = results
-            
-            # Update whiteboard state
-            shared_state["whiteboard"] = {
-                "action": filtered_action,
-                "stroke_size": current_stroke_size
-            }
-            
-            # Debug logging for clear action
-            if filtered_action == "clear_canvas":
-                print(f"[Whiteboard State] Clear canvas action sent to frontend")
-
-            hand_position["x"] = index_tip.x
-            hand_position["y"] = index_tip.y
-            hand_position["z"] = index_tip.z
-            hand_position["visible"] = True
-            gesture_state["last_gesture"] = stable_gesture
-            gesture_state["last_gesture_time"] = time.time()
-    else:
-        gesture_debouncer.update(None)
-        pen_stabilizer.update(0, 0, None)
-
-        with state_lock:
-            shared_state["hand_position"]["visible"] = False
-            shared_state["smoothed_pen"]["pen_down"] = False
-            shared_state["jump_trigger"] = False
-            shared_state["whiteboard"]["action"] = None
-            hand_position["visible"] = False
-
-            if time.time() - shared_state["gesture_time"] > 1.0:
-                shared_state["gesture"] = None
-                gesture_state["last_gesture"] = None
+        motion = session.temporal.update(now, landmarks, int(features.codes[0]))
+        if motion:
+            print(f"[Motion] {motion[0]}" + (f" ({motion[1]})" if motion[1] else ""))
 
-def update_shared_state():
-    """Update shared state from MediaPipe worker results."""
-    results, _ = mediapipe_worker.get_results()
+        # Debug logging for clear action
+        if filtered_action == "clear_canvas":
+            print(f"[Whiteboard State] Clear canvas action sent to frontend")
 
-    update_shared_state_from_results(results)
+        changes = {
+            "hand_position": {"x": tip_x, "y": tip_y, "z": tip_z, "visible": True},
+            "pen": {
+                "x": smoothed_x if smoothed_x is not None else tip_x,
+                "y": smoothed_y if smoothed_y is not None else tip_y,
+                "pen_down": pen_is_down
+            },
+            "jump_trigger": jump_triggered,
+            "gesture": stable_gesture,
+            "gesture_time": now,
+            "landmarks": hand_landmarks,
+            "results": results,
+            "whiteboard": {"action": filtered_action, "stroke_size": current_stroke_size},
+        }
+        with session.lock:
+            previous = session.snapshot
+            if motion:
+                changes["motion"] = {
+                    "event": motion[0],
+                    "gesture": motion[1],
+                    "time": now,
+                    "seq": previous.motion["seq"] + 1
+                }
+            snapshot = session.publish(previous.evolve(**changes))
+    else:
+        session.debouncer.update(None, now)
+        session.pen_stabilizer.update(0, 0, None, now)
+        session.temporal.update(now)
+
+        with session.lock:
+            previous = session.snapshot
+            changes = {
+                "hand_position": {**previous.hand_position, "visible": False},
+                "pen": {**previous.pen, "pen_down": False},
+                "jump_trigger": False,
+                "whiteboard": {**previous.whiteboard, "action": None},
+            }
+            if now - previous.gesture_time > 1.0:
+                changes["gesture"] = None
+            snapshot = session.publish(previous.evolve(**changes))
+    return snapshot
 
 def detect_gesture(hand_landmarks):
-    """Detect hand gestures with improved reliability using margins and wrist reference."""
-    # Get landmark positions
-    wrist = hand_landmarks.landmark[mp_hands.HandLandmark.WRIST]
-    thumb_tip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_TIP]
-    thumb_ip = hand_landmarks.landmark[mp_hands.HandLandmark.THUMB_IP]
-    index_finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-    index_finger_pip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_PIP]
-    index_finger_mcp = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_MCP]
-    middle_finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-    middle_finger_pip = hand_landmarks.landmark[mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
-    middle_finger_mcp = hand_landmarks.landmark[mp_hands.HandLandmark.MIDDLE_FINGER_MCP]
-    ring_finger_tip = hand_landmarks.landmark[mp_hands.HandLandmark.RING_FINGER_TIP]
-    ring_finger_pip = hand_landmarks.landmark[mp_hands.HandLandmark.RING_FINGER_PIP]
-    pinky_tip = hand_landmarks.landmark[mp_hands.HandLandmark.PINKY_TIP]
-    pinky_pip = hand_landmarks.landmark[mp_hands.HandLandmark.PINKY_PIP]
-    
-    # Add margin for more reliable detection (finger must be clearly extended/folded)
-    margin = 0.02
-    
-    # Helper function to check if finger is extended
-    def is_finger_extended(tip, pip, margin=0.02):
-        return tip.y < (pip.y - margin)
-    
-    # Helper function to check if finger is folded
-    def is_finger_folded(tip, pip, margin=0.02):
-        return tip.y > (pip.y + margin)
-    
-    # Count extended fingers for better classification
-    index_extended = is_finger_extended(index_finger_tip, index_finger_pip, margin)
-    middle_extended = is_finger_extended(middle_finger_tip, middle_finger_pip, margin)
-    ring_extended = is_finger_extended(ring_finger_tip, ring_finger_pip, margin)
-    pinky_extended = is_finger_extended(pinky_tip, pinky_pip, margin)
-    
-    index_folded = is_finger_folded(index_finger_tip, index_finger_pip, margin)
-    middle_folded = is_finger_folded(middle_finger_tip, middle_finger_pip, margin)
-    ring_folded = is_finger_folded(ring_finger_tip, ring_finger_pip, margin)
-    pinky_folded = is_finger_folded(pinky_tip, pinky_pip, margin)
-    
-    # 1. One Finger Up (Index finger only) - Drawing / Next Slide
-    if index_extended and middle_folded and ring_folded and pinky_folded:
-        return "one_finger_up"
-    
-    # 2. Two Fingers Up (Index and Middle) - Erase / Previous Slide
-    if index_extended and middle_extended and ring_folded and pinky_folded:
-        return "two_fingers_up"
-    
-    # 3. Three Fingers Up (Index, Middle, Ring) - Color change
-    if index_extended and middle_extended and ring_extended and pinky_folded:
-        return "three_fingers_up"
-    
-    # 4. Pinky Finger Only - Clear canvas (must check with folded, not just "not extended")
-    if index_folded and middle_folded and ring_folded and pinky_extended:
-        return "pinky_finger_up"
-    
-    # 5. Thumbs Up - Keep for other uses (check BEFORE fist to avoid confusion)
-    thumb_up = thumb_tip.y < index_finger_mcp.y and thumb_tip.y < middle_finger_mcp.y
-    if thumb_up and index_folded and middle_folded and ring_folded and pinky_folded:
-        return "thumbs_up"
-    
-    # 6. Fist - Ignored (no action)
-    if index_folded and middle_folded and ring_folded and pinky_folded:
-        return "fist"
-    
-    # 7. Open Palm - Ignored (all fingers extended)
-    thumb_extended = thumb_tip.y < thumb_ip.y
-    if index_extended and middle_extended and ring_extended and pinky_extended and thumb_extended:
-        return "open_palm"
-    
-    # Default to unknown
-    return "unknown"
-
-def update_hand_position(hand_landmarks):
-    if hand_landmarks:
-        # Use the index finger tip for game control
-        index_tip = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        hand_position["x"] = index_tip.x
-        hand_position["y"] = index_tip.y
-        hand_position["z"] = index_tip.z
-        hand_position["visible"] = True
-    else:
-        hand_position["visible"] = False
+    """Gesture name for one hand (legacy landmark list or (21, 3) array).
+
+    Single-hand wrapper around gesture_features.classify_gestures: each finger is
+    extended or folded by its tip's height against its PIP joint (0.02 margin),
+    and the finger bits plus two thumb flags index the precomputed gesture table.
+    """
+    return gesture_features.classify_gestures(gesture_features.landmarks_array(hand_landmarks))[0]
 
 # --- FRAME GENERATION ---
 frame_skip = 0  # Skip every other frame to reduce processing
@@ -1033,215 +1326,220 @@ def convert_ppt_to_images_libreoffice(ppt_path, output_dir):
         os.remove(pdf_path)
         raise ImportError("pdf2image required for PDF conversion. Install: pip install pdf2image")
 
-def generate_frames():
-    """MJPEG stream with MediaPipe visualization (reads from shared state)."""
-    while True:
-        try:
-            # Update shared state from MediaPipe worker
-            update_shared_state()
-            
-            # Get processed frame from MediaPipe worker
-            results, frame = mediapipe_worker.get_results()
-            
-            if frame is None or not camera_stream.active:
-                frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                if camera_stream.initializing:
-                    cv2.putText(frame, "INITIALIZING CAMERA...", (120, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-                    cv2.putText(frame, "Please wait...", (200, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                elif camera_stream.error:
-                    cv2.putText(frame, "CAMERA ERROR", (180, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                    cv2.putText(frame, str(camera_stream.error)[:50], (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-                else:
-                    cv2.putText(frame, "CAMERA IS OFF", (150, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                    cv2.putText(frame, "Click 'Start Camera' to begin", (100, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            else:
-                # Draw hand landmarks from shared results
-                if results and results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                    
-                    # Display gesture
-                    with state_lock:
-                        current_gesture = shared_state["gesture"]
-                    
-                    gesture_names = {
-                        "one_finger_up": "One Finger Up",
-                        "two_fingers_up": "Two Fingers Up",
-                        "three_fingers_up": "Three Fingers Up",
-                        "pinky_finger_up": "Pinky Finger Up",
-                        "thumbs_up": "Thumbs Up",
-                        "fist": "Fist",
-                        "open_palm": "Open Palm",
-                        "unknown": "Unknown"
-                    }
-                    
-                    display_text = gesture_names.get(current_gesture, "Unknown") if current_gesture else "Unknown"
-                    cv2.putText(frame, f"Gesture: {display_text}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-                    cv2.putText(frame, "MediaPipe: HAND DETECTED", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                else:
-                    cv2.putText(frame, "No Hands Detected", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                    cv2.putText(frame, "MediaPipe: NO HANDS", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-        except Exception as e:
-            print(f"[generate_frames] Error: {e}")
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(frame, "STREAM ERROR", (180, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-        
-        # Add timestamp
-        cv2.putText(frame, f"Time: {time.strftime('%H:%M:%S')}", (10, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
-        # Encode and yield
-        try:
-            ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 85])
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-        except Exception as e:
-            print(f"Encoding error: {e}")
-        
-        time.sleep(0.033)  # 30 FPS
+def encode_mjpeg_frame(frame, quality, error_label):
+    """JPEG-encode a frame as one multipart/x-mixed-replace part (None on failure)."""
+    try:
+        ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        if ret:
+            return (b'--frame\r\n'
+                    b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+    except Exception as e:
+        print(f"{error_label}: {e}")
+    return None
 
 
-def generate_snake_frames():
-    """MJPEG stream for Snake game (uses shared camera and MediaPipe state)."""
-    while True:
-        success, frame = camera_stream.read()
+def render_video_frame():
+    """Render one frame of the main video feed (MediaPipe visualization from shared state)."""
+    try:
+        # Get processed frame from MediaPipe worker (which already published its gesture state)
+        results, frame = mediapipe_worker.get_results()
         
-        if not success or frame is None or not camera_stream.active:
+        if frame is None or not camera_stream.active:
             frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            cv2.putText(frame, "Start camera to play Snake", (80, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            if camera_stream.initializing:
+                cv2.putText(frame, "INITIALIZING CAMERA...", (120, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+                cv2.putText(frame, "Please wait...", (200, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            elif camera_stream.error:
+                cv2.putText(frame, "CAMERA ERROR", (180, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                cv2.putText(frame, str(camera_stream.error)[:50], (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+            else:
+                cv2.putText(frame, "CAMERA IS OFF", (150, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+                cv2.putText(frame, "Click 'Start Camera' to begin", (100, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
         else:
-            frame = cv2.flip(frame, 1)
-            
-            # Get hand position from shared state
-            index_tip_pixel = None
-            with state_lock:
-                if shared_state["hand_position"]["visible"]:
-                    h, w, _ = frame.shape
-                    cx = int(shared_state["hand_position"]["x"] * w)
-                    cy = int(shared_state["hand_position"]["y"] * h)
-                    index_tip_pixel = (cx, cy)
-            
-            # Update snake game
-            with snake_lock:
-                frame = snake_game.update(frame, index_tip_pixel)
-        
-        cv2.putText(frame, "Snake Game", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
-        
-        try:
-            ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-        except Exception as e:
-            print(f"Snake encoding error: {e}")
-        
-        time.sleep(0.033)  # 30 FPS
+            # Draw hand landmarks from shared results
+            if results and results.multi_hand_landmarks:
+                for hand_landmarks in results.multi_hand_landmarks:
+                    mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+                
+                # Display gesture
+                current_gesture = default_session.snapshot.gesture
+                
+                gesture_names = {
+                    "one_finger_up": "One Finger Up",
+                    "two_fingers_up": "Two Fingers Up",
+                    "three_fingers_up": "Three Fingers Up",
+                    "pinky_finger_up": "Pinky Finger Up",
+                    "thumbs_up": "Thumbs Up",
+                    "fist": "Fist",
+                    "open_palm": "Open Palm",
+                    "unknown": "Unknown"
+                }
+                
+                display_text = gesture_names.get(current_gesture, "Unknown") if current_gesture else "Unknown"
+                cv2.putText(frame, f"Gesture: {display_text}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+                cv2.putText(frame, "MediaPipe: HAND DETECTED", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            else:
+                cv2.putText(frame, "No Hands Detected", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                cv2.putText(frame, "MediaPipe: NO HANDS", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    except Exception as e:
+        print(f"[video_feed] Error: {e}")
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(frame, "STREAM ERROR", (180, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+    
+    # Add timestamp
+    cv2.putText(frame, f"Time: {time.strftime('%H:%M:%S')}", (10, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    
+    return encode_mjpeg_frame(frame, 85, "Encoding error")
 
 
-def generate_fruit_frames():
-    """MJPEG stream for Fruit Ninja (uses shared camera and MediaPipe state)."""
-    while True:
-        success, frame = camera_stream.read()
-        
-        if not success or frame is None or not camera_stream.active:
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            cv2.putText(frame, "Start camera to play Fruit Ninja", (40, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        else:
-            frame = cv2.flip(frame, 1)
-            
-            # Get hand position from shared state
-            index_tip_pixel = None
-            with state_lock:
-                if shared_state["hand_position"]["visible"]:
-                    h, w, _ = frame.shape
-                    cx = int(shared_state["hand_position"]["x"] * w)
-                    cy = int(shared_state["hand_position"]["y"] * h)
-                    index_tip_pixel = (cx, cy)
-            
-            # Update fruit game
-            with fruit_lock:
-                frame = fruit_game.update(frame, index_tip_pixel, time.time())
-        
-        cv2.putText(frame, "Fruit Ninja", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
-        
-        try:
-            ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-        except Exception as e:
-            print(f"Fruit encoding error: {e}")
-        
-        time.sleep(0.033)  # 30 FPS
+def render_snake_frame():
+    """Advance Snake one tick and render its frame (uses shared camera and MediaPipe state)."""
+    success, frame = camera_stream.read()
+    
+    if not success or frame is None or not camera_stream.active:
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        cv2.putText(frame, "Start camera to play Snake", (80, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    else:
+        frame = cv2.flip(frame, 1)
+        
+        # Get hand position from shared state
+        index_tip_pixel = None
+        hand = default_session.snapshot.hand_position
+        if hand["visible"]:
+            h, w, _ = frame.shape
+            cx = int(hand["x"] * w)
+            cy = int(hand["y"] * h)
+            index_tip_pixel = (cx, cy)
+        
+        # Update snake game
+        with snake_lock:
+            frame = snake_game.update(frame, index_tip_pixel)
+        publish_game_state('snake')
+    
+    cv2.putText(frame, "Snake Game", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+    
+    return encode_mjpeg_frame(frame, 80, "Snake encoding error")
 
-def generate_dino_frames():
-    """MJPEG stream for Dino Run (uses shared camera and MediaPipe state)."""
-    while True:
-        success, frame = camera_stream.read()
-        
-        if not success or frame is None or not camera_stream.active:
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            cv2.putText(frame, "Start camera to play Dino Run", (60, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        else:
-            frame = cv2.flip(frame, 1)
-            
-            # Get jump from open_palm gesture
-            jump_trigger = False
-            with state_lock:
-                jump_trigger = (shared_state["gesture"] == "open_palm")
-            
-            # Update dino game
-            with dino_lock:
-                frame = dino_game.update(frame, jump_trigger, time.time())
-        
-        cv2.putText(frame, "Dino Run - Open Palm to Jump", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        
-        try:
-            ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-        except Exception as e:
-            print(f"Dino encoding error: {e}")
-        
-        time.sleep(0.033)  # 30 FPS
 
-def generate_pong_frames():
-    """MJPEG stream for Pong Game (uses shared camera and MediaPipe state)."""
-    while True:
-        success, frame = camera_stream.read()
+def render_fruit_frame():
+    """Advance Fruit Ninja one tick and render its frame (uses shared camera and MediaPipe state)."""
+    success, frame = camera_stream.read()
+    
+    if not success or frame is None or not camera_stream.active:
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        cv2.putText(frame, "Start camera to play Fruit Ninja", (40, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    else:
+        frame = cv2.flip(frame, 1)
+        
+        # Get hand position from shared state
+        index_tip_pixel = None
+        hand = default_session.snapshot.hand_position
+        if hand["visible"]:
+            h, w, _ = frame.shape
+            cx = int(hand["x"] * w)
+            cy = int(hand["y"] * h)
+            index_tip_pixel = (cx, cy)
+        
+        # Update fruit game
+        with fruit_lock:
+            frame = fruit_game.update(frame, index_tip_pixel, time.time())
+        publish_game_state('fruit')
+    
+    cv2.putText(frame, "Fruit Ninja", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+    
+    return encode_mjpeg_frame(frame, 80, "Fruit encoding error")
+
+
+def render_dino_frame():
+    """Advance Dino Run one tick and render its frame (uses shared camera and MediaPipe state)."""
+    success, frame = camera_stream.read()
+    
+    if not success or frame is None or not camera_stream.active:
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        cv2.putText(frame, "Start camera to play Dino Run", (60, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    else:
+        frame = cv2.flip(frame, 1)
         
-        if not success or frame is None or not camera_stream.active:
-            frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            cv2.putText(frame, "Start camera to play Pong", (80, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-        else:
-            frame = cv2.flip(frame, 1)
-            
-            # Get hand Y position for paddle control
-            hand_y_normalized = None
-            with state_lock:
-                if shared_state["hand_position"]["visible"]:
-                    hand_y_normalized = shared_state["hand_position"]["y"]
-            
-            # Update Pong game
-            with pong_lock:
-                frame = pong_game.update(frame, hand_y_normalized)
+        # Get jump from open_palm gesture
+        jump_trigger = (default_session.snapshot.gesture == "open_palm")
         
-        cv2.putText(frame, "Alone Forever Pong", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        # Update dino game
+        with dino_lock:
+            frame = dino_game.update(frame, jump_trigger, time.time())
+        publish_game_state('dino')
+    
+    cv2.putText(frame, "Dino Run - Open Palm to Jump", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    
+    return encode_mjpeg_frame(frame, 80, "Dino encoding error")
+
+
+def render_pong_frame():
+    """Advance Pong one tick and render its frame (uses shared camera and MediaPipe state)."""
+    success, frame = camera_stream.read()
+    
+    if not success or frame is None or not camera_stream.active:
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(frame, "CAMERA IS OFF", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        cv2.putText(frame, "Start camera to play Pong", (80, 260), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    else:
+        frame = cv2.flip(frame, 1)
         
-        try:
-            ret, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-        except Exception as e:
-            print(f"Pong encoding error: {e}")
+        # Get hand Y position for paddle control
+        hand_y_normalized = None
+        hand = default_session.snapshot.hand_position
+        if hand["visible"]:
+            hand_y_normalized = hand["y"]
         
-        time.sleep(0.033)  # 30 FPS
+        # Update Pong game
+        with pong_lock:
+            frame = pong_game.update(frame, hand_y_normalized)
+        publish_game_state('pong')
+    
+    cv2.putText(frame, "Alone Forever Pong", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    
+    return encode_mjpeg_frame(frame, 80, "Pong encoding error")
+
+
+# One producer per feed: each frame (and game tick) is rendered and JPEG-encoded
+# once and the same bytes go to every viewer. Previously every open <img> ran
+# its own loop, so N viewers meant N encodes - and N game updates - per tick.
+# Producers wake on their source's new frames (video: MediaPipe worker, games:
+# camera) rather than a fixed sleep, and each viewer is rate-limited on its own.
+# The games advance once per camera frame, so their speed depends on
+# camera_stream.frames - which the cloud CameraStream stub never publishes.
+MJPEG_FPS = float(os.environ.get('MJPEG_FPS', 30))
+MJPEG_CLIENT_FPS = float(os.environ.get('MJPEG_CLIENT_FPS', 30))
+MJPEG_HEARTBEAT = float(os.environ.get('MJPEG_HEARTBEAT', 1.0))
+FEED_IDLE_TIMEOUT = float(os.environ.get('FEED_IDLE_TIMEOUT', 5.0))
+
+feed_broadcasters = {
+    name: FrameBroadcaster(name, render, signal=signal, interval=1.0 / MJPEG_FPS,
+                           heartbeat=MJPEG_HEARTBEAT, idle_timeout=FEED_IDLE_TIMEOUT)
+    for name, render, signal in (
+        ("video", render_video_frame, mediapipe_worker.frames),
+        ("snake", render_snake_frame, camera_stream.frames),
+        ("fruit", render_fruit_frame, camera_stream.frames),
+        ("dino", render_dino_frame, camera_stream.frames),
+        ("pong", render_pong_frame, camera_stream.frames),
+    )
+}
+
+
+def mjpeg_response(feed):
+    """Stream a feed to one viewer; ?fps= lowers the viewer's rate below MJPEG_CLIENT_FPS."""
+    max_fps = MJPEG_CLIENT_FPS
+    try:
+        requested = float(request.args.get('fps', 0))
+        if requested > 0:
+            max_fps = min(max_fps, requested)
+    except ValueError:
+        pass
+    return Response(feed_broadcasters[feed].stream(max_fps=max_fps),
+                    mimetype='multipart/x-mixed-replace; boundary=frame')
+
 
 # ============================================================================
 # FLASK ROUTES - AUTHENTICATION ARCHITECTURE
@@ -1249,6 +1547,7 @@ def generate_pong_frames():
 # 🔓 PUBLIC ROUTES (No auth required - low latency, no sensitive data):
 #    - /health
 #    - /process-frame (gesture detection)
+#    - /process-landmarks (gesture detection from client-side landmarks)
 #    - /camera_status
 #    - /video_feed, /snake_feed, /fruit_feed, /dino_feed, /pong_feed (MJPEG streams)
 #
@@ -1414,55 +1713,566 @@ def presentation_action():
 @app.route('/health')
 def health():
     """Simple health check endpoint for Render"""
-    return jsonify(status="ok"), 200
+    # Detectors are provisioned and warmed at import, so serving at all means ready
+    return jsonify(status="ok", models=mediapipe_compat.model_info()), 200
+
+# --- FRAME INGESTION ---
+# Raw image bodies are read straight into a per-thread buffer instead of going
+# through JSON + base64. The JSON data-URL format is still accepted for older clients.
+MAX_FRAME_BYTES = int(os.environ.get('MAX_FRAME_BYTES', 2 * 1024 * 1024))  # 2 MB
+# Room for the multipart boundaries and part headers around an upload's frame
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+BINARY_FRAME_TYPES = ('image/jpeg', 'image/webp')
+_frame_buffers = threading.local()
+
+
+class FrameTooLarge(Exception):
+    """Raised when an uploaded frame exceeds MAX_FRAME_BYTES."""
+
+
+def _get_frame_buffer(min_size):
+    """Return this thread's reusable frame buffer, grown to at least min_size bytes."""
+    buf = getattr(_frame_buffers, 'buf', None)
+    if buf is None or len(buf) < min_size:
+        size = len(buf) if buf is not None else 64 * 1024
+        while size < min_size:
+            size *= 2
+        buf = bytearray(min(size, MAX_FRAME_BYTES))
+        _frame_buffers.buf = buf
+    return buf
+
+
+def read_frame_stream(stream, content_length=None):
+    """Read an image body into the reusable buffer and return a uint8 view of it.
+
+    The returned array aliases the thread-local buffer, so it must be decoded
+    before the next frame is read on the same thread.
+    """
+    if content_length is not None and content_length > MAX_FRAME_BYTES:
+        raise FrameTooLarge(f"Frame is {content_length} bytes (limit {MAX_FRAME_BYTES})")
+
+    buf = _get_frame_buffer(content_length or 64 * 1024)
+    view = memoryview(buf)
+    readinto = getattr(stream, 'readinto', None)
+    n = 0
+    while True:
+        if n == len(buf):
+            if len(buf) >= MAX_FRAME_BYTES:
+                # Buffer is full at the limit - any extra byte means the frame is too large
+                if stream.read(1):
+                    raise FrameTooLarge(f"Frame exceeds {MAX_FRAME_BYTES} bytes")
+                break
+            view.release()
+            old = buf
+            buf = _get_frame_buffer(len(old) * 2)
+            buf[:n] = old[:n]
+            view = memoryview(buf)
+        if readinto is not None:
+            got = readinto(view[n:])
+        else:
+            chunk = stream.read(len(buf) - n)
+            got = len(chunk) if chunk else 0
+            view[n:n + got] = chunk or b''
+        if not got:
+            break
+        n += got
+    view.release()
+    return np.frombuffer(buf, dtype=np.uint8, count=n)
+
+
+# --- INFERENCE RESOLUTION POLICY ---
+# Frames are decoded at reduced scale (IMREAD_REDUCED_*) and resized so inference cost
+# doesn't grow with the client's camera resolution. Scaling is uniform, so MediaPipe's
+# normalized landmarks still map 1:1 onto the original frame.
+INFERENCE_WIDTHS = {
+    "gesture": int(os.environ.get('INFERENCE_WIDTH_GESTURE', 480)),
+    "game": int(os.environ.get('INFERENCE_WIDTH_GAME', 480)),
+    "whiteboard": int(os.environ.get('INFERENCE_WIDTH_WHITEBOARD', 640)),  # Pen needs precision
+}
+DEFAULT_INFERENCE_MODE = "gesture"
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+_JPEG_SOF_MARKERS = frozenset((0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                               0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF))
+
+
+def inference_width(mode=None):
+    """Target inference width for a mode (0 disables downscaling)."""
+    return INFERENCE_WIDTHS.get(mode or DEFAULT_INFERENCE_MODE, INFERENCE_WIDTHS[DEFAULT_INFERENCE_MODE])
+
+
+def jpeg_dimensions(data):
+    """Read (width, height) from a JPEG's SOF header without decoding it. None if not a JPEG."""
+    mv = memoryview(data).cast('B')
+    n = len(mv)
+    if n < 4 or mv[0] != 0xFF or mv[1] != 0xD8:
+        return None
+    i = 2
+    while i + 9 < n:
+        if mv[i] != 0xFF:
+            return None
+        marker = mv[i + 1]
+        if marker == 0xFF:  # Fill byte
+            i += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = (mv[i + 5] << 8) | mv[i + 6]
+            width = (mv[i + 7] << 8) | mv[i + 8]
+            return width, height
+        i += 2 + ((mv[i + 2] << 8) | mv[i + 3])
+    return None
+
+
+def resize_for_inference(frame, target_width):
+    """Downscale frame to target_width (keeping aspect ratio); never upscales."""
+    h, w = frame.shape[:2]
+    if not target_width or w <= target_width:
+        return frame
+    scale = target_width / float(w)
+    return cv2.resize(frame, (target_width, max(1, int(round(h * scale)))), interpolation=cv2.INTER_AREA)
+
+
+def decode_frame_for_inference(np_arr, mode=None):
+    """Decode an encoded frame at the cheapest scale that still covers the mode's inference width."""
+    target = inference_width(mode)
+    flags = cv2.IMREAD_COLOR
+    size = jpeg_dimensions(np_arr) if target else None
+    if size:
+        for factor, reduced_flag in _REDUCED_DECODE_FLAGS:
+            if size[0] // factor >= target:
+                flags = reduced_flag
+                break
+    frame = cv2.imdecode(np_arr, flags)
+    if frame is None:
+        return None
+    return resize_for_inference(frame, target)
+
+
+def frame_mode():
+    """Inference mode for the current request: X-Frame-Mode header or ?mode= query param."""
+    return request.headers.get('X-Frame-Mode') or request.args.get('mode') or DEFAULT_INFERENCE_MODE
+
+
+def decode_request_frame():
+    """Decode the frame from the current request.
+
+    Accepts a raw image/jpeg or image/webp body, a multipart upload with a
+    'frame' file field, or the legacy JSON body {"frame": "data:image/jpeg;base64,..."}.
+    Returns a BGR image scaled per the inference resolution policy, or None if
+    the payload could not be decoded.
+    """
+    mimetype = request.mimetype
+
+    if mimetype in BINARY_FRAME_TYPES:
+        np_arr = read_frame_stream(request.stream, request.content_length)
+    elif mimetype == 'multipart/form-data':
+        if request.content_length is not None and request.content_length > MAX_FRAME_BYTES:
+            raise FrameTooLarge(f"Upload is {request.content_length} bytes (limit {MAX_FRAME_BYTES})")
+        # Bound the form parser itself: a chunked upload has no Content-Length, and
+        # request.files would spool all of it to disk before read_frame_stream checks
+        request.max_content_length = MAX_FRAME_BYTES + MULTIPART_OVERHEAD_BYTES
+        try:
+            upload = request.files.get('frame')
+        except RequestEntityTooLarge:
+            raise FrameTooLarge(f"Upload exceeds {MAX_FRAME_BYTES} bytes")
+        if upload is None:
+            return None
+        np_arr = read_frame_stream(upload.stream)
+    else:
+        # Legacy compatibility shim: base64 data URL inside JSON
+        import base64
+        data = request.get_json(silent=True)
+        if not data or 'frame' not in data:
+            return None
+        frame_data = data['frame'].split(',')[-1]
+        np_arr = np.frombuffer(base64.b64decode(frame_data), np.uint8)
+
+    if np_arr.size == 0:
+        return None
+    return decode_frame_for_inference(np_arr, frame_mode())
+
+
+# Skip inference for (nearly) unchanged frames and reuse the session's last result.
+# A frame counts as changed once MOTION_GATE_CHANGED_FRACTION of the pixels around the
+# last hand (or of the whole thumbnail without one) differ by more than
+# MOTION_GATE_THRESHOLD. MOTION_GATE_MAX_AGE forces a fresh inference at least this
+# often (0 disables gating). Only the modes in MOTION_GATE_MODES are gated: the pen
+# and the games follow the hand continuously and need every frame.
+MOTION_GATE_THRESHOLD = float(os.environ.get('MOTION_GATE_THRESHOLD', 12))
+MOTION_GATE_CHANGED_FRACTION = float(os.environ.get('MOTION_GATE_CHANGED_FRACTION', 0.01))
+MOTION_GATE_MAX_AGE = float(os.environ.get('MOTION_GATE_MAX_AGE', 0.5))
+MOTION_GATE_MODES = frozenset(
+    m.strip() for m in os.environ.get('MOTION_GATE_MODES', 'gesture').split(',') if m.strip()
+)
+motion_gate = MotionGate(threshold=MOTION_GATE_THRESHOLD,
+                         changed_fraction=MOTION_GATE_CHANGED_FRACTION,
+                         max_age=MOTION_GATE_MAX_AGE)
+
+# Per-session admission: at most one frame in inference and one waiting
+frame_admission = FrameAdmission(
+    wait_timeout=float(os.environ.get('FRAME_WAIT_TIMEOUT', 5.0)),
+)
+
+
+MAX_SESSION_ID_LENGTH = 128
+
+
+def frame_session_id():
+    """Session key for detector pinning and gesture state: X-Session-Id header or ?session= param."""
+    session_id = request.headers.get('X-Session-Id') or request.args.get('session')
+    return session_id[:MAX_SESSION_ID_LENGTH] if session_id else None
+
+
+def run_gesture_pipeline(result, now=None, features=None, session=None, include_landmarks=False):
+    """Classify + stabilize one set of hand results and return the frame response.
+
+    Feeds the session's gesture/pen pipeline (default session when None) so the
+    state endpoints reflect browser-camera frames, and returns the resulting hand
+    and pen state.
+    features: precomputed gesture_features for the first hand (batch callers).
+    include_landmarks adds the first hand's (21, 3) landmark array (None without a hand).
+    """
+    if session is None:
+        session = default_session
+    gesture = "none"
+    hand_detected = False
+
+    if result.multi_hand_landmarks:
+        hand_detected = True
+        if features is None:
+            features = gesture_features.compute_features(
+                gesture_features.landmarks_from_results(result)[:1])
+        gesture = features.gestures[0]
+        print(f"👋 Gesture detected: {gesture}")
+
+    snapshot = update_shared_state_from_results(result, now, features, session)
+
+    payload = {
+        "gesture": gesture,
+        "hand_detected": hand_detected,
+        "hand_position": snapshot.hand_position,
+        "pen": snapshot.pen,
+        "motion": snapshot.motion
+    }
+    if include_landmarks:
+        payload["landmarks"] = gesture_features.landmarks_from_results(result)[0] if hand_detected else None
+    return payload
+
+
+def detect_hands(frame, session_id=None):
+    """Run hand detection on a BGR frame via the worker processes or the local pool.
+
+    Frames without a session, and sessions that find every pool detector pinned
+    to another session (more sessions than HANDS_POOL_SIZE), are served by a
+    shared image-mode detector.
+    """
+    if inference_workers is not None and inference_workers.fits(frame):
+        return inference_workers.process(frame, session_id)
+    if session_id is None:
+        with shared_hands_pool.checkout(timeout=HANDS_CHECKOUT_TIMEOUT) as hands:
+            return mediapipe_compat.process_bgr(hands, frame)
+    try:
+        with hands_pool.checkout(session_id, timeout=HANDS_CHECKOUT_TIMEOUT) as hands:
+            return mediapipe_compat.process_bgr(hands, frame)
+    except HandsPoolFull:
+        pass  # Every detector is pinned to another session - don't take one over
+    with shared_hands_pool.checkout(timeout=HANDS_CHECKOUT_TIMEOUT) as hands:
+        return mediapipe_compat.process_bgr(hands, frame)
+
+
+def analyze_frame(frame, session_id=None, include_landmarks=False, mode=None):
+    """Run hand detection + the gesture pipeline on a BGR frame.
+
+    For sessions in a gated mode (MOTION_GATE_MODES), frames that barely differ
+    from the last inferred frame reuse that result ("cached": true, "result_age":
+    seconds since the real inference).
+    Raises HandsPoolExhausted / InferenceWorkerError if no detector frees up in time.
+    """
+    result = age = thumb = None
+    gated = (session_id is not None and MOTION_GATE_MAX_AGE > 0
+             and (mode or DEFAULT_INFERENCE_MODE) in MOTION_GATE_MODES)
+    if gated:
+        thumb = motion_gate.thumbnail(frame)
+        result, age = motion_gate.lookup(session_id, thumb)
+
+    cached = result is not None
+    if not cached:
+        result = detect_hands(frame, session_id)
+        if thumb is not None:
+            roi = hand_roi(gesture_features.landmarks_from_results(result))
+            motion_gate.store(session_id, thumb, result, roi=roi)
+
+    payload = run_gesture_pipeline(result, session=gesture_session(session_id),
+                                   include_landmarks=include_landmarks)
+    payload["cached"] = cached
+    payload["result_age"] = round(age, 3) if cached else 0.0
+    return payload
+
+
+# --- RESPONSE ENCODING ---
+# High-rate responses (frame results, gesture state) are JSON by default, or the
+# fixed binary record layout in binary_state.py for clients that Accept it.
+def json_safe(payload):
+    """payload with a landmark array turned into nested lists for JSON."""
+    landmarks = payload.get("landmarks")
+    if isinstance(landmarks, np.ndarray):
+        payload = {**payload, "landmarks": landmarks.tolist()}
+    return payload
+
+
+def state_response(payload, records=None):
+    """JSON response for payload, or binary records (default: [payload]) if the client asked for them."""
+    if binary_state.wants_binary(request.accept_mimetypes):
+        response = Response(binary_state.encode_records(records if records is not None else [payload]),
+                            mimetype=binary_state.MIMETYPE)
+        response.headers['X-Schema-Version'] = str(binary_state.SCHEMA_VERSION)
+    else:
+        response = jsonify(json_safe(payload))
+    response.vary.add('Accept')
+    return response
+
 
 @app.route('/process-frame', methods=['POST'])
 def process_frame():
-    """🔓 PUBLIC API - No auth required for low-latency gesture detection"""
-    import base64
-    
+    """🔓 PUBLIC API - No auth required for low-latency gesture detection
+
+    Preferred: POST the encoded frame as the raw body with Content-Type
+    image/jpeg or image/webp (or multipart with a 'frame' field).
+    The old JSON base64 body is still supported.
+
+    Latest frame wins: if this session already has a frame in inference and a newer
+    one arrives, the waiting frame is answered with {"dropped": true} instead.
+    Requests without a session id aren't admission-limited: behind the hosting
+    proxy they all share one remote address and would drop each other's frames.
+    """
+    session_id = frame_session_id()
+    admitted, queue_depth = frame_admission.enter(session_id) if session_id else (True, 0)
+    if not admitted:
+        return state_response({"dropped": True, "queue_depth": frame_admission.depth(session_id)})
+
     try:
-        data = request.json
-        if not data or 'frame' not in data:
-            print("❌ No frame in request data")
-            return jsonify(error="No frame received"), 400
-        
-        # ✅ STEP 2 — CORRECT FRAME DECODING
-        frame_data = data['frame'].split(',')[1]
-        image_bytes = base64.b64decode(frame_data)
-        np_arr = np.frombuffer(image_bytes, np.uint8)
-        frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        
+        try:
+            frame = decode_request_frame()
+        except FrameTooLarge as e:
+            print(f"❌ {e}")
+            return jsonify(error=str(e)), 413
+
         if frame is None:
-            print("❌ Failed to decode frame")
-            return jsonify(error="Failed to decode image"), 400
+            print("❌ No decodable frame in request")
+            return jsonify(error="No frame received or failed to decode image"), 400
         
         # 🔥 FIX 7 — DEBUG LOGGING (VERIFY ENDPOINT IS HIT)
         print(f"📸 Frame received: {frame.shape}")
         
-        # ✅ STEP 4 — RUN MEDIAPIPE ON FRAME
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        result = hands.process(rgb)
-        
-        gesture = "none"
-        hand_detected = False
-        
-        if result.multi_hand_landmarks:
-            hand_detected = True
-            hand_landmarks = result.multi_hand_landmarks[0]
-            gesture = detect_gesture(hand_landmarks)
-            print(f"👋 Gesture detected: {gesture}")
-        
-        return jsonify({
-            "gesture": gesture,
-            "hand_detected": hand_detected
-        })
+        try:
+            payload = analyze_frame(frame, session_id, request.args.get('landmarks') == '1',
+                                    frame_mode())
+        except (HandsPoolExhausted, InferenceWorkerError) as e:
+            print(f"⚠️ [Process Frame] {e}")
+            return jsonify(error="Server busy, retry"), 503
+        payload["queue_depth"] = queue_depth
+        return state_response(payload)
         
     except Exception as e:
         print(f"❌ [Process Frame] Error: {e}")
         import traceback
         traceback.print_exc()
         return jsonify(error=str(e)), 500
+    finally:
+        if session_id:
+            frame_admission.leave(session_id)
+
+# --- CLIENT-SIDE LANDMARK SUBMISSION ---
+# For clients that run hand landmarking in the browser: submit the 21-point landmarks
+# and only the (cheap) classification/stabilization pipeline runs on the server.
+MAX_LANDMARK_BATCH = int(os.environ.get('MAX_LANDMARK_BATCH', 64))
+
+
+def parse_landmark_frame(item):
+    """Validate one submitted frame; returns ((hands, 21, 3) float32 array, timestamp_ms or None)."""
+    if not isinstance(item, dict):
+        raise ValueError("Each frame must be an object")
+    points = item.get('landmarks')
+    landmarks = np.asarray(points if points is not None else [], dtype=np.float32)
+    if landmarks.size == 0:
+        landmarks = np.empty((0, 21, 3), dtype=np.float32)
+    elif landmarks.shape[-2:] == (21, 2):
+        # Accept 2D points (z = 0)
+        landmarks = np.concatenate([landmarks, np.zeros(landmarks.shape[:-1] + (1,), np.float32)], axis=-1)
+    if landmarks.shape[-2:] != (21, 3) or landmarks.ndim not in (2, 3):
+        raise ValueError("landmarks must be 21 [x, y, z] points per hand")
+    if not np.isfinite(landmarks).all():
+        raise ValueError("landmarks must be finite numbers")
+    timestamp = item.get('timestamp')
+    return landmarks.reshape(-1, 21, 3), (float(timestamp) if timestamp is not None else None)
+
+
+@app.route('/process-landmarks', methods=['POST'])
+def process_landmarks():
+    """🔓 PUBLIC API - Run gesture classification on client-computed hand landmarks.
+
+    Body: {"landmarks": [[x, y, z] * 21], "timestamp": ms} for one frame, or
+    {"frames": [{"landmarks": ..., "timestamp": ms}, ...]} for a batch in capture order.
+    Coordinates are normalized like MediaPipe's output on the raw (un-mirrored)
+    camera image; x is flipped here to the mirrored (selfie) view that /process-frame
+    frames and the swipe/circle detectors use. Send "mirrored": true if the
+    landmarks already come from a mirrored image.
+    Returns the same JSON as /process-frame (a "results" list for batches).
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify(error="Expected a JSON object"), 400
+
+    batch = 'frames' in data
+    items = data['frames'] if batch else [data]
+    if not isinstance(items, list) or not items:
+        return jsonify(error="frames must be a non-empty list"), 400
+    if len(items) > MAX_LANDMARK_BATCH:
+        return jsonify(error=f"At most {MAX_LANDMARK_BATCH} frames per request"), 413
+
+    try:
+        parsed = [parse_landmark_frame(item) for item in items]
+    except (ValueError, TypeError) as e:
+        return jsonify(error=str(e)), 400
+    if not data.get('mirrored'):
+        for landmarks, _ in parsed:
+            landmarks[..., 0] = 1.0 - landmarks[..., 0]
+
+    # Map client timestamps onto the server clock: the newest frame is "now" and
+    # earlier frames keep their relative spacing, so debounce timings stay correct.
+    server_now = time.time()
+    last_ts = parsed[-1][1]
+    session = request_gesture_session()
+
+    try:
+        # Classify the first hand of every frame in one vectorized pass
+        with_hands = [i for i, (landmarks, _) in enumerate(parsed) if len(landmarks)]
+        batch_features = gesture_features.compute_features(
+            np.stack([parsed[i][0][0] for i in with_hands]) if with_hands
+            else np.empty((0, 21, 3), np.float32))
+        feature_index = {frame: row for row, frame in enumerate(with_hands)}
+
+        results = []
+        for i, (landmarks, timestamp) in enumerate(parsed):
+            if timestamp is not None and last_ts is not None:
+                now = server_now - max(0.0, (last_ts - timestamp) / 1000.0)
+            else:
+                now = server_now
+            features = batch_features[feature_index[i]] if i in feature_index else None
+            results.append(run_gesture_pipeline(
+                mediapipe_compat.results_from_landmarks(landmarks), now, features, session))
+    except Exception as e:
+        print(f"❌ [Process Landmarks] Error: {e}")
+        return jsonify(error=str(e)), 500
+
+    if batch:
+        return state_response({"results": results}, records=results)
+    return state_response(results[0])
+
+# --- WEBSOCKET FRAME CHANNEL ---
+# Persistent alternative to POSTing every frame. The client sends binary messages of
+# [4-byte big-endian sequence number][encoded JPEG/WebP bytes] and the server pushes
+# back one JSON result per frame tagged with the same "seq", so the client can drop
+# results that arrive after a newer one. Requires flask-sock (optional dependency).
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
+
+if Sock is not None:
+    app.config['SOCK_SERVER_OPTIONS'] = {
+        'ping_interval': 25,
+        'max_message_size': MAX_FRAME_BYTES + 4,
+    }
+    sock = Sock(app)
+
+    @sock.route('/ws/frames')
+    def frames_socket(ws):
+        """🔓 PUBLIC API - Stream frames up, receive gesture/hand/pen results down."""
+        # One detector is pinned per connection
+        explicit_session = frame_session_id()
+        session_id = explicit_session or f"ws-{uuid.uuid4()}"
+        # ?format=binary: results go out as binary_state records instead of JSON text
+        binary = request.args.get('format') == 'binary'
+        include_landmarks = request.args.get('landmarks') == '1'
+        print(f"[WS] Frame channel opened ({session_id})")
+        try:
+            _frames_socket_loop(ws, session_id, frame_mode(), binary, include_landmarks)
+        finally:
+            hands_pool.forget_session(session_id)
+            motion_gate.forget(session_id)
+            if not explicit_session:
+                # Nobody else can address a generated session - drop its gesture state now
+                gesture_sessions.discard(session_id)
+            print(f"[WS] Frame channel closed ({session_id})")
+
+    def _handle_socket_control(ws, message, mode):
+        """Handle a text control message; returns the (possibly updated) inference mode."""
+        # Text messages are control: keepalive or {"type": "mode", "mode": "..."}
+        if message == "ping":
+            ws.send(json.dumps({"type": "pong"}))
+            return mode
+        try:
+            control = json.loads(message)
+        except ValueError:
+            return mode
+        if isinstance(control, dict) and control.get("type") == "mode":
+            return control.get("mode") or DEFAULT_INFERENCE_MODE
+        return mode
+
+    def _send_result(ws, payload, binary):
+        if binary:
+            ws.send(binary_state.encode_record(payload))
+        else:
+            ws.send(json.dumps(json_safe(payload)))
+
+    def _frames_socket_loop(ws, session_id, mode, binary=False, include_landmarks=False):
+        while True:
+            message = ws.receive()
+            if message is None:
+                continue
+            if isinstance(message, str):
+                mode = _handle_socket_control(ws, message, mode)
+                continue
+            if len(message) <= 4:
+                continue
+
+            # Latest frame wins: frames that queued up while we were busy are
+            # answered as dropped and only the newest one is processed
+            queue_depth = 0
+            while True:
+                newer = ws.receive(timeout=0)
+                if newer is None:
+                    break
+                if isinstance(newer, str):
+                    mode = _handle_socket_control(ws, newer, mode)
+                    continue
+                if len(newer) <= 4:
+                    continue
+                queue_depth += 1
+                dropped_seq = int.from_bytes(message[:4], 'big')
+                _send_result(ws, {"seq": dropped_seq, "dropped": True, "queue_depth": queue_depth}, binary)
+                message = newer
+
+            seq = int.from_bytes(message[:4], 'big')
+            try:
+                np_arr = np.frombuffer(message, dtype=np.uint8, offset=4)
+                frame = decode_frame_for_inference(np_arr, mode)
+                if frame is None:
+                    _send_result(ws, {"seq": seq, "error": "Failed to decode image"}, binary)
+                    continue
+                payload = analyze_frame(frame, session_id, include_landmarks, mode)
+                payload["queue_depth"] = queue_depth
+            except Exception as e:
+                print(f"❌ [WS] Frame {seq} error: {e}")
+                payload = {"error": str(e)}
+            payload["seq"] = seq
+            _send_result(ws, payload, binary)
+else:
+    print("ℹ️ flask-sock not installed - /ws/frames disabled (HTTP /process-frame only)")
 
 @app.route('/')
 def root():
@@ -1473,7 +2283,10 @@ def root():
         "endpoints": {
             "health": "/health",
             "camera_status": "/camera_status",
-            "process_frame": "/process-frame"
+            "process_frame": "/process-frame",
+            "process_landmarks": "/process-landmarks",
+            "frame_socket": "/ws/frames",
+            "state_stream": "/state_stream"
         }
     }), 200
 
@@ -1490,30 +2303,30 @@ def index():
 @app.route('/video_feed')
 def video_feed():
     """MJPEG video stream - no auth required as img tags can't send headers."""
-    return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return mjpeg_response("video")
 
 
 @app.route('/snake_feed')
 def snake_feed():
     """MJPEG stream of camera frames with snake overlay - no auth required."""
-    return Response(generate_snake_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return mjpeg_response("snake")
 
 
 @app.route('/fruit_feed')
 def fruit_feed():
     """MJPEG stream of camera frames with Fruit Ninja overlay - no auth required."""
-    return Response(generate_fruit_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return mjpeg_response("fruit")
 
 
 @app.route('/dino_feed')
 def dino_feed():
     """MJPEG stream of camera frames with Dino Run overlay - no auth required."""
-    return Response(generate_dino_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return mjpeg_response("dino")
 
 @app.route('/pong_feed')
 def pong_feed():
     """MJPEG stream of camera frames with Pong Game overlay - no auth required."""
-    return Response(generate_pong_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return mjpeg_response("pong")
 
 
 @firebase_auth_required
@@ -1526,66 +2339,307 @@ def dino_state():
         print(f"Dino state error: {str(e)}")
         return jsonify(score=0, gameOver=False), 500
 
+# --- CONDITIONAL / LONG-POLL STATE READS ---
+# State endpoints send their version as ETag (and X-State-Version). A client that
+# already has a version passes it as ?since=<version> or If-None-Match and gets
+# 304 with no body if nothing changed; with ?wait=<seconds> the request is held
+# until the state changes or the wait (capped at STATE_LONG_POLL_MAX) runs out.
+STATE_LONG_POLL_MAX = float(os.environ.get('STATE_LONG_POLL_MAX', 25))
+# A held request holds a server thread, like an SSE stream: past this many waiting
+# requests per worker, ?wait= is answered 503 with Retry-After instead of held.
+# Keep SSE_MAX_STREAMS + STATE_LONG_POLL_MAX_WAITERS well below the worker's --threads.
+STATE_LONG_POLL_MAX_WAITERS = int(os.environ.get('STATE_LONG_POLL_MAX_WAITERS', 4))
+
+long_poll_slots = threading.BoundedSemaphore(max(1, STATE_LONG_POLL_MAX_WAITERS))
+
+
+def _known_version():
+    """Version the client already has, from ?since= or an If-None-Match ETag."""
+    since = request.args.get('since', type=int)
+    if since is None:
+        for etag in request.if_none_match.as_set():
+            if etag.isdigit():
+                return int(etag)
+    return since
+
+
+def versioned_response(source, record_view=None):
+    """Serve a VersionedState: 304 if the client's version is current (after an optional long-poll wait).
+
+    record_view maps the value to a binary_state payload; when given, clients that
+    Accept the binary format get a record (seq = version) instead of JSON.
+    """
+    since = _known_version()
+    version, value = source.current
+    if since is not None and since == version:
+        wait = min(max(request.args.get('wait', 0, type=float), 0.0), STATE_LONG_POLL_MAX)
+        if wait > 0:
+            if not long_poll_slots.acquire(blocking=False):
+                response = jsonify({'error': 'Too many waiting requests, retry without ?wait='})
+                response.headers['Retry-After'] = '1'
+                return response, 503
+            try:
+                version, value = source.wait(since, wait)
+            finally:
+                long_poll_slots.release()
+
+    binary = record_view is not None and binary_state.wants_binary(request.accept_mimetypes)
+    if since == version:
+        response = make_response('', 304)
+    elif binary:
+        response = Response(binary_state.encode_record(record_view(value), seq=version),
+                            mimetype=binary_state.MIMETYPE)
+        response.headers['X-Schema-Version'] = str(binary_state.SCHEMA_VERSION)
+    else:
+        response = jsonify(value)
+    if record_view is not None:
+        response.vary.add('Accept')
+    response.set_etag(str(version))
+    response.headers['X-State-Version'] = str(version)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# Gesture sections as binary_state payloads
+SECTION_RECORDS = {
+    "gesture": lambda value: value,
+    "hand": lambda value: {"hand_position": value},
+    "pen": lambda value: {"pen": value},
+    "whiteboard": lambda value: value,
+}
+
+
+def section_response(name):
+    """Versioned response for one of the request session's gesture sections."""
+    return versioned_response(request_gesture_session().sections[name], SECTION_RECORDS[name])
+
+
+# --- BATCHED STATE ---
+# One request (one auth check) for everything a UI tick needs: gesture sections
+# come from a single publish of the session, games / presentation are read once each.
+DEFAULT_STATE_SECTIONS = ("gesture", "hand", "pen", "whiteboard")
+ALL_STATE_SECTIONS = tuple(STATE_SECTIONS) + tuple(GAME_STATES) + ("presentation",)
+
+
+@app.route('/state')
+@firebase_auth_required
+def batched_state():
+    """Requested sections (?sections=gesture,pen,snake,...) plus their versions."""
+    requested = request.args.get('sections')
+    names = [n.strip() for n in requested.split(',') if n.strip()] if requested else DEFAULT_STATE_SECTIONS
+    unknown = [n for n in names if n not in ALL_STATE_SECTIONS]
+    if unknown:
+        return jsonify(error=f"Unknown sections: {', '.join(unknown)}", sections=ALL_STATE_SECTIONS), 400
+
+    gesture_views = request_gesture_session().section_views
+    body = {}
+    versions = {}
+    for name in names:
+        if name in gesture_views:
+            versions[name], body[name] = gesture_views[name]
+        elif name in GAME_STATES:
+            publish_game_state(name)
+            versions[name], body[name] = game_state_sources[name].current
+        else:
+            presentation_state_source.set(dict(presentation_state))
+            versions[name], body[name] = presentation_state_source.current
+
+    etag = "-".join(str(versions[name]) for name in names)
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        body["versions"] = versions
+        response = jsonify(body)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+# --- STATE STREAM (Server-Sent Events) ---
+# One long-lived response per client instead of timer polls: an event goes out
+# only when the compact state changes, at most SSE_MAX_RATE times per second
+# (changes in between are folded into the next event).
+SSE_MAX_RATE = float(os.environ.get('SSE_MAX_RATE', 20))
+SSE_KEEPALIVE = float(os.environ.get('SSE_KEEPALIVE', 15))
+# Every open stream holds a server thread: keep this well below the worker's --threads
+SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', 8))
+SSE_TICKET_TTL = float(os.environ.get('SSE_TICKET_TTL', 30))
+
+sse_slots = threading.BoundedSemaphore(max(1, SSE_MAX_STREAMS))
+
+# EventSource can't send headers, and an ID token in the URL would end up in access
+# and proxy logs. Clients trade their token (in the header) for a short-lived,
+# single-use ticket and open the stream with that instead.
+stream_tickets_lock = threading.Lock()
+stream_tickets = {}  # ticket -> (ticket expiry, ID token expiry or None)
+
+
+def issue_stream_ticket(decoded_token):
+    now = time.time()
+    ticket = secrets.token_urlsafe(24)
+    with stream_tickets_lock:
+        for stale in [t for t, (expires, _) in stream_tickets.items() if expires <= now]:
+            del stream_tickets[stale]
+        stream_tickets[ticket] = (now + SSE_TICKET_TTL, decoded_token.get('exp'))
+    return ticket
+
+
+def redeem_stream_ticket(ticket):
+    """(True, ID token expiry) for a valid ticket, consuming it; (False, None) otherwise."""
+    with stream_tickets_lock:
+        entry = stream_tickets.pop(ticket, None) if ticket else None
+    if entry is None or entry[0] <= time.time():
+        return False, None
+    return True, entry[1]
+
+
+def compact_state(snapshot):
+    """Fields a state stream sends, with positions rounded to 1e-4 (sub-pixel)."""
+    hand, pen = snapshot.hand_position, snapshot.pen
+    return {
+        "gesture": snapshot.gesture,
+        "hand": {"x": round(hand["x"], 4), "y": round(hand["y"], 4), "visible": hand["visible"]},
+        "pen": {"x": round(pen["x"], 4), "y": round(pen["y"], 4), "pen_down": pen["pen_down"]},
+        "whiteboard": snapshot.whiteboard,
+        "motion": snapshot.motion,
+    }
+
+
+def state_events(session_id, max_rate=SSE_MAX_RATE, keepalive=SSE_KEEPALIVE, until=None):
+    """SSE stream of a session's compact state (id: snapshot version).
+
+    Ends with a "reauth" event at `until` (the ID token's expiry), so a stream
+    never outlives the credentials it was opened with.
+    """
+    interval = 1.0 / max_rate if max_rate > 0 else 0.0
+    version = None
+    last_payload = None
+    last_sent = last_write = 0.0
+    session = gesture_session(session_id)
+    yield "retry: 2000\n\n"
+    while True:
+        if session_id:
+            # Follow a session that was evicted and re-created by new frames. peek()
+            # doesn't refresh the TTL, so an open stream alone doesn't keep it alive.
+            current = gesture_sessions.peek(session_id)
+            if current is not None and current is not session:
+                session, version = current, None
+        timeout = keepalive
+        if until is not None:
+            timeout = min(timeout, until - time.time())
+            if timeout <= 0:
+                yield "event: reauth\ndata: {}\n\n"
+                return
+        snapshot = session.wait_for_change(version, timeout)
+        now = time.time()
+        if snapshot.version != version:
+            wait = last_sent + interval - now
+            if wait > 0:
+                time.sleep(wait)
+                snapshot = session.snapshot
+                now = time.time()
+            version = snapshot.version
+            payload = json.dumps(compact_state(snapshot), separators=(',', ':'))
+            if payload != last_payload:
+                last_payload = payload
+                last_sent = last_write = now
+                yield f"id: {version}\ndata: {payload}\n\n"
+                continue
+        if now - last_write >= keepalive:
+            last_write = now
+            yield ": keepalive\n\n"
+
+
+@app.route('/state_stream/ticket', methods=['POST'])
+@firebase_auth_required
+def state_stream_ticket():
+    """Single-use ticket for opening /state_stream (valid SSE_TICKET_TTL seconds)."""
+    return jsonify(ticket=issue_stream_ticket(request.user), expires_in=SSE_TICKET_TTL)
+
+
+@app.route('/state_stream')
+def state_stream():
+    """Push gesture / hand / pen / whiteboard updates for a session (?session=, ?ticket=)."""
+    valid, token_expiry = redeem_stream_ticket(request.args.get('ticket'))
+    if not valid:
+        return jsonify({'error': 'Invalid or expired stream ticket'}), 401
+    if not sse_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Too many open state streams, poll instead'})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+
+    response = Response(state_events(frame_session_id(), until=token_expiry),
+                        mimetype='text/event-stream')
+    # Runs when the server closes the response (client gone or stream ended)
+    response.call_on_close(sse_slots.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Don't let nginx buffer the stream
+    return response
+
+
 @app.route('/get_gesture')
 @firebase_auth_required
 def get_gesture():
-    return jsonify(gesture=gesture_state["last_gesture"])
+    return section_response("gesture")
 
 @app.route('/gesture_debug')
 @firebase_auth_required
 def gesture_debug():
     """Debug endpoint to check camera and gesture detection status."""
-    with state_lock:
-        debug_info = {
-            "camera_active": camera_stream.active,
-            "mediapipe_active": mediapipe_worker.active,
-            "last_gesture": gesture_state["last_gesture"],
-            "hand_visible": hand_position["visible"],
-            "gesture_time_ago": time.time() - gesture_state.get("last_gesture_time", 0),
-            "camera_error": camera_stream.error,
-            "results_available": mediapipe_worker.results is not None
-        }
+    snapshot = request_gesture_session().snapshot
+    debug_info = {
+        "camera_active": camera_stream.active,
+        "mediapipe_active": mediapipe_worker.active,
+        "last_gesture": snapshot.gesture,
+        "hand_visible": snapshot.hand_position["visible"],
+        "gesture_time_ago": time.time() - snapshot.gesture_time,
+        "state_version": snapshot.version,
+        "camera_error": camera_stream.error,
+        "results_available": mediapipe_worker.results is not None,
+        "hands_pool": hands_pool.stats(),
+        "shared_hands_pool": shared_hands_pool.stats(),
+        "inference_workers": inference_workers.stats() if inference_workers else None,
+        "frame_admission": frame_admission.stats(),
+        "motion_gate": motion_gate.stats(),
+        "gesture_sessions": gesture_sessions.stats(),
+        "feeds": {name: feed.stats() for name, feed in feed_broadcasters.items()}
+    }
     return jsonify(debug_info)
 
 @app.route('/get_hand_position')
 @firebase_auth_required
 def get_hand_position():
-    return jsonify(hand_position)
+    return section_response("hand")
 
 @app.route('/get_pen_position')
 @firebase_auth_required
 def get_pen_position():
     """Get stabilized pen position for whiteboard."""
-    with state_lock:
-        return jsonify(shared_state["smoothed_pen"])
+    return section_response("pen")
 
 @app.route('/get_whiteboard_state')
 @firebase_auth_required
 def get_whiteboard_state():
     """Get complete whiteboard state including action, stroke size, and pen position."""
-    with state_lock:
-        return jsonify({
-            "action": shared_state["whiteboard"]["action"],
-            "stroke_size": shared_state["whiteboard"]["stroke_size"],
-            "pen": shared_state["smoothed_pen"],
-            "hand_position": shared_state["hand_position"]
-        })
+    return section_response("whiteboard")
 
 @app.route('/set_stroke_size/<int:size>', methods=['POST'])
 @firebase_auth_required
 def set_stroke_size(size):
     """Set stroke size manually."""
-    if whiteboard_mode.set_stroke_size(size):
-        with state_lock:
-            shared_state["whiteboard"]["stroke_size"] = size
+    session = request_gesture_session()
+    if session.whiteboard_mode.set_stroke_size(size):
+        with session.lock:
+            previous = session.snapshot
+            session.publish(previous.evolve(whiteboard={**previous.whiteboard, "stroke_size": size}))
         return jsonify({"success": True, "stroke_size": size})
     return jsonify({"success": False, "error": "Invalid stroke size"}), 400
 
 @app.route('/game_action/<game_name>')
 @firebase_auth_required
 def game_action(game_name):
-    gesture = gesture_state["last_gesture"]
-    return jsonify(game=game_name, gesture=gesture, position=hand_position)
+    snapshot = request_gesture_session().snapshot
+    return jsonify(game=game_name, gesture=snapshot.gesture, position=snapshot.hand_position)
 
 @app.route('/login', methods=['POST'])
 def login():
@@ -1683,14 +2737,17 @@ def restart_game(game_name):
         if game_name == 'snake':
             with snake_lock:
                 snake_game.reset()
+            publish_game_state('snake')
             return jsonify(success=True, message="Snake game restarted")
         elif game_name == 'fruit':
             with fruit_lock:
                 fruit_game.reset()
+            publish_game_state('fruit')
             return jsonify(success=True, message="Fruit Ninja restarted")
         elif game_name == 'dino':
             with dino_lock:
                 dino_game.reset()
+            publish_game_state('dino')
             return jsonify(success=True, message="Dino Run restarted")
         else:
             return jsonify(success=False, error="Unknown game"), 400
@@ -1706,6 +2763,7 @@ def snake_reset():
     try:
         with snake_lock:
             snake_game.reset()
+        publish_game_state('snake')
         return jsonify(success=True, message="Snake game reset")
     except Exception as e:
         print(f"Snake reset error: {e}")
@@ -1716,13 +2774,8 @@ def snake_reset():
 def snake_state():
     """Get current Snake game state."""
     try:
-        with snake_lock:
-            state = {
-                'score': snake_game.score,
-                'game_over': snake_game.game_over,
-                'snake_length': len(snake_game.snake)
-            }
-        return jsonify(state)
+        publish_game_state('snake')
+        return versioned_response(game_state_sources['snake'])
     except Exception as e:
         print(f"Snake state error: {e}")
         return jsonify(success=False, error=str(e)), 500
@@ -1732,12 +2785,8 @@ def snake_state():
 def dino_state():
     """Get current Dino Run game state."""
     try:
-        with dino_lock:
-            state = {
-                'score': dino_game.score,
-                'game_over': dino_game.game_over
-            }
-        return jsonify(state)
+        publish_game_state('dino')
+        return versioned_response(game_state_sources['dino'])
     except Exception as e:
         print(f"Dino state error: {e}")
         return jsonify(success=False, error=str(e)), 500
@@ -1747,13 +2796,8 @@ def dino_state():
 def fruit_state():
     """Get current Fruit Ninja game state."""
     try:
-        with fruit_lock:
-            state = {
-                'score': fruit_game.score,
-                'game_over': fruit_game.game_over,
-                'lives': fruit_game.lives
-            }
-        return jsonify(state)
+        publish_game_state('fruit')
+        return versioned_response(game_state_sources['fruit'])
     except Exception as e:
         print(f"Fruit state error: {e}")
         return jsonify(success=False, error=str(e)), 500
@@ -1765,6 +2809,7 @@ def fruit_reset():
     try:
         with fruit_lock:
             fruit_game.reset()
+        publish_game_state('fruit')
         return jsonify(success=True, message="Fruit Ninja reset")
     except Exception as e:
         print(f"Fruit reset error: {e}")
@@ -1777,6 +2822,7 @@ def dino_reset():
     try:
         with dino_lock:
             dino_game.reset()
+        publish_game_state('dino')
         return jsonify(success=True, message="Dino Run reset")
     except Exception as e:
         print(f"Dino reset error: {e}")
@@ -1789,6 +2835,7 @@ def pong_reset():
     try:
         with pong_lock:
             pong_game.reset()
+        publish_game_state('pong')
         return jsonify(success=True, message="Pong game reset")
     except Exception as e:
         print(f"Pong reset error: {e}")
@@ -1799,9 +2846,8 @@ def pong_reset():
 def pong_state():
     """Get current Pong game state."""
     try:
-        with pong_lock:
-            state = pong_game.get_state()
-        return jsonify(state)
+        publish_game_state('pong')
+        return versioned_response(game_state_sources['pong'])
     except Exception as e:
         print(f"Pong state error: {str(e)}")
         return jsonify(score=0, gameOver=False), 500
@@ -0,0 +1,182 @@
+"""
+Hand detection benchmark.
+
+Measures the per-frame cost of preparing a BGR frame for MediaPipe (the old
+double conversion vs. the compat layer's reusable RGB buffer) and the end-to-end
+latency of mediapipe_compat.Hands.process() for each model variant / thread
+count. With --images (a folder of hand photos or a video file) it also reports
+accuracy against the first configuration: detection rate, agreement on whether
+a hand is present, and mean landmark error in normalized image units.
+
+Usage (from backend/):
+    python benchmark_hands.py [--frames 200] [--size 640x480] [--mode video]
+                              [--variants full,lite] [--threads 1,2,4] [--images clips/]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+import mediapipe_compat
+from mediapipe_compat import Hands, RUNNING_MODES
+
+import mediapipe as mp
+
+
+def legacy_prepare(image):
+    """What a frame went through before: app-side BGR->RGB, then per-call imports,
+    a second conversion and a fresh mp.Image inside Hands.process()."""
+    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    import cv2 as _cv2
+    from mediapipe import ImageFormat
+    from mediapipe.tasks.python import vision  # noqa: F401
+    converted = _cv2.cvtColor(rgb, _cv2.COLOR_BGR2RGB)
+    return mp.Image(image_format=ImageFormat.SRGB, data=converted)
+
+
+def timed(fn, frames):
+    """Per-call latencies in milliseconds."""
+    samples = []
+    for _ in range(frames):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def peak_allocation_kb(fn, calls=20):
+    """Largest Python/NumPy allocation peak of a single call, in KB."""
+    fn()  # Let buffers settle before measuring
+    tracemalloc.start()
+    peaks = []
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+    return max(peaks) / 1024
+
+
+def report(name, samples, alloc_kb=None):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    line = (f"{name:<28} mean {statistics.mean(samples):7.3f} ms   "
+            f"p50 {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms")
+    if alloc_kb is not None:
+        line += f"   peak alloc {alloc_kb:8.1f} KB/frame"
+    print(line)
+
+
+def load_frames(args):
+    """Test frames: photos from a folder, frames from a video, or synthetic noise."""
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    frames = []
+    if args.images and os.path.isdir(args.images):
+        for name in sorted(os.listdir(args.images))[:args.frames]:
+            frame = cv2.imread(os.path.join(args.images, name))
+            if frame is not None:
+                frames.append(frame)
+    elif args.images:
+        capture = cv2.VideoCapture(args.images)
+        while len(frames) < args.frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            frames.append(frame)
+        capture.release()
+    if args.images and not frames:
+        raise SystemExit(f"No readable frames in {args.images}")
+    if not frames:
+        # Noise instead of a blank frame so the detector does real work
+        frames = [np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)]
+    return [cv2.resize(f, (width, height), interpolation=cv2.INTER_AREA) for f in frames]
+
+
+def run_config(variant, threads, mode, frames, count):
+    """Benchmark one variant/thread setting (runs in its own process so CPU pinning
+    doesn't leak between settings). Returns (latencies_ms, landmarks_per_frame)."""
+    cores = mediapipe_compat.limit_inference_threads(threads)
+    hands = Hands(static_image_mode=(mode == 'image'), max_num_hands=1,
+                  min_detection_confidence=0.7, min_tracking_confidence=0.7,
+                  model_variant=variant)
+    warmup = mediapipe_compat.warmup_hands(hands, 2, (frames[0].shape[1], frames[0].shape[0]))
+    print(f"  {variant}/{threads or 'all'} threads: warm-up {warmup * 1000:.0f} ms, cores {cores or 'all'}")
+
+    latencies, landmarks = [], []
+    for i in range(count):
+        started = time.perf_counter()
+        results = hands.process(frames[i % len(frames)])
+        latencies.append((time.perf_counter() - started) * 1000)
+        if i < len(frames):
+            landmarks.append(results.landmarks[0].copy() if results.multi_hand_landmarks else None)
+    hands.close()
+    return latencies, landmarks
+
+
+def accuracy(reference, landmarks):
+    """(detection rate, presence agreement with reference, mean landmark error)."""
+    detected = sum(lm is not None for lm in landmarks) / len(landmarks)
+    agree = sum((a is None) == (b is None) for a, b in zip(reference, landmarks)) / len(landmarks)
+    errors = [float(np.linalg.norm(a[:, :2] - b[:, :2], axis=1).mean())
+              for a, b in zip(reference, landmarks) if a is not None and b is not None]
+    return detected, agree, (statistics.mean(errors) if errors else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--size', default='640x480', help='WIDTHxHEIGHT of the test frames')
+    parser.add_argument('--images', help='Folder of hand photos or a video file (enables accuracy)')
+    parser.add_argument('--mode', choices=RUNNING_MODES[:2], default='video')
+    parser.add_argument('--variants', default=mediapipe_compat.DEFAULT_MODEL_VARIANT,
+                        help='Comma-separated model variants (HAND_MODEL_VARIANT values)')
+    parser.add_argument('--threads', default='0', help='Comma-separated cores per detector (0 = no limit)')
+    args = parser.parse_args()
+
+    frames = load_frames(args)
+    frame = frames[0]
+    print(f"🖐️ {frame.shape[1]}x{frame.shape[0]} frames ({len(frames)} distinct), {args.mode} mode, "
+          f"{args.frames} frames per run\n")
+
+    hands = Hands(static_image_mode=(args.mode == 'image'), max_num_hands=1,
+                  min_detection_confidence=0.7, min_tracking_confidence=0.7)
+
+    def current_prepare():
+        return mp.Image(image_format=mediapipe_compat._SRGB, data=hands._to_rgb(frame))
+
+    print("Frame preparation (conversion + mp.Image):")
+    report("  legacy (2x cvtColor)", timed(lambda: legacy_prepare(frame), args.frames),
+           peak_allocation_kb(lambda: legacy_prepare(frame)))
+    report("  reusable RGB buffer", timed(current_prepare, args.frames),
+           peak_allocation_kb(current_prepare))
+    hands.close()
+
+    configs = [(variant.strip(), int(threads))
+               for variant in args.variants.split(',') for threads in args.threads.split(',')]
+    print("\nEnd to end (Hands.process):")
+    ctx = multiprocessing.get_context("spawn")
+    runs = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for variant, threads in configs:
+            runs.append(pool.apply(run_config, (variant, threads, args.mode, frames, args.frames)))
+
+    reference = runs[0][1]
+    print()
+    for (variant, threads), (latencies, landmarks) in zip(configs, runs):
+        report(f"  {variant}, {threads or 'all'} threads", latencies)
+        if args.images:
+            detected, agree, error = accuracy(reference, landmarks)
+            error = f"{error:.4f}" if error is not None else "n/a"
+            print(f"{'':<28} detected {detected:6.1%}   agrees with {configs[0][0]} {agree:6.1%}   "
+                  f"landmark error {error}")
+
+
+if __name__ == "__main__":
+    main()
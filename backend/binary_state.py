@@ -0,0 +1,133 @@
+"""
+Compact binary encoding of frame results and gesture state.
+
+JSON stays the default; clients opt in with `Accept: application/vnd.motionmind.state`
+(HTTP) or `?format=binary` (WebSocket). Each frame result / state response is one
+fixed 26-byte little-endian record, optionally followed by the hand's landmarks:
+
+    offset  type  field
+    0       u8    schema version (SCHEMA_VERSION)
+    1       u8    flags: 1 hand visible, 2 pen down, 4 hand detected, 8 cached,
+                  16 dropped, 32 error, 64 landmarks follow
+    2       u8    gesture (index into gesture_features.GESTURES, 255 = none)
+    3       u8    whiteboard action (index into ACTIONS)
+    4       u16   hand x   (0..65535 = 0.0..1.0)
+    6       u16   hand y
+    8       i16   hand z   (-32767..32767 = -1.0..1.0)
+    10      u16   pen x
+    12      u16   pen y
+    14      u8    stroke size
+    15      u8    motion event (index into MOTION_EVENTS)
+    16      u16   motion seq (mod 65536)
+    18      u16   result age in ms (cached results)
+    20      u8    queue depth
+    21      u8    motion gesture (held pose of a "hold", 255 = none)
+    22      u32   seq: WebSocket frame seq, or the state version for state endpoints
+
+    26      u16 x 63  landmarks (if flag 64): x, y, z per point, x/y over 0..1 and
+                      z over -1..1, each mapped to 0..65535
+
+Batches are records back to back. Bump SCHEMA_VERSION on any layout change.
+"""
+import struct
+
+import numpy as np
+
+try:
+    from .gesture_features import GESTURE_CODES
+except ImportError:
+    from gesture_features import GESTURE_CODES
+
+
+MIMETYPE = "application/vnd.motionmind.state"
+SCHEMA_VERSION = 1
+RECORD = struct.Struct("<BBBBHHhHHBBHHBBI")
+
+ACTIONS = (None, "draw", "erase", "color_change", "clear_canvas")
+MOTION_EVENTS = (None, "swipe_left", "swipe_right", "hold", "circle_cw", "circle_ccw")
+_ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+_MOTION_CODES = {name: code for code, name in enumerate(MOTION_EVENTS)}
+NO_GESTURE = 255
+
+FLAG_HAND_VISIBLE, FLAG_PEN_DOWN, FLAG_HAND_DETECTED = 1, 2, 4
+FLAG_CACHED, FLAG_DROPPED, FLAG_ERROR, FLAG_LANDMARKS = 8, 16, 32, 64
+
+
+def wants_binary(accept_mimetypes):
+    """True if the request's Accept header prefers the binary format over JSON."""
+    return accept_mimetypes.best_match(["application/json", MIMETYPE]) == MIMETYPE
+
+
+def _unit(value):
+    """0..1 -> 0..65535 (clamped)."""
+    return int(min(1.0, max(0.0, value)) * 65535 + 0.5)
+
+
+def _signed(value):
+    """-1..1 -> -32767..32767 (clamped)."""
+    return int(round(min(1.0, max(-1.0, value)) * 32767))
+
+
+def _gesture_code(name):
+    return GESTURE_CODES.get(name, NO_GESTURE) if name else NO_GESTURE
+
+
+def quantize_landmarks(landmarks):
+    """(21, 3) float landmarks -> 126 bytes of little-endian uint16."""
+    scaled = np.asarray(landmarks, dtype=np.float32).reshape(21, 3).copy()
+    scaled[:, 2] = (scaled[:, 2] + 1.0) * 0.5
+    return (np.clip(scaled, 0.0, 1.0) * 65535 + 0.5).astype('<u2').tobytes()
+
+
+def encode_record(payload, seq=None):
+    """One record from a frame-result or state dict (the same dicts served as JSON).
+
+    Understands gesture, hand_position, pen, whiteboard (or action / stroke_size),
+    motion, hand_detected, cached, result_age, queue_depth, dropped, error, seq
+    and landmarks; missing fields encode as zero / none.
+    """
+    hand = payload.get("hand_position") or {}
+    pen = payload.get("pen") or {}
+    whiteboard = payload.get("whiteboard") or payload
+    motion = payload.get("motion") or {}
+    landmarks = payload.get("landmarks")
+
+    flags = 0
+    if hand.get("visible"):
+        flags |= FLAG_HAND_VISIBLE
+    if pen.get("pen_down"):
+        flags |= FLAG_PEN_DOWN
+    if payload.get("hand_detected"):
+        flags |= FLAG_HAND_DETECTED
+    if payload.get("cached"):
+        flags |= FLAG_CACHED
+    if payload.get("dropped"):
+        flags |= FLAG_DROPPED
+    if payload.get("error"):
+        flags |= FLAG_ERROR
+    if landmarks is not None:
+        flags |= FLAG_LANDMARKS
+
+    record = RECORD.pack(
+        SCHEMA_VERSION,
+        flags,
+        _gesture_code(payload.get("gesture")),
+        _ACTION_CODES.get(whiteboard.get("action"), 0),
+        _unit(hand.get("x", 0)), _unit(hand.get("y", 0)), _signed(hand.get("z", 0)),
+        _unit(pen.get("x", 0)), _unit(pen.get("y", 0)),
+        min(255, int(whiteboard.get("stroke_size") or 0)),
+        _MOTION_CODES.get(motion.get("event"), 0),
+        int(motion.get("seq", 0)) & 0xFFFF,
+        min(65535, int(round((payload.get("result_age") or 0) * 1000))),
+        min(255, int(payload.get("queue_depth") or 0)),
+        _gesture_code(motion.get("gesture")),
+        int(payload.get("seq", 0) if seq is None else seq) & 0xFFFFFFFF,
+    )
+    if landmarks is not None:
+        record += quantize_landmarks(landmarks)
+    return record
+
+
+def encode_records(payloads):
+    """Batch of records, back to back."""
+    return b"".join(encode_record(payload) for payload in payloads)
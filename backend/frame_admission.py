@@ -0,0 +1,126 @@
+"""
+Latest-frame-wins admission control for frame processing.
+
+Each session may have at most one frame in inference and one frame waiting.
+A newer frame replaces the waiting one, which is answered as "dropped" instead
+of being processed, so latency stays bounded when inference falls behind.
+"""
+import threading
+import time
+
+
+class _Ticket:
+    __slots__ = ("admitted", "dropped")
+
+    def __init__(self):
+        self.admitted = False
+        self.dropped = False
+
+
+class _SessionQueue:
+    __slots__ = ("cond", "in_flight", "pending", "last_seen")
+
+    def __init__(self, lock):
+        self.cond = threading.Condition(lock)
+        self.in_flight = False
+        self.pending = None
+        self.last_seen = time.time()
+
+    @property
+    def depth(self):
+        return int(self.in_flight) + int(self.pending is not None)
+
+
+class FrameAdmission:
+    """Per-session admission stage in front of the hand detector.
+
+    Usage:
+        admitted, depth = admission.enter(session_id)
+        if not admitted:
+            return dropped response
+        try:
+            ... run inference ...
+        finally:
+            admission.leave(session_id)
+    """
+    def __init__(self, wait_timeout=5.0, idle_timeout=60.0):
+        self.wait_timeout = wait_timeout
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.admitted_total = 0
+        self.dropped_total = 0
+
+    def enter(self, session_id):
+        """Wait for this frame's turn. Returns (admitted, queue_depth_on_arrival)."""
+        with self._lock:
+            queue = self._sessions.get(session_id)
+            if queue is None:
+                self._prune_locked()
+                queue = self._sessions[session_id] = _SessionQueue(self._lock)
+            queue.last_seen = time.time()
+            depth = queue.depth
+
+            if not queue.in_flight:
+                queue.in_flight = True
+                self.admitted_total += 1
+                return True, depth
+
+            # Supersede any frame already waiting for this session
+            if queue.pending is not None:
+                queue.pending.dropped = True
+                self.dropped_total += 1
+            ticket = _Ticket()
+            queue.pending = ticket
+            queue.cond.notify_all()
+
+            deadline = time.time() + self.wait_timeout
+            while not ticket.admitted and not ticket.dropped:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    if queue.pending is ticket:
+                        queue.pending = None
+                    ticket.dropped = True
+                    self.dropped_total += 1
+                    break
+                queue.cond.wait(remaining)
+
+            if ticket.admitted:
+                self.admitted_total += 1
+            return ticket.admitted, depth
+
+    def leave(self, session_id):
+        """Finish the in-flight frame and hand the slot to the pending frame, if any."""
+        with self._lock:
+            queue = self._sessions.get(session_id)
+            if queue is None:
+                return
+            queue.last_seen = time.time()
+            if queue.pending is not None:
+                queue.pending.admitted = True
+                queue.pending = None
+                queue.cond.notify_all()
+            else:
+                queue.in_flight = False
+
+    def depth(self, session_id):
+        """Current frames held for a session (0-2)."""
+        with self._lock:
+            queue = self._sessions.get(session_id)
+            return queue.depth if queue is not None else 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "queued": sum(q.depth for q in self._sessions.values()),
+                "admitted_total": self.admitted_total,
+                "dropped_total": self.dropped_total,
+            }
+
+    def _prune_locked(self):
+        now = time.time()
+        stale = [sid for sid, q in self._sessions.items()
+                 if q.depth == 0 and now - q.last_seen > self.idle_timeout]
+        for sid in stale:
+            del self._sessions[sid]
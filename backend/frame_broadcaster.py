@@ -0,0 +1,169 @@
+"""
+Encode-once fan-out for MJPEG feeds.
+
+One producer thread per feed renders and JPEG-encodes each frame once; every
+viewer of the feed gets the same immutable bytes. Viewers always receive the
+newest frame: a slow client that is still writing the previous one simply skips
+whatever was produced in between (nothing queues up per client). The producer
+starts with the first viewer and stops once the feed has been unwatched for
+idle_timeout seconds, so unwatched feeds cost nothing.
+
+Producers are event-driven: a feed with a FrameSignal renders when its source
+(camera, MediaPipe worker) publishes a new frame, not on a fixed timer. Without
+new frames it re-renders only every `heartbeat` seconds (for status overlays
+such as the camera state), and a render that encodes to the same bytes as the
+last one isn't broadcast. Each viewer is still re-sent its last frame every
+`heartbeat` seconds: a client that went away is only noticed when a write to it
+fails, so a feed that never changes would otherwise hold its thread forever.
+"""
+import threading
+import time
+
+
+class FrameSignal:
+    """Frame sequence number a frame source bumps for every new frame.
+
+    Consumers block in wait() until the sequence moves past the one they last
+    saw, instead of polling on a timer.
+    """
+    __slots__ = ("seq", "_cond")
+
+    def __init__(self):
+        self.seq = 0
+        self._cond = threading.Condition()
+
+    def publish(self):
+        """Announce a new frame; wakes every waiter. Returns the new sequence number."""
+        with self._cond:
+            self.seq += 1
+            self._cond.notify_all()
+            return self.seq
+
+    def wait(self, since, timeout):
+        """Sequence number once it differs from since, or the unchanged one after timeout."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq != since, timeout)
+            return self.seq
+
+
+class FrameBroadcaster:
+    """Shares one rendered frame stream between any number of viewers.
+
+    Args:
+        name: Feed name (for logs and stats).
+        render: Callable returning the next encoded chunk (bytes), or None to skip.
+        signal: FrameSignal of the feed's source; renders follow its frames. None
+            renders every `interval`.
+        interval: Minimum seconds between renders (caps the feed's frame rate).
+        heartbeat: Seconds without a new source frame before re-rendering anyway,
+            and without a new frame before a viewer is re-sent its last one.
+        idle_timeout: Seconds without viewers before the producer thread exits.
+    """
+    def __init__(self, name, render, signal=None, interval=0.033, heartbeat=1.0, idle_timeout=5.0):
+        self.name = name
+        self.render = render
+        self.signal = signal
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._viewers = 0
+        self._thread = None
+        self.frames_encoded = 0
+        self.frames_unchanged = 0  # Renders identical to the previous frame, not broadcast
+        self.frames_resent = 0  # Last frame re-sent to an idle viewer (liveness check)
+        self.frames_skipped = 0  # Frames viewers never got because they were still busy or rate-limited
+
+    def stream(self, max_fps=None):
+        """Generator of encoded chunks for one viewer, at most max_fps per second."""
+        min_gap = 1.0 / max_fps if max_fps else 0.0
+        self._attach()
+        seen = None  # A new viewer gets the current frame right away, even on a static feed
+        sent = time.time()
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._frame is not None and self._seq != seen,
+                                        timeout=max(0.0, sent + self.heartbeat - time.time()))
+                    frame, seq = self._frame, self._seq
+                    if seen is not None and seq - seen > 1:
+                        self.frames_skipped += seq - seen - 1
+                    resend = seq == seen and time.time() - sent >= self.heartbeat
+                    if resend and frame is not None:
+                        self.frames_resent += 1
+                if frame is None:
+                    sent = time.time()  # Nothing rendered yet - check again in a heartbeat
+                    continue
+                if seq == seen and not resend:
+                    continue
+                seen = seq
+                sent = time.time()
+                yield frame
+                # Per-client rate limit: frames produced meanwhile are skipped, not queued
+                pause = sent + min_gap - time.time()
+                if pause > 0:
+                    time.sleep(pause)
+        finally:
+            self._detach()
+
+    def _attach(self):
+        with self._cond:
+            self._viewers += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"feed-{self.name}", daemon=True)
+                self._thread.start()
+                print(f"[Feed] {self.name} producer started")
+
+    def _detach(self):
+        with self._cond:
+            self._viewers -= 1
+
+    def _run(self):
+        idle_since = None
+        source_seq = None
+        while True:
+            with self._cond:
+                if self._viewers > 0:
+                    idle_since = None
+                else:
+                    idle_since = idle_since or time.time()
+                    if time.time() - idle_since > self.idle_timeout:
+                        # Checked under the lock, so a viewer attaching now starts a new thread
+                        self._thread = None
+                        print(f"[Feed] {self.name} producer stopped (no viewers)")
+                        return
+
+            if self.signal is not None:
+                # Block until the source has a new frame (or the heartbeat is due)
+                source_seq = self.signal.wait(source_seq, self.heartbeat)
+
+            started = time.time()
+            try:
+                frame = self.render()
+            except Exception as e:
+                print(f"[Feed] {self.name} render error: {e}")
+                frame = None
+            if frame is not None:
+                with self._cond:
+                    if frame == self._frame:
+                        self.frames_unchanged += 1
+                    else:
+                        self._frame = frame
+                        self._seq += 1
+                        self.frames_encoded += 1
+                        self._cond.notify_all()
+            time.sleep(max(0.0, self.interval - (time.time() - started)))
+
+    def stats(self):
+        with self._cond:
+            return {
+                "viewers": self._viewers,
+                "running": self._thread is not None,
+                "source_seq": self.signal.seq if self.signal is not None else None,
+                "frames_encoded": self.frames_encoded,
+                "frames_unchanged": self.frames_unchanged,
+                "frames_resent": self.frames_resent,
+                "frames_skipped": self.frames_skipped,
+            }
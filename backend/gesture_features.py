@@ -0,0 +1,154 @@
+"""
+Vectorized hand features and gesture classification.
+
+Works on (N, 21, 3) landmark arrays so any number of hands - one frame, a batch
+of submitted frames, or an offline replay - is classified in a single NumPy pass.
+Each hand is reduced to a 10-bit key (which fingers are extended / folded, plus
+two thumb flags) and the gesture label is a lookup into a table precomputed from
+the rule cascade in _classify_key(). Pinch distance and index tip position come
+from the same pass.
+"""
+import numpy as np
+
+
+THUMB_IP, THUMB_TIP = 3, 4
+INDEX_MCP, INDEX_TIP, MIDDLE_MCP = 5, 8, 9
+# Index, middle, ring, pinky
+FINGER_TIPS = [8, 12, 16, 20]
+FINGER_PIPS = [6, 10, 14, 18]
+
+GESTURES = (
+    "unknown",
+    "one_finger_up",
+    "two_fingers_up",
+    "three_fingers_up",
+    "pinky_finger_up",
+    "thumbs_up",
+    "fist",
+    "open_palm",
+)
+GESTURE_CODES = {name: code for code, name in enumerate(GESTURES)}
+
+# Key layout: bits 0-3 extended (index..pinky), bits 4-7 folded, bit 8 thumb up,
+# bit 9 thumb extended
+EXTENDED_SHIFT, FOLDED_SHIFT, THUMB_UP_BIT, THUMB_EXTENDED_BIT = 0, 4, 8, 9
+_FINGER_WEIGHTS = np.array([1, 2, 4, 8], dtype=np.uint16)
+
+INDEX, MIDDLE, RING, PINKY = 1, 2, 4, 8
+ALL_FINGERS = INDEX | MIDDLE | RING | PINKY
+
+
+def _classify_key(key):
+    """Rule cascade for one feature key (the source of truth for GESTURE_TABLE)."""
+    extended = (key >> EXTENDED_SHIFT) & ALL_FINGERS
+    folded = (key >> FOLDED_SHIFT) & ALL_FINGERS
+    thumb_up = bool(key & (1 << THUMB_UP_BIT))
+    thumb_extended = bool(key & (1 << THUMB_EXTENDED_BIT))
+
+    def up(fingers):
+        return extended & fingers == fingers
+
+    def down(fingers):
+        return folded & fingers == fingers
+
+    # 1. One Finger Up (Index finger only) - Drawing / Next Slide
+    if up(INDEX) and down(MIDDLE | RING | PINKY):
+        return "one_finger_up"
+    # 2. Two Fingers Up (Index and Middle) - Erase / Previous Slide
+    if up(INDEX | MIDDLE) and down(RING | PINKY):
+        return "two_fingers_up"
+    # 3. Three Fingers Up (Index, Middle, Ring) - Color change
+    if up(INDEX | MIDDLE | RING) and down(PINKY):
+        return "three_fingers_up"
+    # 4. Pinky Finger Only - Clear canvas (must be folded, not just "not extended")
+    if down(INDEX | MIDDLE | RING) and up(PINKY):
+        return "pinky_finger_up"
+    # 5. Thumbs Up (checked BEFORE fist to avoid confusion)
+    if thumb_up and down(ALL_FINGERS):
+        return "thumbs_up"
+    # 6. Fist - Ignored (no action)
+    if down(ALL_FINGERS):
+        return "fist"
+    # 7. Open Palm - Ignored (all fingers extended)
+    if up(ALL_FINGERS) and thumb_extended:
+        return "open_palm"
+    return "unknown"
+
+
+GESTURE_TABLE = np.array(
+    [GESTURE_CODES[_classify_key(key)] for key in range(1 << 10)], dtype=np.uint8
+)
+
+
+class HandFeatures:
+    """Per-hand features for a batch of N hands (all arrays have length N)."""
+    __slots__ = ("keys", "codes", "pinch_distance", "index_tip")
+
+    def __init__(self, keys, codes, pinch_distance, index_tip):
+        self.keys = keys
+        self.codes = codes
+        self.pinch_distance = pinch_distance
+        self.index_tip = index_tip
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        """Features of hand i as a batch of one."""
+        s = slice(i, i + 1) if isinstance(i, (int, np.integer)) else i
+        return HandFeatures(self.keys[s], self.codes[s], self.pinch_distance[s], self.index_tip[s])
+
+    @property
+    def gestures(self):
+        return [GESTURES[code] for code in self.codes]
+
+
+def landmarks_array(hand_landmarks):
+    """(21, 3) float32 array for one legacy hand (a NormalizedLandmarkList or compat view)."""
+    array = getattr(hand_landmarks, 'array', None)  # compat HandLandmarksView
+    if array is not None:
+        return array
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+
+
+def landmarks_from_results(results):
+    """(N, 21, 3) float32 array for legacy-format results (empty if no hands)."""
+    if not results or not results.multi_hand_landmarks:
+        return np.empty((0, 21, 3), dtype=np.float32)
+    landmarks = getattr(results, 'landmarks', None)  # Array-backed compat results
+    if landmarks is not None:
+        return landmarks
+    return np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in results.multi_hand_landmarks],
+        dtype=np.float32,
+    )
+
+
+def compute_features(landmarks, margin=0.02):
+    """Features for an (N, 21, 3) (or single (21, 3)) landmark array.
+
+    A finger is extended when its tip is above its PIP joint by more than margin
+    and folded when it is below by more than margin (image y grows downwards).
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, 21, 3)
+    # Thresholds in float64 like the per-landmark Python floats they replace
+    y = landmarks[:, :, 1].astype(np.float64)
+    tips, pips = y[:, FINGER_TIPS], y[:, FINGER_PIPS]
+    extended = (tips < pips - margin) @ _FINGER_WEIGHTS
+    folded = (tips > pips + margin) @ _FINGER_WEIGHTS
+
+    thumb_y = y[:, THUMB_TIP]
+    thumb_up = (thumb_y < y[:, INDEX_MCP]) & (thumb_y < y[:, MIDDLE_MCP])
+    thumb_extended = thumb_y < y[:, THUMB_IP]
+
+    keys = (extended << EXTENDED_SHIFT) | (folded << FOLDED_SHIFT) \
+        | (thumb_up.astype(np.uint16) << THUMB_UP_BIT) \
+        | (thumb_extended.astype(np.uint16) << THUMB_EXTENDED_BIT)
+    pinch = np.linalg.norm(
+        landmarks[:, THUMB_TIP].astype(np.float64) - landmarks[:, INDEX_TIP], axis=1)
+    return HandFeatures(keys, GESTURE_TABLE[keys], pinch, landmarks[:, INDEX_TIP])
+
+
+def classify_gestures(landmarks, margin=0.02):
+    """Gesture label for every hand in an (N, 21, 3) landmark array."""
+    return compute_features(landmarks, margin).gestures
@@ -0,0 +1,261 @@
+"""
+Bounded pool of MediaPipe Hands detectors.
+
+Detectors are checked out per request, or pinned to a session so that one
+user's tracking state never leaks into another user's frames. A detector that
+has served a session is never handed to anyone else: when the session lets go
+of it (forget_session, idle timeout) it is closed, and a fresh spare is created
+in the background. Once every detector is pinned, further sessions are refused
+with HandsPoolFull rather than taking over (and reloading) someone else's
+detector; callers serve them from stateless detectors instead.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class HandsPoolExhausted(Exception):
+    """Raised when no detector becomes free before the checkout timeout."""
+
+
+class HandsPoolFull(HandsPoolExhausted):
+    """Raised at once when every detector is pinned to another session."""
+
+
+class _PooledHands:
+    """A detector plus its bookkeeping inside the pool."""
+    __slots__ = ("hands", "session_id", "in_use", "last_used", "retired")
+
+    def __init__(self, hands):
+        self.hands = hands
+        self.session_id = None
+        self.in_use = False
+        self.last_used = time.time()
+        self.retired = False  # Carries a former session's state - close on release
+
+
+class HandsPool:
+    """Thread-safe pool of Hands detectors.
+
+    Args:
+        factory: Callable returning a new Hands instance.
+        size: Maximum number of detectors (upper bound on parallel inference).
+        warm: Number of unpinned detectors kept ready so new sessions don't pay init cost.
+        idle_timeout: Seconds after which an idle session is unpinned and surplus
+            detectors beyond the warm spares are closed.
+    """
+    def __init__(self, factory, size=2, warm=1, idle_timeout=300.0):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.warm = max(0, min(int(warm), self.size))
+        self.idle_timeout = idle_timeout
+        self._cond = threading.Condition()
+        self._slots = []
+        self._pinned = {}  # session_id -> _PooledHands
+        self._creating = 0
+        self._closed = False
+
+        for _ in range(self.warm):
+            self._slots.append(_PooledHands(self.factory()))
+
+    # --- checkout / release ---
+
+    @contextmanager
+    def checkout(self, session_id=None, timeout=2.0):
+        """Borrow a detector for the duration of the with-block."""
+        slot = self.acquire(session_id, timeout)
+        try:
+            yield slot.hands
+        finally:
+            self.release(slot)
+
+    def acquire(self, session_id=None, timeout=2.0):
+        """Check out a detector, pinning it to session_id when one is given.
+
+        Raises HandsPoolFull right away if session_id has no detector and every
+        detector is pinned to another session (no amount of waiting frees one
+        before an idle timeout). Unpinned checkouts get the same treatment.
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise HandsPoolExhausted("Hands pool is closed")
+
+                self._evict_idle_locked(time.time())
+                slot, create = self._select_locked(session_id)
+                if slot is not None:
+                    slot.in_use = True
+                    if session_id is not None:
+                        self._pin_locked(slot, session_id)
+                    break
+                if create:
+                    self._creating += 1
+                    break
+                if self._full_locked(session_id):
+                    raise HandsPoolFull(
+                        f"All {self.size} hand detectors are pinned to other sessions"
+                    )
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise HandsPoolExhausted(
+                        f"No free hand detector within {timeout:.1f}s (pool size {self.size})"
+                    )
+                self._cond.wait(remaining)
+
+        if slot is None:
+            # Detector creation is slow - do it outside the lock
+            try:
+                slot = _PooledHands(self.factory())
+            except Exception:
+                with self._cond:
+                    self._creating -= 1
+                    self._cond.notify_all()
+                raise
+            slot.in_use = True
+            with self._cond:
+                self._creating -= 1
+                self._slots.append(slot)
+                if session_id is not None:
+                    self._pin_locked(slot, session_id)
+
+        self._top_up_spares()
+        return slot
+
+    def release(self, slot):
+        """Return a detector to the pool."""
+        with self._cond:
+            slot.in_use = False
+            slot.last_used = time.time()
+            retired = slot.retired and slot in self._slots
+            if retired:
+                self._slots.remove(slot)
+            self._cond.notify_all()
+        if retired:
+            self._close_hands(slot.hands)
+            self._top_up_spares()
+
+    def forget_session(self, session_id):
+        """Unpin and retire a session's detector (e.g. when its connection closes)."""
+        with self._cond:
+            slot = self._pinned.pop(session_id, None)
+            if slot is None:
+                return
+            slot.session_id = None
+            slot.retired = True
+            if slot.in_use:
+                return  # Closed by release()
+            self._slots.remove(slot)
+            self._cond.notify_all()
+        self._close_hands(slot.hands)
+        self._top_up_spares()
+
+    # --- selection / maintenance (caller holds the lock) ---
+
+    def _select_locked(self, session_id):
+        """Return (slot, should_create) for the next checkout."""
+        if session_id is not None and session_id in self._pinned:
+            slot = self._pinned[session_id]
+            # Frames from one session are serialized on its own detector
+            return (None if slot.in_use else slot), False
+
+        free = [s for s in self._slots if not s.in_use and s.session_id is None]
+        if free:
+            return free[0], False
+
+        if len(self._slots) + self._creating < self.size:
+            return None, True
+
+        return None, False
+
+    def _full_locked(self, session_id):
+        """True if session_id (or an unpinned checkout) can't get a detector until a session is unpinned."""
+        return (session_id not in self._pinned and not self._creating
+                and len(self._slots) >= self.size
+                and all(s.session_id is not None for s in self._slots))
+
+    def _pin_locked(self, slot, session_id):
+        if slot.session_id is not None and slot.session_id != session_id:
+            self._pinned.pop(slot.session_id, None)
+        slot.session_id = session_id
+        self._pinned[session_id] = slot
+
+    def _evict_idle_locked(self, now):
+        if not self.idle_timeout:
+            return
+        # Idle sessions lose their detector; it holds their tracking state, so it's closed
+        for slot in list(self._slots):
+            if (slot.session_id is not None and not slot.in_use
+                    and now - slot.last_used > self.idle_timeout):
+                self._pinned.pop(slot.session_id, None)
+                self._slots.remove(slot)
+                self._close_hands(slot.hands)
+
+        spares = [s for s in self._slots if not s.in_use and s.session_id is None]
+        surplus = len(spares) - self.warm
+        for slot in sorted(spares, key=lambda s: s.last_used):
+            if surplus <= 0:
+                break
+            if now - slot.last_used > self.idle_timeout:
+                self._slots.remove(slot)
+                self._close_hands(slot.hands)
+                surplus -= 1
+
+    def _top_up_spares(self):
+        """Create warm spares in the background when pinning has used them up."""
+        with self._cond:
+            spares = sum(1 for s in self._slots if not s.in_use and s.session_id is None)
+            missing = min(self.warm - spares - self._creating,
+                          self.size - len(self._slots) - self._creating)
+            if missing <= 0 or self._closed:
+                return
+            self._creating += missing
+
+        def create_spares():
+            for _ in range(missing):
+                try:
+                    slot = _PooledHands(self.factory())
+                except Exception as e:
+                    print(f"[HandsPool] Failed to create spare detector: {e}")
+                    slot = None
+                with self._cond:
+                    self._creating -= 1
+                    if slot is not None and self._closed:
+                        self._close_hands(slot.hands)
+                    elif slot is not None:
+                        self._slots.append(slot)
+                    self._cond.notify_all()
+
+        threading.Thread(target=create_spares, daemon=True).start()
+
+    @staticmethod
+    def _close_hands(hands):
+        try:
+            hands.close()
+        except Exception:
+            pass  # Ignore close errors
+
+    # --- introspection / shutdown ---
+
+    def stats(self):
+        """Snapshot of pool occupancy for debug endpoints."""
+        with self._cond:
+            return {
+                "size": self.size,
+                "detectors": len(self._slots),
+                "in_use": sum(1 for s in self._slots if s.in_use),
+                "pinned_sessions": len(self._pinned),
+                "warm_spares": sum(1 for s in self._slots if not s.in_use and s.session_id is None),
+                "creating": self._creating,
+            }
+
+    def close(self):
+        """Close every detector in the pool."""
+        with self._cond:
+            self._closed = True
+            slots, self._slots = self._slots, []
+            self._pinned.clear()
+            self._cond.notify_all()
+        for slot in slots:
+            self._close_hands(slot.hands)
@@ -0,0 +1,277 @@
+"""
+Multi-process hand inference.
+
+Each worker process owns its own Hands detector, so MediaPipe inference and the
+Python-side pre/post-processing around it run outside the web process's GIL.
+Decoded frames are copied into a per-worker shared-memory slot (no pickling) and
+landmarks come back over a pipe as a compact float32 (hands, 21, 3) array.
+"""
+import multiprocessing as mp_proc
+import threading
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from .mediapipe_compat import results_from_landmarks
+except ImportError:
+    from mediapipe_compat import results_from_landmarks
+
+
+NUM_LANDMARKS = 21
+
+
+class InferenceWorkerError(Exception):
+    """Raised when a worker process fails or doesn't answer in time."""
+
+
+def _results_to_array(results):
+    """Pack legacy results into (landmarks float32 array, handedness list)."""
+    if not results.multi_hand_landmarks:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), []
+
+    landmarks = getattr(results, 'landmarks', None)  # Array-backed compat results
+    if landmarks is None:
+        landmarks = np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in results.multi_hand_landmarks],
+            dtype=np.float32,
+        )
+    handedness = []
+    for categories in results.multi_handedness or []:
+        top = categories[0] if isinstance(categories, (list, tuple)) else categories
+        handedness.append({
+            "label": getattr(top, "category_name", None) or getattr(top, "label", None),
+            "score": float(getattr(top, "score", 0.0)),
+        })
+    return landmarks, handedness
+
+
+def _worker_main(conn, shm_name, hands_kwargs, roi_tracking=False, warmup_frames=0,
+                 threads=0, slot=0):
+    """Worker process loop: read frames from shared memory, reply with landmark arrays."""
+    import mediapipe as mp
+    try:
+        from . import mediapipe_compat  # Also installs the mp.solutions shim
+    except ImportError:
+        import mediapipe_compat
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    # Before the detector exists, so its inference threads inherit the limit
+    mediapipe_compat.limit_inference_threads(threads, slot)
+    try:
+        hands = mp.solutions.hands.Hands(**hands_kwargs)
+        mediapipe_compat.warmup_hands(hands, warmup_frames)
+    except Exception as e:
+        conn.send(("failed", repr(e)))
+        shm.close()
+        return
+    if roi_tracking:
+        hands = mediapipe_compat.RoiTracker(hands)
+    # Only report ready once the detector is warm
+    conn.send(("ready",))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        job_id, shape = job
+        try:
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+            landmarks, handedness = _results_to_array(mediapipe_compat.process_bgr(hands, frame))
+            del frame  # Release the shared-memory view before the next job
+            conn.send((job_id, True, landmarks.shape[0], landmarks.tobytes(), handedness))
+        except Exception as e:
+            conn.send((job_id, False, 0, repr(e), None))
+
+    try:
+        hands.close()
+    except Exception:
+        pass
+    shm.close()
+
+
+class _Worker:
+    """Web-process handle for one inference process and its shared-memory slot."""
+
+    def __init__(self, ctx, slot_bytes, hands_kwargs, roi_tracking=False, warmup_frames=0,
+                 threads=0, slot=0):
+        self.index = slot
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_bytes)
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.shm.name, hands_kwargs, roi_tracking, warmup_frames,
+                  threads, slot),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.next_job = 0
+
+    def wait_ready(self, timeout):
+        if not self.ready:
+            if not self.conn.poll(timeout):
+                raise InferenceWorkerError("Inference worker did not start in time")
+            status = self.conn.recv()
+            if status[0] != "ready":
+                raise InferenceWorkerError(f"Inference worker failed to start: {status[1]}")
+            self.ready = True
+
+    def run(self, frame, timeout, start_timeout):
+        """Copy frame into shared memory and wait for landmarks. Caller holds the slot's lock."""
+        self.wait_ready(start_timeout)
+        np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf)[...] = frame
+        self.next_job += 1
+        self.conn.send((self.next_job, frame.shape))
+
+        if not self.conn.poll(timeout):
+            raise InferenceWorkerError(f"Inference worker timed out after {timeout:.1f}s")
+        job_id, ok, n_hands, payload, handedness = self.conn.recv()
+        if not ok:
+            raise InferenceWorkerError(f"Inference failed in worker: {payload}")
+        landmarks = np.frombuffer(payload, dtype=np.float32).reshape(n_hands, NUM_LANDMARKS, 3)
+        return landmarks, handedness
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class InferenceWorkerPool:
+    """Pool of inference processes, started lazily on first use.
+
+    Sessions hash to a fixed worker; frames without a session go to the first
+    idle worker. Unlike HandsPool, a worker is not exclusive to a session: with
+    more sessions than workers (or two sessions hashing alike) several sessions
+    share one worker's detector. Give the workers a stateless detector
+    (static_image_mode=True, no roi_tracking) so one session's frames never
+    feed the tracking state another session's frames are detected with.
+
+    Each worker index has one lock that outlives the process behind it, so a
+    restarted worker keeps the queue of threads waiting for that slot.
+
+    Args:
+        num_workers: Number of worker processes.
+        hands_kwargs: Keyword arguments for mp.solutions.hands.Hands in each worker.
+        slot_bytes: Size of each worker's shared-memory frame slot (largest BGR frame).
+        timeout: Seconds to wait for a worker to answer.
+        roi_tracking: Wrap each worker's detector in mediapipe_compat.RoiTracker.
+        warmup_frames: Dummy inferences each worker runs before reporting ready.
+        start_timeout: Seconds to wait for a new worker to load and warm its model.
+        threads: CPU cores per worker (0 = no limit). Workers get disjoint blocks of
+            cores while there are enough to go round.
+    """
+    def __init__(self, num_workers, hands_kwargs, slot_bytes=1920 * 1080 * 3, timeout=5.0,
+                 roi_tracking=False, warmup_frames=0, start_timeout=30.0, threads=0):
+        self.num_workers = max(1, int(num_workers))
+        self.hands_kwargs = dict(hands_kwargs)
+        self.slot_bytes = int(slot_bytes)
+        self.timeout = timeout
+        self.roi_tracking = roi_tracking
+        self.warmup_frames = warmup_frames
+        self.threads = threads
+        self.start_timeout = max(timeout, start_timeout)
+        # MediaPipe isn't fork-safe - always start clean interpreters
+        self._ctx = mp_proc.get_context("spawn")
+        self._workers = None
+        self._locks = [threading.Lock() for _ in range(self.num_workers)]
+        self._start_lock = threading.Lock()
+        self._pick_lock = threading.Lock()
+        self._next = 0
+
+    def fits(self, frame):
+        """True if the frame fits a shared-memory slot."""
+        return frame.dtype == np.uint8 and frame.nbytes <= self.slot_bytes
+
+    def _ensure_started(self):
+        if self._workers is None:
+            with self._start_lock:
+                if self._workers is None:
+                    self._workers = [self._spawn(i) for i in range(self.num_workers)]
+                    print(f"✅ Started {self.num_workers} inference worker processes")
+        return self._workers
+
+    def _spawn(self, index):
+        return _Worker(self._ctx, self.slot_bytes, self.hands_kwargs, self.roi_tracking,
+                       self.warmup_frames, self.threads, index)
+
+    def _pick(self, session_id):
+        """(worker index, already locked) for the next frame."""
+        self._ensure_started()
+        if session_id is not None:
+            return zlib.crc32(str(session_id).encode()) % self.num_workers, False
+        for index, lock in enumerate(self._locks):
+            if lock.acquire(blocking=False):
+                return index, True
+        with self._pick_lock:
+            self._next = (self._next + 1) % self.num_workers
+            return self._next, False
+
+    def process(self, frame, session_id=None):
+        """Run hand detection on a BGR uint8 frame; returns legacy-format results."""
+        if not self.fits(frame):
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds slot size {self.slot_bytes}")
+        frame = np.ascontiguousarray(frame)
+
+        index, locked = self._pick(session_id)
+        lock = self._locks[index]
+        if not locked and not lock.acquire(timeout=self.timeout):
+            raise InferenceWorkerError("No inference worker became free in time")
+        try:
+            # Read the slot only now: it may have been restarted while we waited
+            worker = self._workers[index]
+            if not worker.alive():
+                self._replace(worker)
+                raise InferenceWorkerError("Inference worker died and was restarted")
+            try:
+                landmarks, handedness = worker.run(frame, self.timeout, self.start_timeout)
+            except (EOFError, OSError, InferenceWorkerError):
+                self._replace(worker)
+                raise
+        finally:
+            lock.release()
+        return results_from_landmarks(landmarks, handedness)
+
+    def _replace(self, worker):
+        """Swap a dead or stuck worker for a fresh process (caller holds its slot's lock)."""
+        index = worker.index
+        if self._workers is None or self._workers[index] is not worker:
+            return  # Already replaced (or the pool was closed)
+        print(f"⚠️ [InferenceWorkers] Restarting worker {index}")
+        worker.stop()
+        self._workers[index] = self._spawn(index)
+
+    def stats(self):
+        workers = self._workers or []
+        return {
+            "processes": len(workers),
+            "alive": sum(1 for w in workers if w.alive()),
+            "busy": sum(1 for lock in self._locks if lock.locked()),
+        }
+
+    def close(self):
+        if self._workers:
+            for worker in self._workers:
+                worker.stop()
+            self._workers = None
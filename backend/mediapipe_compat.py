@@ -2,10 +2,179 @@
 MediaPipe Compatibility Shim for 0.10.x
 This module provides backward compatibility for code using the deprecated mp.solutions API
 """
+import hashlib
+import os
+import threading
+import time
+import traceback
+import urllib.request
+
+import cv2
 import mediapipe as mp
 import numpy as np
 
 
+RUNNING_MODES = ("image", "video", "live_stream")
+_SRGB = mp.ImageFormat.SRGB
+
+
+# --- MODEL PROVISIONING ---
+# The model lives next to this module (or at HAND_MODEL_PATH). It isn't in git: the
+# build step (`python mediapipe_compat.py`) downloads it and pins its checksum, and
+# startup downloads it as a fallback unless HAND_MODEL_DOWNLOAD=0. It is verified once
+# per process; a model that can't be found or verified fails at startup instead of
+# silently producing empty results.
+MODEL_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL_PATH = os.path.join(MODEL_DIR, 'hand_landmarker.task')
+
+# HAND_MODEL_VARIANT picks the model file: "full" is the default float16 model; any
+# other variant (e.g. a lighter or re-quantized build) is read from
+# hand_landmarker_<variant>.task next to it. Only "full" can be downloaded.
+DEFAULT_MODEL_VARIANT = "full"
+MODEL_VARIANT_URLS = {DEFAULT_MODEL_VARIANT: MODEL_URL}
+
+
+class ModelUnavailableError(RuntimeError):
+    """Raised when the hand landmarker model can't be found, downloaded or verified."""
+
+
+_model_lock = threading.Lock()
+_verified_models = {}  # path -> sha256 hex digest
+_model_buffers = {}  # path -> model bytes (HAND_MODEL_IN_MEMORY)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _expected_sha256(path):
+    """Checksum from HAND_MODEL_SHA256 or a '<model>.sha256' file next to the model."""
+    expected = os.environ.get('HAND_MODEL_SHA256')
+    if not expected and os.path.exists(path + '.sha256'):
+        with open(path + '.sha256') as f:
+            # Accept both a bare digest and `sha256sum` output ("<digest>  <file>")
+            fields = f.read().split()
+        expected = fields[0] if fields else None
+    return expected.strip().lower() if expected else None
+
+
+def model_variant_path(variant=None):
+    """Model file for a variant name (next to this module)."""
+    if not variant or variant == DEFAULT_MODEL_VARIANT:
+        return DEFAULT_MODEL_PATH
+    return os.path.join(MODEL_DIR, f'hand_landmarker_{variant}.task')
+
+
+def _download_model(path, url):
+    print(f"⬇️ Downloading hand landmarker model to {path}...")
+    partial = path + '.part'
+    try:
+        urllib.request.urlretrieve(url, partial)
+        os.replace(partial, path)  # Never leave a truncated model at the real path
+    except Exception as e:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise ModelUnavailableError(f"Failed to download hand landmarker model: {e}") from e
+
+
+def provision_model(path=None, allow_download=None, variant=None):
+    """Locate and verify the hand landmarker model; returns its absolute path.
+
+    An explicit path (or HAND_MODEL_PATH) wins over the variant. Verification runs
+    once per process, so every detector after the first starts without touching
+    the network or re-hashing the file.
+    """
+    variant = variant or os.environ.get('HAND_MODEL_VARIANT') or DEFAULT_MODEL_VARIANT
+    path = os.path.abspath(path or os.environ.get('HAND_MODEL_PATH') or model_variant_path(variant))
+    if allow_download is None:
+        allow_download = os.environ.get('HAND_MODEL_DOWNLOAD', '1') == '1'
+
+    with _model_lock:
+        if path in _verified_models:
+            return path
+
+        if not os.path.exists(path):
+            url = MODEL_VARIANT_URLS.get(variant)
+            if not allow_download or url is None:
+                raise ModelUnavailableError(
+                    f"Hand landmarker model ({variant}) not found at {path}. Run "
+                    f"`python mediapipe_compat.py` at build time or point HAND_MODEL_PATH at it"
+                    + (", or set HAND_MODEL_DOWNLOAD=1." if url else ".")
+                )
+            _download_model(path, url)
+
+        actual = file_sha256(path)
+        expected = _expected_sha256(path)
+        if expected and actual != expected:
+            raise ModelUnavailableError(
+                f"Hand landmarker model checksum mismatch for {path}: "
+                f"expected {expected}, got {actual}"
+            )
+        _verified_models[path] = actual
+        status = "verified" if expected else "unpinned - set HAND_MODEL_SHA256 to verify"
+        print(f"✅ Hand landmarker model ready: {path} (sha256 {actual[:12]}, {status})")
+        return path
+
+
+def model_base_options(path, delegate=None):
+    """BaseOptions for a provisioned model.
+
+    By default MediaPipe loads the model by path, which memory-maps the file and lets
+    every detector in the process share the same pages. HAND_MODEL_IN_MEMORY=1 instead
+    reads the verified bytes once and hands the same buffer to every detector (for
+    models on slow or network storage). delegate (or HAND_MODEL_DELEGATE) is "cpu"
+    or "gpu".
+    """
+    from mediapipe.tasks.python import BaseOptions
+
+    delegate = (delegate or os.environ.get('HAND_MODEL_DELEGATE') or 'cpu').upper()
+    if delegate not in BaseOptions.Delegate.__members__:
+        raise ValueError(f"Unknown hand model delegate: {delegate.lower()}")
+    delegate = BaseOptions.Delegate[delegate]
+
+    if os.environ.get('HAND_MODEL_IN_MEMORY', '0') != '1':
+        return BaseOptions(model_asset_path=path, delegate=delegate)
+    with _model_lock:
+        buffer = _model_buffers.get(path)
+        if buffer is None:
+            with open(path, 'rb') as f:
+                buffer = _model_buffers[path] = f.read()
+    return BaseOptions(model_asset_buffer=buffer, delegate=delegate)
+
+
+def limit_inference_threads(threads, slot=0):
+    """Confine this process's inference to `threads` CPU cores; returns the cores used.
+
+    The Tasks Python API has no thread-count option, so the calling thread is pinned
+    to `threads` cores before detectors are created (MediaPipe's worker threads
+    inherit the affinity) and OpenCV gets the same thread count. slot picks which
+    block of cores, so several inference processes on one node don't share cores.
+    """
+    if threads <= 0:
+        return None
+    cv2.setNumThreads(threads)
+    if not hasattr(os, 'sched_setaffinity'):
+        return None  # Not available on macOS/Windows - OpenCV limit only
+    available = sorted(os.sched_getaffinity(0))
+    if threads >= len(available):
+        return available
+    start = (slot * threads) % len(available)
+    cores = [available[(start + i) % len(available)] for i in range(threads)]
+    os.sched_setaffinity(0, cores)
+    return cores
+
+
+def model_info():
+    """Provisioned models and their checksums (for health/debug endpoints)."""
+    with _model_lock:
+        return [{"path": path, "sha256": digest} for path, digest in _verified_models.items()]
+
+
 class NormalizedLandmark:
     """Simple landmark class"""
     def __init__(self, x=0, y=0, z=0):
@@ -20,6 +189,104 @@ class NormalizedLandmarkList:
         self.landmark = []
 
 
+class LandmarkView:
+    """Read/write view of one landmark row in a results array (legacy .x/.y/.z access)"""
+    __slots__ = ("_row",)
+
+    def __init__(self, row):
+        self._row = row
+
+    @property
+    def x(self):
+        return float(self._row[0])
+
+    @x.setter
+    def x(self, value):
+        self._row[0] = value
+
+    @property
+    def y(self):
+        return float(self._row[1])
+
+    @y.setter
+    def y(self, value):
+        self._row[1] = value
+
+    @property
+    def z(self):
+        return float(self._row[2])
+
+    @z.setter
+    def z(self, value):
+        self._row[2] = value
+
+
+class HandLandmarksView:
+    """One hand of an ArrayResults, usable wherever a NormalizedLandmarkList was"""
+    __slots__ = ("array", "_points")
+
+    def __init__(self, array):
+        self.array = array  # (21, 3) float32 view
+        self._points = None
+
+    @property
+    def landmark(self):
+        return self
+
+    def points(self):
+        """Per-point views, built once (they write through to the array)"""
+        if self._points is None:
+            self._points = [LandmarkView(row) for row in self.array]
+        return self._points
+
+    def __getitem__(self, index):
+        return self.points()[index]
+
+    def __len__(self):
+        return self.array.shape[0]
+
+    def __iter__(self):
+        return iter(self.points())
+
+
+class ArrayResults:
+    """Hand results backed by a (hands, 21, 3) float32 array of normalized landmarks.
+
+    multi_hand_landmarks gives legacy per-point access (.landmark[i].x) for old callers;
+    new code can read .landmarks directly for vectorized math. The legacy views are
+    built on first access and reused, so repeated legacy reads don't allocate.
+    """
+    __slots__ = ("landmarks", "multi_handedness", "_hands")
+
+    def __init__(self, landmarks, handedness=None):
+        self.landmarks = landmarks
+        self.multi_handedness = handedness if len(landmarks) else None
+        self._hands = None
+
+    @property
+    def multi_hand_landmarks(self):
+        if not len(self.landmarks):
+            return None
+        if self._hands is None:
+            self._hands = [HandLandmarksView(hand) for hand in self.landmarks]
+        return self._hands
+
+
+# Shared result for frames without hands (never mutated)
+EMPTY_RESULTS = ArrayResults(np.empty((0, 21, 3), dtype=np.float32))
+
+
+def results_from_landmarks(landmarks, handedness=None):
+    """Build results from an (hands, 21, 3) array of normalized landmarks.
+
+    Used for landmarks computed elsewhere (worker processes, in-browser landmarkers).
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, 21, 3)
+    if not len(landmarks):
+        return EMPTY_RESULTS
+    return ArrayResults(landmarks, handedness)
+
+
 class DrawingUtils:
     """Compatibility wrapper for mp.solutions.drawing_utils"""
     
@@ -30,7 +297,6 @@ class DrawingUtils:
         if landmark_list is None or not hasattr(landmark_list, 'landmark'):
             return
         
-        import cv2
         h, w, _ = image.shape
         
         # Draw landmarks
@@ -90,13 +356,26 @@ class HandLandmark:
 
 
 class Hands:
-    """Compatibility wrapper for mp.solutions.hands.Hands"""
+    """Compatibility wrapper for mp.solutions.hands.Hands
+
+    Unlike the legacy API, process() takes BGR frames straight from OpenCV and does
+    the RGB conversion itself (see process_bgr()).
+
+    Running mode follows static_image_mode like the legacy API: True uses IMAGE mode
+    (full detection every call), False uses VIDEO mode so MediaPipe can track the
+    hand across frames instead of re-detecting it. running_mode="live_stream" runs
+    detection asynchronously; process() then returns the latest finished result.
+    """
+    accepts_bgr = True
     
     def __init__(self, static_image_mode=False, max_num_hands=2, 
-                 min_detection_confidence=0.5, min_tracking_confidence=0.5):
-        """Initialize hands detector with legacy API parameters"""
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 running_mode=None, model_path=None, model_variant=None, delegate=None):
+        """Initialize hands detector with legacy API parameters
+
+        Raises ModelUnavailableError if the model is missing or fails verification.
+        """
         # Import here to avoid circular imports
-        import cv2
         import mediapipe as mp
         from mediapipe.tasks import python
         from mediapipe.tasks.python import vision
@@ -104,101 +383,112 @@ class Hands:
         self.mp_hands = vision.HandLandmarker
         self.mp_hands_model_path = None
         
-        # Download model if needed
-        import os
-        import urllib.request
-        
-        model_path = os.path.join(os.path.dirname(__file__), 'hand_landmarker.task')
+        if running_mode is None:
+            running_mode = "image" if static_image_mode else "video"
+        if running_mode not in RUNNING_MODES:
+            raise ValueError(f"running_mode must be one of {RUNNING_MODES}")
+        self.running_mode = running_mode
+        self._last_timestamp_ms = -1
+        self._latest_result = None
+        self._result_lock = threading.Lock()
+        # Reusable RGB conversion buffer, grown only when a larger frame arrives
+        self._rgb_storage = np.empty(0, dtype=np.uint8)
         
-        if not os.path.exists(model_path):
-            print("Downloading hand landmarker model...")
-            model_url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
-            try:
-                urllib.request.urlretrieve(model_url, model_path)
-                print("Model downloaded successfully!")
-            except Exception as e:
-                print(f"Failed to download model: {e}")
-                # Use a backup approach - create a simpler detector
-                self.detector = None
-                return
+        model_path = provision_model(model_path, variant=model_variant)
         
         # Configure detector
         from mediapipe.tasks.python import vision
-        from mediapipe.tasks.python import BaseOptions
         
+        mode_options = {
+            "image": dict(running_mode=vision.RunningMode.IMAGE),
+            "video": dict(running_mode=vision.RunningMode.VIDEO),
+            "live_stream": dict(running_mode=vision.RunningMode.LIVE_STREAM,
+                                result_callback=self._on_async_result),
+        }
         options = vision.HandLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=model_path),
-            running_mode=vision.RunningMode.IMAGE,  # Use IMAGE mode for simpler processing
+            base_options=model_base_options(model_path, delegate),
             num_hands=max_num_hands,
             min_hand_detection_confidence=min_detection_confidence,
             min_hand_presence_confidence=min_tracking_confidence,
-            min_tracking_confidence=min_tracking_confidence
+            min_tracking_confidence=min_tracking_confidence,
+            **mode_options[running_mode]
         )
         
         try:
             self.detector = self.mp_hands.create_from_options(options)
         except Exception as e:
-            print(f"Failed to create detector: {e}")
-            self.detector = None
+            raise ModelUnavailableError(f"Failed to create hand landmarker from {model_path}: {e}") from e
+
+    def warmup(self, frames=2, size=(640, 480)):
+        """Run dummy inferences so graph init and buffer allocation happen before real traffic."""
+        blank = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        started = time.perf_counter()
+        for _ in range(frames):
+            self.process(blank)
+        if self.running_mode == "live_stream":
+            with self._result_lock:
+                self._latest_result = None  # Don't hand the warm-up result to the first caller
+        return time.perf_counter() - started
     
-    def process(self, image):
-        """Process image and return results in legacy format"""
+    def _next_timestamp(self, timestamp_ms=None):
+        """Monotonic per-detector timestamp in ms (VIDEO/LIVE_STREAM require strictly increasing)."""
+        if timestamp_ms is None:
+            timestamp_ms = int(time.monotonic() * 1000)
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+    
+    def _on_async_result(self, result, output_image, timestamp_ms):
+        """LIVE_STREAM callback - keep only the newest result."""
+        with self._result_lock:
+            self._latest_result = result
+    
+    def _to_rgb(self, image):
+        """Convert a BGR frame to RGB in the reusable buffer (the only color conversion)."""
+        h, w = image.shape[:2]
+        size = h * w * 3
+        if self._rgb_storage.size < size:
+            self._rgb_storage = np.empty(size, dtype=np.uint8)
+        rgb = self._rgb_storage[:size].reshape(h, w, 3)
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def process(self, image, timestamp_ms=None):
+        """Process a BGR image and return results in legacy format
+
+        timestamp_ms is only used in VIDEO/LIVE_STREAM modes; by default a monotonic
+        clock is used.
+        """
         if self.detector is None:
-            print("[DEBUG] Detector is None!")
-            # Return empty result
-            class EmptyResult:
-                multi_hand_landmarks = None
-                multi_handedness = None
-            return EmptyResult()
+            return EMPTY_RESULTS
         
-        # Convert BGR to RGB
-        import cv2
-        from mediapipe import Image, ImageFormat
-        from mediapipe.tasks.python import vision
+        # mp.Image copies the pixels, so the RGB buffer can be reused right away
+        mp_image = mp.Image(image_format=_SRGB, data=self._to_rgb(image))
         
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=ImageFormat.SRGB, data=rgb_image)
-        
-        # Use IMAGE mode detection (no timestamp needed)
         try:
-            detection_result = self.detector.detect(mp_image)
-            
-            # Debug: Check what we got (silent when no hands detected)
-            if detection_result:
-                if hasattr(detection_result, 'hand_landmarks') and detection_result.hand_landmarks:
-                    pass  # Hand detected - silent
-                else:
-                    pass  # No hands - silent (normal state)
+            if self.running_mode == "video":
+                detection_result = self.detector.detect_for_video(
+                    mp_image, self._next_timestamp(timestamp_ms))
+            elif self.running_mode == "live_stream":
+                self.detector.detect_async(mp_image, self._next_timestamp(timestamp_ms))
+                with self._result_lock:
+                    detection_result = self._latest_result
             else:
-                pass  # No detection - silent
-                
+                # IMAGE mode detection (no timestamp needed)
+                detection_result = self.detector.detect(mp_image)
         except Exception as e:
-            print(f"[DEBUG] ❌ Detection error: {e}")
-            import traceback
+            print(f"❌ Hand detection error: {e}")
             traceback.print_exc()
-            class EmptyResult:
-                multi_hand_landmarks = None
-                multi_handedness = None
-            return EmptyResult()
-        
-        # Convert to legacy format
-        class LegacyResults:
-            def __init__(self, new_results):
-                if new_results and new_results.hand_landmarks:
-                    self.multi_hand_landmarks = []
-                    for hand_landmarks in new_results.hand_landmarks:
-                        # Create landmark list in old format
-                        landmark_list = NormalizedLandmarkList()
-                        for landmark in hand_landmarks:
-                            l = NormalizedLandmark(landmark.x, landmark.y, landmark.z)
-                            landmark_list.landmark.append(l)
-                        self.multi_hand_landmarks.append(landmark_list)
-                    self.multi_handedness = new_results.handedness
-                else:
-                    self.multi_hand_landmarks = None
-                    self.multi_handedness = None
+            return EMPTY_RESULTS
         
-        return LegacyResults(detection_result)
+        # Convert to array-backed legacy format
+        if not detection_result or not detection_result.hand_landmarks:
+            return EMPTY_RESULTS
+        landmarks = np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand] for hand in detection_result.hand_landmarks],
+            dtype=np.float32,
+        )
+        return ArrayResults(landmarks, detection_result.handedness)
     
     def close(self):
         """Close the detector"""
@@ -206,6 +496,141 @@ class Hands:
             self.detector.close()
 
 
+class RoiTracker:
+    """Wraps a Hands detector and runs it on a crop around the previous frame's hand.
+
+    The crop is a square around the last landmark bounding box (plus margin), so the
+    detector converts and scans a much smaller image while the hand is tracked.
+    It falls back to the full frame when no hand is found in the crop, confidence
+    drops below min_confidence, or there was no hand in the previous frame.
+    Landmarks are always returned normalized to the full frame.
+
+    Wrap IMAGE-mode detectors only: a VIDEO/LIVE_STREAM detector already tracks the
+    hand on its own crop, and a crop that moves between frames breaks its tracking.
+    The ROI is per-instance state, so each tracker should serve a single session.
+    """
+    def __init__(self, hands, margin=0.35, min_confidence=0.6, min_size=96):
+        self.hands = hands
+        self.margin = margin
+        self.min_confidence = min_confidence
+        self.min_size = min_size
+        self.roi = None  # (x0, y0, x1, y1) in pixels
+        self.crop_runs = 0
+        self.full_runs = 0
+
+    def process(self, image):
+        h, w = image.shape[:2]
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            results = self.hands.process(image[y0:y1, x0:x1])
+            self.crop_runs += 1
+            if results.multi_hand_landmarks and self._confidence(results) >= self.min_confidence:
+                self._to_full_frame(results, x0, y0, x1 - x0, y1 - y0, w, h)
+                self._update_roi(results, w, h)
+                return results
+
+        # No ROI yet, or the hand left the box / confidence dropped: full-frame detection
+        results = self.hands.process(image)
+        self.full_runs += 1
+        if results.multi_hand_landmarks:
+            self._update_roi(results, w, h)
+        else:
+            self.roi = None
+        return results
+
+    @property
+    def accepts_bgr(self):
+        return getattr(self.hands, 'accepts_bgr', False)
+
+    def reset(self):
+        self.roi = None
+
+    def warmup(self, frames=2, size=(640, 480)):
+        # Warm the wrapped detector directly so the ROI state stays untouched
+        return warmup_hands(self.hands, frames, size)
+
+    def close(self):
+        self.hands.close()
+
+    @staticmethod
+    def _confidence(results):
+        """Best handedness score (a detection-confidence proxy); 1.0 if unavailable."""
+        scores = []
+        for entry in results.multi_handedness or []:
+            # Task API: [Category, ...]; solutions API: ClassificationList; workers: dict
+            categories = getattr(entry, 'classification', entry)
+            if isinstance(categories, dict) or not hasattr(categories, '__len__'):
+                top = categories
+            else:
+                top = categories[0] if len(categories) else None
+            score = top.get('score') if isinstance(top, dict) else getattr(top, 'score', None)
+            if score is not None:
+                scores.append(score)
+        return max(scores) if scores else 1.0
+
+    @staticmethod
+    def _to_full_frame(results, x0, y0, cw, ch, w, h):
+        """Remap crop-normalized landmarks to full-frame normalized coordinates (in place)."""
+        landmarks = getattr(results, 'landmarks', None)
+        if landmarks is not None:
+            landmarks[..., 0] = (landmarks[..., 0] * cw + x0) / w
+            landmarks[..., 1] = (landmarks[..., 1] * ch + y0) / h
+            landmarks[..., 2] *= cw / w  # z shares the x scale
+            return
+        for hand in results.multi_hand_landmarks:
+            for lm in hand.landmark:
+                lm.x = (lm.x * cw + x0) / w
+                lm.y = (lm.y * ch + y0) / h
+                lm.z = lm.z * cw / w  # z shares the x scale
+
+    def _update_roi(self, results, w, h):
+        """Square crop around the first hand's landmarks, expanded by margin and clamped."""
+        landmarks = getattr(results, 'landmarks', None)
+        if landmarks is not None:
+            xs = landmarks[0, :, 0] * w
+            ys = landmarks[0, :, 1] * h
+        else:
+            points = results.multi_hand_landmarks[0].landmark
+            xs = np.array([lm.x for lm in points]) * w
+            ys = np.array([lm.y for lm in points]) * h
+        x_min, x_max = float(xs.min()), float(xs.max())
+        y_min, y_max = float(ys.min()), float(ys.max())
+        cx = (x_min + x_max) / 2
+        cy = (y_min + y_max) / 2
+        side = max(x_max - x_min, y_max - y_min) * (1 + 2 * self.margin)
+        side = min(max(side, self.min_size), w, h)
+
+        x0 = int(max(0, min(w - side, cx - side / 2)))
+        y0 = int(max(0, min(h - side, cy - side / 2)))
+        self.roi = (x0, y0, int(x0 + side), int(y0 + side))
+
+
+def process_bgr(hands, frame):
+    """Run any Hands-like detector on a BGR frame with exactly one color conversion.
+
+    Compat detectors convert into their own reusable buffer; the real
+    mp.solutions Hands expects RGB, so the frame is converted here instead.
+    """
+    if getattr(hands, 'accepts_bgr', False):
+        return hands.process(frame)
+    return hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def warmup_hands(hands, frames=2, size=(640, 480)):
+    """Warm up any Hands-like detector; returns seconds spent (0.0 if not supported)."""
+    if frames <= 0:
+        return 0.0
+    warmup = getattr(hands, 'warmup', None)
+    if warmup is not None:
+        return warmup(frames, size)
+    # Real mp.solutions Hands: plain dummy process() calls
+    blank = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    started = time.perf_counter()
+    for _ in range(frames):
+        process_bgr(hands, blank)
+    return time.perf_counter() - started
+
+
 # Create a solutions-like module structure
 class SolutionsMock:
     """Mock mp.solutions module"""
@@ -221,3 +646,13 @@ class SolutionsMock:
 # Inject solutions into mediapipe if it doesn't exist
 if not hasattr(mp, 'solutions'):
     mp.solutions = SolutionsMock()
+
+
+if __name__ == "__main__":
+    # Build-time provisioning step: python mediapipe_compat.py [model_path]
+    # Downloads the model if it's missing and pins its checksum in '<model>.sha256'.
+    import sys
+    target = provision_model(sys.argv[1] if len(sys.argv) > 1 else None, allow_download=True)
+    with open(target + '.sha256', 'w') as f:
+        f.write(f"{file_sha256(target)}  {os.path.basename(target)}\n")
+    print(f"📌 Wrote {target}.sha256")
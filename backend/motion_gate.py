@@ -0,0 +1,129 @@
+"""
+Motion-gated inference skipping.
+
+A small grayscale thumbnail of each frame is compared with the thumbnail of the
+last frame that actually went through inference. If the scene hasn't changed
+meaningfully (and the cached result isn't too old), the previous hand results
+are reused instead of running the detector again.
+
+Change is measured as the fraction of thumbnail pixels whose difference exceeds
+a per-pixel threshold, not as a mean over the frame: a moving fingertip covers a
+tiny share of the image and would vanish in a frame-wide average. When the last
+inferred frame had a hand, only the region around that hand is compared, so the
+fraction is relative to the hand's own size.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class _Entry:
+    __slots__ = ("thumb", "results", "time", "roi")
+
+    def __init__(self, thumb, results, when, roi):
+        self.thumb = thumb
+        self.results = results
+        self.time = when
+        self.roi = roi
+
+
+def hand_roi(landmarks, margin=0.25):
+    """Normalized (x0, y0, x1, y1) box around the first hand of an (N, 21, 3) array, or None.
+
+    The box is grown by margin times its size on every side, so a hand moving out
+    of its old position still changes pixels inside it.
+    """
+    landmarks = np.asarray(landmarks)
+    if landmarks.size == 0:
+        return None
+    xs, ys = landmarks[0, :, 0], landmarks[0, :, 1]
+    x0, x1 = float(xs.min()), float(xs.max())
+    y0, y1 = float(ys.min()), float(ys.max())
+    dx, dy = (x1 - x0) * margin, (y1 - y0) * margin
+    return (max(0.0, x0 - dx), max(0.0, y0 - dy), min(1.0, x1 + dx), min(1.0, y1 + dy))
+
+
+class MotionGate:
+    """Per-session change detector in front of hand inference.
+
+    Args:
+        threshold: Absolute difference (0-255) above which a thumbnail pixel counts
+            as changed.
+        changed_fraction: Share of changed pixels (in the hand region, or the whole
+            thumbnail without a hand) from which the frame counts as changed.
+        max_age: Seconds after which inference is forced even for a static scene.
+        size: Thumbnail (width, height) used for differencing.
+        max_sessions: Sessions remembered (least recently used are dropped).
+    """
+    def __init__(self, threshold=12, changed_fraction=0.01, max_age=0.5, size=(64, 48),
+                 max_sessions=1024):
+        self.threshold = threshold
+        self.changed_fraction = changed_fraction
+        self.max_age = max_age
+        self.size = size
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def thumbnail(self, frame):
+        """Downsampled grayscale signature of a BGR frame."""
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def lookup(self, key, thumb, now=None):
+        """Return (cached_results, age_seconds) if the frame can reuse the last result, else (None, None)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                age = now - entry.time
+                if age < self.max_age and entry.thumb.shape == thumb.shape:
+                    if self.changed(entry.thumb, thumb, entry.roi) < self.changed_fraction:
+                        self.hits += 1
+                        return entry.results, age
+            self.misses += 1
+            return None, None
+
+    def changed(self, before, after, roi=None):
+        """Fraction of pixels that changed between two thumbnails, within roi if given."""
+        if roi is not None:
+            h, w = before.shape[:2]
+            x0, y0 = int(roi[0] * w), int(roi[1] * h)
+            x1 = max(x0 + 1, min(w, int(np.ceil(roi[2] * w))))
+            y1 = max(y0 + 1, min(h, int(np.ceil(roi[3] * h))))
+            before, after = before[y0:y1, x0:x1], after[y0:y1, x0:x1]
+        diff = cv2.absdiff(before, after)
+        return np.count_nonzero(diff > self.threshold) / float(diff.size)
+
+    def store(self, key, thumb, results, now=None, roi=None):
+        """Remember the results of a frame that went through inference.
+
+        roi: normalized box of the hand in that frame (see hand_roi()); later
+        frames are then compared only inside it.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._entries[key] = _Entry(thumb, results, now, roi)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+
+    def forget(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "sessions": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
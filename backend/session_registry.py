@@ -0,0 +1,106 @@
+"""
+LRU/TTL registry of per-session objects.
+
+Entries are created lazily on first use, refreshed on every access and dropped
+when they have been idle for longer than the TTL or when the registry is full
+(least recently used first). Pinned entries are never evicted.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionRegistry:
+    """Thread-safe map of session key -> lazily created entry.
+
+    Args:
+        factory: Callable(key) returning a new entry.
+        max_sessions: Maximum live (unpinned) entries. Entries are fixed-size, so
+            this also bounds the registry's memory.
+        ttl: Seconds of inactivity after which an entry is evicted (0 = never).
+        pinned: Optional {key: entry} that is always present and never evicted.
+        on_evict: Optional callable(key, entry) run after an entry is dropped.
+    """
+    def __init__(self, factory, max_sessions=256, ttl=600.0, pinned=None, on_evict=None):
+        self.factory = factory
+        self.max_sessions = max(1, int(max_sessions))
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._pinned = dict(pinned or {})
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> [entry, last_used]
+        self.created_total = 0
+        self.evicted_total = 0
+
+    def get(self, key):
+        """Entry for key, creating it if needed."""
+        if key in self._pinned:
+            return self._pinned[key]
+        now = time.time()
+        with self._lock:
+            slot = self._entries.get(key)
+            if slot is not None:
+                slot[1] = now
+                self._entries.move_to_end(key)
+                return slot[0]
+
+            evicted = self._evict_locked(now, room_for=1)
+            entry = self.factory(key)
+            self._entries[key] = [entry, now]
+            self.created_total += 1
+        self._notify(evicted)
+        return entry
+
+    def peek(self, key):
+        """Entry for key if it exists (doesn't create it or refresh its TTL)."""
+        if key in self._pinned:
+            return self._pinned[key]
+        with self._lock:
+            slot = self._entries.get(key)
+            return slot[0] if slot is not None else None
+
+    def discard(self, key):
+        """Drop a session's entry (e.g. on logout)."""
+        with self._lock:
+            slot = self._entries.pop(key, None)
+        if slot is not None:
+            self._notify([(key, slot[0])])
+
+    def items(self):
+        """Snapshot of (key, entry) pairs, pinned entries included."""
+        with self._lock:
+            live = [(key, slot[0]) for key, slot in self._entries.items()]
+        return list(self._pinned.items()) + live
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._entries),
+                "pinned": len(self._pinned),
+                "max_sessions": self.max_sessions,
+                "created_total": self.created_total,
+                "evicted_total": self.evicted_total,
+            }
+
+    def _evict_locked(self, now, room_for=0):
+        """Drop expired entries, then LRU entries until room_for new ones fit."""
+        evicted = []
+        # Oldest entries are at the front, so expiry stops at the first live one
+        while self._entries:
+            key, (entry, last_used) = next(iter(self._entries.items()))
+            expired = self.ttl and now - last_used > self.ttl
+            if not expired and len(self._entries) + room_for <= self.max_sessions:
+                break
+            self._entries.popitem(last=False)
+            evicted.append((key, entry))
+        self.evicted_total += len(evicted)
+        return evicted
+
+    def _notify(self, evicted):
+        if self.on_evict is None:
+            return
+        for key, entry in evicted:
+            try:
+                self.on_evict(key, entry)
+            except Exception as e:
+                print(f"[SessionRegistry] on_evict failed for {key}: {e}")
@@ -0,0 +1,52 @@
+"""
+Immutable, versioned gesture state.
+
+The gesture pipeline publishes a new StateSnapshot per update by swapping a
+single attribute, so readers (state endpoints, MJPEG generators) take no lock:
+one attribute read always yields a complete, consistent state. Snapshots and
+the dicts they hold are never modified after publication; writers derive the
+next one with evolve().
+"""
+
+
+class StateSnapshot:
+    """One published version of a session's gesture state.
+
+    Attributes:
+        version: Increases by one with every published snapshot.
+        gesture: Stable (debounced) gesture, or None.
+        gesture_time: Frame timestamp of the last stable gesture.
+        hand_position: {"x", "y", "z", "visible"} of the index fingertip.
+        pen: Smoothed pen {"x", "y", "pen_down"} for the whiteboard.
+        jump_trigger: Pinch fired on this frame (Dino Run).
+        whiteboard: {"action", "stroke_size"}.
+        motion: Last temporal gesture {"event", "gesture", "time", "seq"}.
+        landmarks: First hand's landmarks of the last frame with a hand.
+        results: MediaPipe results of the last frame with a hand.
+    """
+    __slots__ = ("version", "gesture", "gesture_time", "hand_position", "pen", "jump_trigger",
+                 "whiteboard", "motion", "landmarks", "results")
+
+    def __init__(self, version=0, gesture=None, gesture_time=0, hand_position=None, pen=None,
+                 jump_trigger=False, whiteboard=None, motion=None, landmarks=None, results=None):
+        set_field = object.__setattr__
+        set_field(self, "version", version)
+        set_field(self, "gesture", gesture)
+        set_field(self, "gesture_time", gesture_time)
+        set_field(self, "hand_position", hand_position or {"x": 0, "y": 0, "z": 0, "visible": False})
+        set_field(self, "pen", pen or {"x": 0, "y": 0, "pen_down": False})
+        set_field(self, "jump_trigger", jump_trigger)
+        set_field(self, "whiteboard", whiteboard or {"action": None, "stroke_size": 3})
+        set_field(self, "motion", motion or {"event": None, "gesture": None, "time": 0, "seq": 0})
+        set_field(self, "landmarks", landmarks)
+        set_field(self, "results", results)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("StateSnapshot is immutable; publish an evolve()d copy instead")
+
+    def evolve(self, **changes):
+        """Next version: a copy with the given fields replaced."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        values["version"] = self.version + 1
+        return StateSnapshot(**values)
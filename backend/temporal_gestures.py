@@ -0,0 +1,225 @@
+"""
+Temporal (multi-frame) gestures.
+
+Each session keeps a fixed-size ring buffer of timestamped landmarks in
+preallocated NumPy arrays. Detectors look at a recent time window of that buffer
+with vectorized math - no per-frame Python lists - to recognize motions a single
+frame can't show:
+
+- swipe_left / swipe_right: a fast, mostly horizontal palm movement
+- hold: the same pose kept still for a while (reported with the held gesture)
+- circle_cw / circle_ccw: the index fingertip going once around a loop
+
+x/y are normalized image coordinates of the mirrored (selfie) frame, so "left"
+and "clockwise" are as the user sees them on screen.
+"""
+import numpy as np
+
+try:
+    from .gesture_features import GESTURES
+except ImportError:
+    from gesture_features import GESTURES
+
+
+# Wrist + finger MCPs: a palm center that doesn't move when fingers curl
+PALM_POINTS = [0, 5, 9, 13, 17]
+INDEX_TIP = 8
+HOLD_POINTS = PALM_POINTS + [INDEX_TIP]
+
+
+class LandmarkHistory:
+    """Ring buffer of the last `capacity` frames of one hand.
+
+    Stores timestamps, (21, 3) landmarks, the frame's gesture code and whether a
+    hand was present. Frames without a hand are recorded too, so a window that
+    spans a dropout is detectable.
+    """
+    __slots__ = ("capacity", "times", "landmarks", "codes", "present", "count", "_head", "_order")
+
+    def __init__(self, capacity=64):
+        self.capacity = int(capacity)
+        self.times = np.zeros(self.capacity, dtype=np.float64)
+        self.landmarks = np.zeros((self.capacity, 21, 3), dtype=np.float32)
+        self.codes = np.zeros(self.capacity, dtype=np.uint8)
+        self.present = np.zeros(self.capacity, dtype=bool)
+        self.count = 0
+        self._head = 0  # Next slot to write
+        self._order = np.arange(self.capacity)
+
+    def push(self, now, landmarks=None, code=0):
+        """Record one frame (landmarks=None when no hand was seen)."""
+        i = self._head
+        self.times[i] = now
+        if landmarks is None:
+            self.present[i] = False
+        else:
+            self.landmarks[i] = landmarks
+            self.codes[i] = code
+            self.present[i] = True
+        self._head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, start):
+        """Buffer indices of the frames at or after `start`, oldest first."""
+        if not self.count:
+            return self._order[:0]
+        # Chronological order of the stored frames, then keep the tail after start
+        indices = (self._order[:self.count] + (self._head - self.count)) % self.capacity
+        first = np.searchsorted(self.times[indices], start)
+        return indices[first:]
+
+    def points(self, indices, landmark_ids):
+        """(len(indices), 2) mean x/y of the given landmarks for each frame."""
+        return self.landmarks[indices][:, landmark_ids, :2].mean(axis=1)
+
+
+class SwipeDetector:
+    """Fast, mostly horizontal palm movement.
+
+    Args:
+        min_distance: Horizontal travel (normalized) needed within `duration`.
+        duration: Seconds the swipe may take.
+        max_slope: Largest vertical/horizontal travel ratio.
+        min_consistency: Fraction of frame-to-frame steps that must go the swipe's way.
+        cooldown: Seconds before another swipe can fire.
+    """
+    def __init__(self, min_distance=0.25, duration=0.5, max_slope=0.6,
+                 min_consistency=0.8, cooldown=0.6):
+        self.min_distance = min_distance
+        self.duration = duration
+        self.max_slope = max_slope
+        self.min_consistency = min_consistency
+        self.cooldown = cooldown
+        self.last_trigger = 0.0
+
+    def detect(self, history, now):
+        if now - self.last_trigger < self.cooldown:
+            return None
+        # Frames after the last swipe only, so one motion can't fire twice
+        indices = history.window(max(now - self.duration, self.last_trigger + 1e-6))
+        if len(indices) < 3 or not history.present[indices].all():
+            return None
+
+        xy = history.points(indices, PALM_POINTS)
+        dx, dy = xy[-1] - xy[0]
+        if abs(dx) < self.min_distance or abs(dy) > abs(dx) * self.max_slope:
+            return None
+        steps = np.diff(xy[:, 0])
+        if np.count_nonzero(np.sign(steps) == np.sign(dx)) < self.min_consistency * len(steps):
+            return None
+
+        self.last_trigger = now
+        return "swipe_right" if dx > 0 else "swipe_left"
+
+
+class HoldDetector:
+    """Same gesture held still for `duration` seconds; fires once per hold.
+
+    Args:
+        duration: Seconds the pose must be held.
+        max_drift: Largest distance (normalized) a palm point or the index tip may
+            stray from its mean position over the hold.
+        gestures: Gesture names that count (default: any recognized gesture).
+    """
+    def __init__(self, duration=0.8, max_drift=0.03, gestures=None):
+        self.duration = duration
+        self.max_drift = max_drift
+        self.codes = None if gestures is None else np.array(
+            [GESTURES.index(g) for g in gestures], dtype=np.uint8)
+        self.armed = True
+
+    def detect(self, history, now):
+        indices = history.window(now - self.duration)
+        held = self._held(history, indices, now)
+        if not held:
+            self.armed = True  # Pose broken - the next hold may fire again
+            return None
+        if not self.armed:
+            return None
+        self.armed = False
+        return "hold"
+
+    def _held(self, history, indices, now):
+        if len(indices) < 3 or not history.present[indices].all():
+            return False
+        # The window must actually span the hold time, not just a burst of frames
+        if history.times[indices[0]] > now - self.duration * 0.8:
+            return False
+        codes = history.codes[indices]
+        if codes[0] == 0 or (codes != codes[0]).any():
+            return False
+        if self.codes is not None and codes[0] not in self.codes:
+            return False
+        # Palm and fingertip both still (a fingertip circling over a still palm isn't a hold)
+        xy = history.landmarks[indices][:, HOLD_POINTS, :2]
+        drift = np.linalg.norm(xy - xy.mean(axis=0), axis=2)
+        return bool(drift.max() <= self.max_drift)
+
+
+class CircleDetector:
+    """Index fingertip going once around a roughly circular loop.
+
+    Args:
+        duration: Seconds the loop may take.
+        min_radius: Smallest loop radius (normalized).
+        max_radius_spread: Largest std/mean of the tip's distance from the loop center.
+        min_turn: Fraction of a full turn the tip must sweep.
+        cooldown: Seconds before another circle can fire.
+    """
+    def __init__(self, duration=1.5, min_radius=0.04, max_radius_spread=0.35,
+                 min_turn=0.9, cooldown=0.8):
+        self.duration = duration
+        self.min_radius = min_radius
+        self.max_radius_spread = max_radius_spread
+        self.min_turn = min_turn
+        self.cooldown = cooldown
+        self.last_trigger = 0.0
+
+    def detect(self, history, now):
+        if now - self.last_trigger < self.cooldown:
+            return None
+        indices = history.window(max(now - self.duration, self.last_trigger + 1e-6))
+        if len(indices) < 8 or not history.present[indices].all():
+            return None
+
+        xy = history.points(indices, [INDEX_TIP])
+        offsets = xy - xy.mean(axis=0)
+        radii = np.linalg.norm(offsets, axis=1)
+        radius = radii.mean()
+        if radius < self.min_radius or radii.std() > self.max_radius_spread * radius:
+            return None
+        # Total swept angle, with each step wrapped into (-pi, pi]
+        steps = np.diff(np.arctan2(offsets[:, 1], offsets[:, 0]))
+        turn = np.sum((steps + np.pi) % (2 * np.pi) - np.pi)
+        if abs(turn) < self.min_turn * 2 * np.pi:
+            return None
+
+        self.last_trigger = now
+        # Image y grows downwards, so a positive angle sweep is clockwise on screen
+        return "circle_cw" if turn > 0 else "circle_ccw"
+
+
+class TemporalGestures:
+    """A session's landmark history plus the detectors that run on it.
+
+    update() is called once per frame and returns (event, gesture) when a
+    temporal gesture completes, else None. gesture is the held pose for "hold"
+    and None for the motion events.
+    """
+    def __init__(self, capacity=64, swipe=None, hold=None, circle=None):
+        self.history = LandmarkHistory(capacity)
+        self.swipe = swipe or SwipeDetector()
+        self.hold = hold or HoldDetector()
+        self.circle = circle or CircleDetector()
+
+    def update(self, now, landmarks=None, code=0):
+        self.history.push(now, landmarks, code)
+        if landmarks is None:
+            self.hold.armed = True
+            return None
+        event = self.swipe.detect(self.history, now) or self.circle.detect(self.history, now)
+        if event:
+            return event, None
+        if self.hold.detect(self.history, now):
+            return "hold", GESTURES[code]
+        return None
@@ -0,0 +1,75 @@
+import numpy as np
+
+from binary_state import (
+    ACTIONS, FLAG_CACHED, FLAG_HAND_VISIBLE, FLAG_LANDMARKS, FLAG_PEN_DOWN,
+    MOTION_EVENTS, NO_GESTURE, RECORD, SCHEMA_VERSION, encode_record, encode_records,
+)
+from gesture_features import GESTURES
+
+
+def decode(record):
+    fields = RECORD.unpack_from(record)
+    return dict(zip(
+        ("version", "flags", "gesture", "action", "hand_x", "hand_y", "hand_z", "pen_x",
+         "pen_y", "stroke_size", "motion_event", "motion_seq", "age_ms", "queue_depth",
+         "motion_gesture", "seq"),
+        fields,
+    ))
+
+
+def test_record_round_trip():
+    payload = {
+        "gesture": "one_finger_up",
+        "hand_position": {"x": 0.25, "y": 0.75, "z": -0.5, "visible": True},
+        "pen": {"x": 0.5, "y": 1.0, "pen_down": True},
+        "whiteboard": {"action": "draw", "stroke_size": 6},
+        "motion": {"event": "swipe_left", "seq": 70000, "gesture": "fist"},
+        "cached": True,
+        "result_age": 0.12,
+        "queue_depth": 1,
+    }
+    record = encode_record(payload, seq=42)
+    assert len(record) == RECORD.size == 26
+
+    fields = decode(record)
+    assert fields["version"] == SCHEMA_VERSION
+    assert fields["flags"] == FLAG_HAND_VISIBLE | FLAG_PEN_DOWN | FLAG_CACHED
+    assert GESTURES[fields["gesture"]] == "one_finger_up"
+    assert ACTIONS[fields["action"]] == "draw"
+    assert abs(fields["hand_x"] / 65535 - 0.25) < 1e-4
+    assert abs(fields["hand_y"] / 65535 - 0.75) < 1e-4
+    assert abs(fields["hand_z"] / 32767 + 0.5) < 1e-4
+    assert fields["pen_y"] == 65535
+    assert fields["stroke_size"] == 6
+    assert MOTION_EVENTS[fields["motion_event"]] == "swipe_left"
+    assert fields["motion_seq"] == 70000 & 0xFFFF
+    assert fields["age_ms"] == 120
+    assert fields["queue_depth"] == 1
+    assert GESTURES[fields["motion_gesture"]] == "fist"
+    assert fields["seq"] == 42
+
+
+def test_empty_payload_encodes_as_none():
+    fields = decode(encode_record({}))
+    assert fields["flags"] == 0
+    assert fields["gesture"] == NO_GESTURE
+    assert ACTIONS[fields["action"]] is None
+
+
+def test_landmarks_round_trip():
+    rng = np.random.default_rng(0)
+    landmarks = rng.uniform(0, 1, (21, 3)).astype(np.float32)
+    landmarks[:, 2] = rng.uniform(-1, 1, 21)
+    record = encode_record({"landmarks": landmarks})
+    assert decode(record)["flags"] & FLAG_LANDMARKS
+    assert len(record) == RECORD.size + 21 * 3 * 2
+
+    points = np.frombuffer(record, dtype="<u2", offset=RECORD.size).reshape(21, 3) / 65535
+    points[:, 2] = points[:, 2] * 2 - 1
+    assert np.allclose(points, landmarks, atol=1e-4)
+
+
+def test_batch_is_records_back_to_back():
+    batch = encode_records([{"seq": 1}, {"seq": 2}])
+    assert len(batch) == 2 * RECORD.size
+    assert [seq for *_, seq in RECORD.iter_unpack(batch)] == [1, 2]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import app
+from hands_pool import HandsPool
+
+
+class FakeHands:
+    def __init__(self, kind):
+        self.kind = kind
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    pinned = HandsPool(lambda: FakeHands("pinned"), size=1, warm=0, idle_timeout=0)
+    shared = HandsPool(lambda: FakeHands("shared"), size=1, warm=0, idle_timeout=0)
+    monkeypatch.setattr(app, "hands_pool", pinned)
+    monkeypatch.setattr(app, "shared_hands_pool", shared)
+    monkeypatch.setattr(app, "inference_workers", None)
+    monkeypatch.setattr(app.mediapipe_compat, "process_bgr", lambda hands, frame: hands)
+    return pinned, shared
+
+
+FRAME = np.zeros((4, 4, 3), dtype=np.uint8)
+
+
+def test_shared_detectors_run_in_image_mode():
+    assert app.SHARED_HANDS_KWARGS["static_image_mode"] is True
+    assert "running_mode" not in app.SHARED_HANDS_KWARGS
+
+
+def test_frames_without_a_session_use_shared_detectors(pools):
+    assert app.detect_hands(FRAME).kind == "shared"
+    assert pools[0].stats()["detectors"] == 0
+
+
+def test_overflow_session_uses_shared_detectors(pools):
+    first = app.detect_hands(FRAME, "a")
+    assert first.kind == "pinned"
+    assert app.detect_hands(FRAME, "b").kind == "shared"
+    assert app.detect_hands(FRAME, "a") is first
@@ -0,0 +1,53 @@
+import threading
+import time
+
+from frame_admission import FrameAdmission
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def enter_in_thread(admission, session_id, results, key):
+    thread = threading.Thread(target=lambda: results.__setitem__(key, admission.enter(session_id)))
+    thread.start()
+    return thread
+
+
+def test_newer_frame_replaces_the_waiting_one():
+    admission = FrameAdmission(wait_timeout=2.0)
+    assert admission.enter("s") == (True, 0)
+
+    results = {}
+    older = enter_in_thread(admission, "s", results, "older")
+    wait_until(lambda: admission.depth("s") == 2)
+    newer = enter_in_thread(admission, "s", results, "newer")
+
+    older.join(2)
+    assert results["older"] == (False, 1)
+
+    admission.leave("s")
+    newer.join(2)
+    assert results["newer"] == (True, 2)
+
+    admission.leave("s")
+    assert admission.depth("s") == 0
+    stats = admission.stats()
+    assert stats["admitted_total"] == 2
+    assert stats["dropped_total"] == 1
+
+
+def test_waiting_frame_is_dropped_after_timeout():
+    admission = FrameAdmission(wait_timeout=0.05)
+    assert admission.enter("s")[0]
+    assert admission.enter("s") == (False, 1)
+    assert admission.depth("s") == 1
+
+
+def test_sessions_are_independent():
+    admission = FrameAdmission(wait_timeout=0.05)
+    assert admission.enter("a")[0]
+    assert admission.enter("b")[0]
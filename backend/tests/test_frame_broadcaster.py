@@ -0,0 +1,51 @@
+import time
+
+from frame_broadcaster import FrameBroadcaster, FrameSignal
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_closed_viewer_detaches_and_producer_stops():
+    feed = FrameBroadcaster("test", lambda: b"frame", interval=0.01, heartbeat=0.05,
+                            idle_timeout=0.05)
+    viewer = feed.stream()
+    assert next(viewer) == b"frame"
+    assert feed.stats()["viewers"] == 1
+
+    viewer.close()
+    assert feed.stats()["viewers"] == 0
+    wait_until(lambda: not feed.stats()["running"])
+
+
+def test_static_feed_is_resent_every_heartbeat():
+    feed = FrameBroadcaster("static", lambda: b"frame", interval=0.01, heartbeat=0.05,
+                            idle_timeout=0.05)
+    viewer = feed.stream()
+    started = time.time()
+    assert [next(viewer) for _ in range(3)] == [b"frame"] * 3
+    assert time.time() - started >= 0.09
+
+    stats = feed.stats()
+    assert stats["frames_encoded"] == 1
+    assert stats["frames_resent"] == 2
+    viewer.close()
+
+
+def test_viewers_share_one_render_per_source_frame():
+    signal = FrameSignal()
+    frames = iter(range(1000))
+    feed = FrameBroadcaster("signal", lambda: str(next(frames)).encode(), signal=signal,
+                            interval=0.0, heartbeat=5.0, idle_timeout=0.05)
+    first, second = feed.stream(), feed.stream()
+    assert next(first) == next(second)
+
+    signal.publish()
+    assert next(first) == next(second) != b"0"
+    first.close()
+    second.close()
+    assert feed.stats()["viewers"] == 0
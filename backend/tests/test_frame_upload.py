@@ -0,0 +1,65 @@
+import io
+
+import cv2
+import numpy as np
+import pytest
+
+import app
+
+BOUNDARY = "frameboundary"
+
+
+def jpeg_bytes():
+    ok, encoded = cv2.imencode(".jpg", np.full((48, 64, 3), 128, dtype=np.uint8))
+    assert ok
+    return encoded.tobytes()
+
+
+def multipart(payload):
+    return (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"frame\"; filename=\"f.jpg\"\r\n"
+            f"Content-Type: image/jpeg\r\n\r\n").encode() + payload + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "MAX_FRAME_BYTES", 64 * 1024)
+    monkeypatch.setattr(app, "analyze_frame",
+                        lambda frame, *args, **kwargs: {"shape": list(frame.shape)})
+    return app.app.test_client()
+
+
+def post_chunked(client, body):
+    """POST without a Content-Length, like a chunked transfer-encoded upload."""
+    return client.post(
+        "/process-frame",
+        input_stream=io.BytesIO(body),
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}",
+                 "Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True},
+    )
+
+
+def test_raw_jpeg_body(client):
+    response = client.post("/process-frame", data=jpeg_bytes(), content_type="image/jpeg")
+    assert response.status_code == 200
+    assert response.get_json()["shape"] == [48, 64, 3]
+
+
+def test_raw_body_over_the_limit_is_413(client):
+    response = client.post("/process-frame", data=b"\xff" * (65 * 1024), content_type="image/jpeg")
+    assert response.status_code == 413
+
+
+def test_chunked_multipart_frame(client):
+    response = post_chunked(client, multipart(jpeg_bytes()))
+    assert response.status_code == 200
+    assert response.get_json()["shape"] == [48, 64, 3]
+
+
+def test_chunked_multipart_over_the_limit_is_413(client, monkeypatch):
+    monkeypatch.setattr(app, "MULTIPART_OVERHEAD_BYTES", 1024)
+    # The bulk is in another field, so only the form parser's own limit catches it
+    padding = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"padding\"; "
+               f"filename=\"p.bin\"\r\n\r\n").encode() + b"\0" * (200 * 1024) + b"\r\n"
+    response = post_chunked(client, padding + multipart(jpeg_bytes()))
+    assert response.status_code == 413
@@ -0,0 +1,73 @@
+import itertools
+
+import numpy as np
+
+import gesture_features
+from gesture_features import GESTURES, classify_gestures, compute_features
+from mediapipe_compat import results_from_landmarks
+
+
+def reference_gesture(hand, margin=0.02):
+    """The per-landmark rule cascade detect_gesture() used before gesture_features."""
+    y = [float(v) for v in hand[:, 1]]
+    extended = [y[tip] < y[pip] - margin for tip, pip in zip((8, 12, 16, 20), (6, 10, 14, 18))]
+    folded = [y[tip] > y[pip] + margin for tip, pip in zip((8, 12, 16, 20), (6, 10, 14, 18))]
+    index_e, middle_e, ring_e, pinky_e = extended
+    index_f, middle_f, ring_f, pinky_f = folded
+
+    if index_e and middle_f and ring_f and pinky_f:
+        return "one_finger_up"
+    if index_e and middle_e and ring_f and pinky_f:
+        return "two_fingers_up"
+    if index_e and middle_e and ring_e and pinky_f:
+        return "three_fingers_up"
+    if index_f and middle_f and ring_f and pinky_e:
+        return "pinky_finger_up"
+    thumb_up = y[4] < y[5] and y[4] < y[9]
+    if thumb_up and index_f and middle_f and ring_f and pinky_f:
+        return "thumbs_up"
+    if index_f and middle_f and ring_f and pinky_f:
+        return "fist"
+    if index_e and middle_e and ring_e and pinky_e and y[4] < y[3]:
+        return "open_palm"
+    return "unknown"
+
+
+def sample_hands():
+    """Hands covering every finger state, margin edges included, plus random ones."""
+    rng = np.random.default_rng(7)
+    offsets = (-0.05, -0.02, -0.019, 0.0, 0.019, 0.02, 0.05)  # tip y relative to pip y
+    hands = []
+    for fingers in itertools.product(offsets, repeat=4):
+        for thumb in (-0.1, 0.1):
+            hand = rng.uniform(0.3, 0.7, (21, 3))
+            for (tip, pip), offset in zip(((8, 6), (12, 10), (16, 14), (20, 18)), fingers):
+                hand[tip, 1] = hand[pip, 1] + offset
+            hand[4, 1] = min(hand[5, 1], hand[9, 1], hand[3, 1]) + thumb
+            hands.append(hand)
+    hands.extend(rng.uniform(0, 1, (2000, 21, 3)))
+    return np.array(hands, dtype=np.float32)
+
+
+def test_matches_the_rule_cascade():
+    hands = sample_hands()
+    labels = classify_gestures(hands)
+    expected = [reference_gesture(hand) for hand in hands]
+    assert list(labels) == expected
+    assert set(expected) == set(GESTURES)
+
+
+def test_features_of_one_hand():
+    hand = sample_hands()[0]
+    features = compute_features(hand)
+    assert features.gestures[0] == reference_gesture(hand)
+    assert np.allclose(features.index_tip[0], hand[8])
+    assert abs(features.pinch_distance[0] - np.linalg.norm(hand[4] - hand[8])) < 1e-6
+
+
+def test_legacy_landmark_views():
+    hands = sample_hands()[:3]
+    results = results_from_landmarks(hands)
+    assert np.array_equal(gesture_features.landmarks_from_results(results), hands)
+    first = results.multi_hand_landmarks[0]
+    assert classify_gestures(gesture_features.landmarks_array(first))[0] == reference_gesture(hands[0])
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from hands_pool import HandsPool, HandsPoolExhausted, HandsPoolFull
+
+
+class FakeHands:
+    created = 0
+
+    def __init__(self):
+        FakeHands.created += 1
+        self.id = FakeHands.created
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(size=1, warm=0, idle_timeout=0):
+    return HandsPool(FakeHands, size=size, warm=warm, idle_timeout=idle_timeout)
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_session_keeps_its_detector():
+    pool = make_pool()
+    with pool.checkout("a") as first:
+        pass
+    with pool.checkout("a") as second:
+        pass
+    assert first is second
+
+
+def test_full_pool_refuses_other_sessions_at_once():
+    pool = make_pool()
+    with pool.checkout("a") as pinned:
+        pass
+    started = time.time()
+    with pytest.raises(HandsPoolFull):
+        pool.acquire("b", timeout=5.0)
+    with pytest.raises(HandsPoolFull):
+        pool.acquire(None, timeout=5.0)
+    assert time.time() - started < 1.0
+    assert not pinned.closed
+    assert FakeHands.created == pinned.id  # Nothing was reloaded
+
+    # Session a still has its detector
+    with pool.checkout("a") as again:
+        pass
+    assert again is pinned
+
+
+def test_session_gets_a_detector_once_one_is_retired():
+    pool = make_pool()
+    with pool.checkout("a"):
+        pass
+    pool.forget_session("a")
+    with pool.checkout("b") as hands:
+        pass
+    assert pool.stats()["pinned_sessions"] == 1
+    assert not hands.closed
+
+
+def test_busy_pool_times_out():
+    pool = make_pool()
+    slot = pool.acquire(None)
+    with pytest.raises(HandsPoolExhausted):
+        pool.acquire("b", timeout=0.05)
+    pool.release(slot)
+
+
+def test_forgotten_session_detector_is_retired():
+    pool = make_pool(size=2)
+    with pool.checkout("a") as old:
+        pass
+    pool.forget_session("a")
+    assert old.closed
+    assert pool.stats()["detectors"] == 0
+
+    with pool.checkout("b") as new:
+        pass
+    assert new is not old
+
+
+def test_detector_forgotten_while_in_use_is_retired_on_release():
+    pool = make_pool(size=2)
+    slot = pool.acquire("a")
+    pool.forget_session("a")
+    assert not slot.hands.closed
+    pool.release(slot)
+    assert slot.hands.closed
+    assert pool.stats()["detectors"] == 0
+
+
+def test_idle_session_detector_is_retired_and_spare_replaced():
+    pool = make_pool(size=2, warm=1, idle_timeout=0.05)
+    with pool.checkout("a") as old:
+        pass
+    wait_until(lambda: pool.stats()["warm_spares"] == 1)
+    time.sleep(0.1)
+
+    with pool.checkout(None) as spare:
+        pass
+    assert old.closed
+    assert spare is not old
+    assert pool.stats()["pinned_sessions"] == 0
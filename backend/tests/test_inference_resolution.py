@@ -0,0 +1,45 @@
+import cv2
+import numpy as np
+
+import app
+
+
+def encode(width, height, ext=".jpg", **params):
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, : width // 2] = (40, 120, 200)
+    flags = [cv2.IMWRITE_JPEG_PROGRESSIVE, 1] if params.get("progressive") else []
+    ok, encoded = cv2.imencode(ext, frame, flags)
+    assert ok
+    return encoded
+
+
+def test_jpeg_dimensions_from_the_header():
+    assert app.jpeg_dimensions(encode(1280, 720)) == (1280, 720)
+    assert app.jpeg_dimensions(encode(640, 480, progressive=True)) == (640, 480)
+
+
+def test_jpeg_dimensions_rejects_other_data():
+    assert app.jpeg_dimensions(encode(64, 48, ext=".png")) is None
+    assert app.jpeg_dimensions(np.frombuffer(b"\xff\xd8\xff", dtype=np.uint8)) is None
+    assert app.jpeg_dimensions(encode(64, 48)[:20]) is None  # Truncated before the SOF
+
+
+def test_large_frame_is_decoded_reduced_then_resized(monkeypatch):
+    monkeypatch.setitem(app.INFERENCE_WIDTHS, "gesture", 480)
+    calls = []
+    imdecode = cv2.imdecode
+    monkeypatch.setattr(app.cv2, "imdecode", lambda data, flags: calls.append(flags) or imdecode(data, flags))
+
+    frame = app.decode_frame_for_inference(encode(1920, 1080), "gesture")
+    assert calls == [cv2.IMREAD_REDUCED_COLOR_4]  # Largest reduction still 480 px wide
+    assert frame.shape == (270, 480, 3)
+
+
+def test_small_frame_is_never_upscaled(monkeypatch):
+    monkeypatch.setitem(app.INFERENCE_WIDTHS, "whiteboard", 640)
+    frame = app.decode_frame_for_inference(encode(320, 240), "whiteboard")
+    assert frame.shape == (240, 320, 3)
+
+
+def test_unknown_mode_uses_the_default_width():
+    assert app.inference_width("nope") == app.inference_width(app.DEFAULT_INFERENCE_MODE)
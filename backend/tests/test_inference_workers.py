@@ -0,0 +1,90 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from inference_workers import InferenceWorkerError, InferenceWorkerPool
+
+
+class FakeWorker:
+    def __init__(self, index, dead=False):
+        self.index = index
+        self.dead = dead
+        self.stopped = False
+        self.jobs = 0
+
+    def alive(self):
+        return not self.dead
+
+    def run(self, frame, timeout, start_timeout):
+        self.jobs += 1
+        time.sleep(0.02)
+        return np.zeros((0, 21, 3), dtype=np.float32), []
+
+    def stop(self):
+        self.stopped = True
+
+
+class FakePool(InferenceWorkerPool):
+    """Pool whose first spawned worker is already dead."""
+    def __init__(self, *args, **kwargs):
+        self.spawned = []
+        super().__init__(*args, **kwargs)
+
+    def _spawn(self, index):
+        worker = FakeWorker(index, dead=not self.spawned)
+        self.spawned.append(worker)
+        return worker
+
+
+def frame():
+    return np.zeros((2, 2, 3), dtype=np.uint8)
+
+
+def test_dead_worker_is_replaced_once_under_contention():
+    pool = FakePool(1, {}, slot_bytes=100)
+    errors, done = [], []
+
+    def submit():
+        try:
+            pool.process(frame(), session_id="s")
+            done.append(True)
+        except InferenceWorkerError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=submit) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+
+    assert len(errors) == 1
+    assert len(done) == 4
+    assert len(pool.spawned) == 2
+    assert pool.spawned[0].stopped
+    assert pool.spawned[1].jobs == 4
+    assert pool.stats() == {"processes": 1, "alive": 1, "busy": 0}
+
+
+def test_replace_ignores_a_worker_that_was_already_swapped():
+    pool = FakePool(1, {}, slot_bytes=100)
+    pool._ensure_started()
+    stale = pool.spawned[0]
+    pool._replace(stale)
+    pool._replace(stale)
+
+    assert len(pool.spawned) == 2
+    assert pool._workers[0] is pool.spawned[1]
+
+
+def test_session_sticks_to_one_worker():
+    pool = FakePool(3, {}, slot_bytes=100)
+    picks = {pool._pick("session-a")[0] for _ in range(10)}
+    assert len(picks) == 1
+
+
+def test_oversized_frame_is_rejected():
+    pool = FakePool(1, {}, slot_bytes=4)
+    with pytest.raises(ValueError):
+        pool.process(frame())
@@ -0,0 +1,58 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+import app
+
+AUTH = {"Authorization": "Bearer test"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "long_poll_slots", threading.BoundedSemaphore(1))
+    with mock.patch.object(app.auth, "verify_id_token", return_value={"uid": "u"}):
+        yield app.app.test_client()
+
+
+def current_version(client, session):
+    response = client.get(f"/get_gesture?session={session}", headers=AUTH)
+    assert response.status_code == 200
+    return response.headers["X-State-Version"]
+
+
+def test_unchanged_state_is_304(client):
+    version = current_version(client, "lp-a")
+    response = client.get(f"/get_gesture?session=lp-a&since={version}", headers=AUTH)
+    assert response.status_code == 304
+    response = client.get("/get_gesture?session=lp-a", headers={**AUTH, "If-None-Match": f'"{version}"'})
+    assert response.status_code == 304
+
+
+def test_long_poll_times_out_with_304(client):
+    version = current_version(client, "lp-b")
+    started = time.time()
+    response = client.get(f"/get_gesture?session=lp-b&since={version}&wait=0.1", headers=AUTH)
+    assert response.status_code == 304
+    assert time.time() - started >= 0.09
+
+
+def test_waiters_beyond_the_cap_get_503(client):
+    version = current_version(client, "lp-c")
+    assert app.long_poll_slots.acquire(blocking=False)  # One request already waiting
+    try:
+        started = time.time()
+        response = client.get(f"/get_gesture?session=lp-c&since={version}&wait=5", headers=AUTH)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert time.time() - started < 1.0
+
+        # Plain conditional reads don't need a slot
+        response = client.get(f"/get_gesture?session=lp-c&since={version}", headers=AUTH)
+        assert response.status_code == 304
+    finally:
+        app.long_poll_slots.release()
+
+    response = client.get(f"/get_gesture?session=lp-c&since={version}&wait=0.05", headers=AUTH)
+    assert response.status_code == 304
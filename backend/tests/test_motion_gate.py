@@ -0,0 +1,82 @@
+import numpy as np
+
+from motion_gate import MotionGate, hand_roi
+
+SKIN = (120, 160, 210)
+
+
+def background():
+    """Static 640x480 scene with some texture."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame[:] = np.linspace(40, 120, 640, dtype=np.uint8)[None, :, None]
+    frame[300:480, 0:200] = (90, 60, 30)
+    return frame
+
+
+def hand_frame(palm_x=260, palm_y=220, finger_dx=0):
+    """Palm of 120x200 px with an index finger of 20x80 px above it."""
+    frame = background()
+    frame[palm_y:palm_y + 200, palm_x:palm_x + 120] = SKIN
+    fx = palm_x + 10 + finger_dx
+    frame[palm_y - 80:palm_y, fx:fx + 20] = SKIN
+    return frame
+
+
+def landmarks_for(palm_x=260, palm_y=220):
+    """(1, 21, 3) landmarks spread over the hand's box, normalized to 640x480."""
+    xs = np.linspace(palm_x, palm_x + 120, 21) / 640
+    ys = np.linspace(palm_y - 80, palm_y + 200, 21) / 480
+    return np.stack([xs, ys, np.zeros(21)], axis=-1)[None].astype(np.float32)
+
+
+def gate_with_hand(gate, frame, now=10.0):
+    thumb = gate.thumbnail(frame)
+    gate.store("s", thumb, "results", now=now, roi=hand_roi(landmarks_for()))
+
+
+def test_static_scene_reuses_results_until_max_age():
+    gate = MotionGate(max_age=0.5)
+    gate_with_hand(gate, hand_frame())
+    rng = np.random.default_rng(0)
+    noisy = np.clip(hand_frame() + rng.normal(0, 3, (480, 640, 3)), 0, 255).astype(np.uint8)
+    thumb = gate.thumbnail(noisy)
+
+    results, age = gate.lookup("s", thumb, now=10.1)
+    assert results == "results"
+    assert abs(age - 0.1) < 1e-6
+    assert gate.lookup("s", thumb, now=10.6) == (None, None)
+
+
+def test_moving_fingertip_is_a_miss():
+    gate = MotionGate()
+    gate_with_hand(gate, hand_frame())
+    moved = gate.thumbnail(hand_frame(finger_dx=80))
+    assert gate.lookup("s", moved, now=10.05) == (None, None)
+
+
+def test_shifted_palm_is_a_miss():
+    gate = MotionGate()
+    gate_with_hand(gate, hand_frame())
+    shifted = gate.thumbnail(hand_frame(palm_x=270))
+    assert gate.lookup("s", shifted, now=10.05) == (None, None)
+
+
+def test_change_away_from_the_hand_is_ignored():
+    gate = MotionGate()
+    gate_with_hand(gate, hand_frame())
+    frame = hand_frame()
+    frame[0:100, 500:640] = 255
+    assert gate.lookup("s", gate.thumbnail(frame), now=10.05)[0] == "results"
+
+
+def test_hand_entering_an_empty_scene_is_a_miss():
+    gate = MotionGate()
+    gate.store("s", gate.thumbnail(background()), "no hand", now=10.0)
+    assert gate.lookup("s", gate.thumbnail(hand_frame()), now=10.05) == (None, None)
+    assert gate.lookup("other", gate.thumbnail(background()), now=10.05) == (None, None)
+
+
+def test_hand_roi():
+    assert hand_roi(np.empty((0, 21, 3))) is None
+    x0, y0, x1, y1 = hand_roi(landmarks_for(), margin=0.0)
+    assert abs(x0 - 260 / 640) < 1e-6 and abs(y1 - 420 / 480) < 1e-6
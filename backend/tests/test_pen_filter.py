@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+
+from app import OneEuroPenFilter
+
+FPS = 30.0
+
+
+def stroke(pen, start, frames, speed=0.5, x0=0.2):
+    """Feed a horizontal stroke at speed (units/s); returns the last (time, x, output)."""
+    for i in range(frames):
+        now = start + i / FPS
+        x = x0 + speed * i / FPS
+        out = pen.update(x, 0.5, "draw", now)
+    return now, x, out
+
+
+def test_resting_pen_is_smoothed():
+    pen = OneEuroPenFilter(prediction=0)
+    rng = np.random.default_rng(1)
+    outputs = [pen.update(0.5 + rng.normal(0, 0.003), 0.5, "draw", 100 + i / FPS)[0]
+               for i in range(90)]
+    assert np.std(outputs[30:]) < 0.001
+
+
+def test_repeated_results_advance_the_clock():
+    pen = OneEuroPenFilter(prediction=0)
+    now, x, out = stroke(pen, 100.0, 30)
+    lag = x - out[0]
+    assert lag > 0.005
+
+    # The hand stops; the motion gate now repeats the last result every frame
+    for i in range(1, 16):
+        out = pen.update(x, 0.5, "draw", now + i / FPS)
+    assert pen.last_time == now + 15 / FPS
+    assert abs(x - out[0]) < lag / 2
+    assert math.hypot(pen.vx, pen.vy) < 0.1
+
+    # The next inferred frame continues from there instead of jumping
+    resumed = pen.update(x + 0.005, 0.5, "draw", now + 16 / FPS)
+    assert abs(resumed[0] - out[0]) < 0.01
+
+
+def test_pen_up_resets():
+    pen = OneEuroPenFilter()
+    stroke(pen, 100.0, 10)
+    assert pen.update(0.9, 0.9, "erase", 101.0) == (None, None, False)
+    assert pen.update(0.9, 0.9, "draw", 101.1) == (0.9, 0.9, True)
@@ -0,0 +1,64 @@
+import numpy as np
+
+from mediapipe_compat import EMPTY_RESULTS, ArrayResults, RoiTracker
+
+
+class BlobHands:
+    """Finds the white rectangle in whatever image it gets; landmarks span its box."""
+    accepts_bgr = True
+
+    def __init__(self, score=0.9):
+        self.score = score
+        self.shapes = []
+
+    def process(self, image):
+        self.shapes.append(image.shape[:2])
+        ys, xs = np.nonzero(image[:, :, 0] == 255)
+        if not len(xs):
+            return EMPTY_RESULTS
+        h, w = image.shape[:2]
+        points = np.stack([
+            np.linspace(xs.min(), xs.max(), 21) / w,
+            np.linspace(ys.min(), ys.max(), 21) / h,
+            np.zeros(21),
+        ], axis=-1)
+        return ArrayResults(points[None].astype(np.float32), [{"score": self.score}])
+
+
+def frame_with_hand(x, y, size=60):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+def test_second_frame_runs_on_a_crop_with_full_frame_landmarks():
+    hands = BlobHands()
+    tracker = RoiTracker(hands)
+    tracker.process(frame_with_hand(300, 200))
+    results = tracker.process(frame_with_hand(310, 205))
+
+    assert tracker.full_runs == 1 and tracker.crop_runs == 1
+    assert hands.shapes[1][0] < 480 and hands.shapes[1][1] < 640
+    landmarks = results.landmarks[0]
+    assert abs(landmarks[0, 0] * 640 - 310) < 1.0
+    assert abs(landmarks[0, 1] * 480 - 205) < 1.0
+    assert abs(landmarks[-1, 0] * 640 - 369) < 1.0
+
+
+def test_lost_hand_falls_back_to_the_full_frame():
+    tracker = RoiTracker(BlobHands())
+    tracker.process(frame_with_hand(50, 50))
+    results = tracker.process(frame_with_hand(500, 350))
+
+    assert tracker.full_runs == 2
+    assert abs(results.landmarks[0, 0, 0] * 640 - 500) < 1.0
+
+    tracker.process(np.zeros((480, 640, 3), dtype=np.uint8))
+    assert tracker.roi is None
+
+
+def test_low_confidence_crop_falls_back_to_the_full_frame():
+    tracker = RoiTracker(BlobHands(score=0.3))
+    tracker.process(frame_with_hand(300, 200))
+    tracker.process(frame_with_hand(300, 200))
+    assert tracker.crop_runs == 1 and tracker.full_runs == 2
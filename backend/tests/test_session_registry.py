@@ -0,0 +1,35 @@
+import time
+
+from session_registry import SessionRegistry
+
+
+def test_least_recently_used_session_is_evicted():
+    evicted = []
+    registry = SessionRegistry(lambda key: {"key": key}, max_sessions=2, ttl=0,
+                               on_evict=lambda key, entry: evicted.append(key))
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")
+    registry.get("c")
+
+    assert evicted == ["b"]
+    assert registry.peek("b") is None
+    assert registry.peek("a") == {"key": "a"}
+
+
+def test_idle_sessions_expire():
+    registry = SessionRegistry(lambda key: object(), ttl=0.05)
+    first = registry.get("a")
+    time.sleep(0.1)
+    registry.get("b")
+    assert registry.peek("a") is None
+    assert registry.get("a") is not first
+
+
+def test_pinned_entries_are_never_evicted():
+    registry = SessionRegistry(lambda key: object(), max_sessions=1, ttl=0,
+                               pinned={"default": "shared"})
+    registry.get("a")
+    registry.get("b")
+    assert registry.get("default") == "shared"
+    assert registry.stats()["evicted_total"] == 1
@@ -0,0 +1,65 @@
+import json
+import threading
+import time
+from unittest import mock
+
+import app
+
+AUTH = {"Authorization": "Bearer test"}
+
+
+def publish(session_id, **changes):
+    session = app.gesture_session(session_id)
+    with session.lock:
+        session.publish(session.snapshot.evolve(**changes))
+
+
+def test_stream_sends_current_state_then_changes():
+    events = app.state_events("sse-a", max_rate=0, keepalive=5.0)
+    assert next(events) == "retry: 2000\n\n"
+    first = next(events)
+    assert first.startswith("id: ")
+    assert json.loads(first.split("data: ", 1)[1])["gesture"] is None
+
+    timer = threading.Timer(0.05, publish, ("sse-a",), {"gesture": "fist"})
+    timer.start()
+    second = next(events)
+    timer.join()
+    version = app.gesture_session("sse-a").snapshot.version
+    assert second.startswith(f"id: {version}\n")
+    assert json.loads(second.split("data: ", 1)[1])["gesture"] == "fist"
+
+
+def test_unchanged_payload_is_not_resent():
+    events = app.state_events("sse-b", max_rate=0, keepalive=0.2)
+    next(events)
+    next(events)
+    # A new version whose compact fields didn't change (landmarks aren't streamed)
+    publish("sse-b", landmarks=[[0.1, 0.2, 0.0]])
+    assert next(events) == ": keepalive\n\n"
+
+
+def test_stream_ends_with_reauth_at_token_expiry():
+    events = app.state_events("sse-c", max_rate=0, keepalive=5.0, until=time.time() + 0.1)
+    next(events)
+    next(events)
+    started = time.time()
+    assert next(events) == "event: reauth\ndata: {}\n\n"
+    assert time.time() - started < 1.0
+    assert list(events) == []
+
+
+def test_stream_needs_a_single_use_ticket():
+    client = app.app.test_client()
+    assert client.get("/state_stream?session=sse-d").status_code == 401
+
+    # Token already expired, so the stream ends right after it opens
+    token = {"uid": "u", "exp": time.time() - 1}
+    with mock.patch.object(app.auth, "verify_id_token", return_value=token):
+        ticket = client.post("/state_stream/ticket", headers=AUTH).get_json()["ticket"]
+    response = client.get(f"/state_stream?session=sse-d&ticket={ticket}")
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).endswith("event: reauth\ndata: {}\n\n")
+    response.close()
+
+    assert client.get(f"/state_stream?session=sse-d&ticket={ticket}").status_code == 401
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+import app
+from state_snapshot import StateSnapshot
+
+
+def test_defaults():
+    snapshot = StateSnapshot()
+    assert snapshot.version == 0
+    assert snapshot.gesture is None
+    assert snapshot.hand_position == {"x": 0, "y": 0, "z": 0, "visible": False}
+    assert snapshot.pen == {"x": 0, "y": 0, "pen_down": False}
+    assert snapshot.whiteboard == {"action": None, "stroke_size": 3}
+
+
+def test_evolve_copies_fields_and_bumps_the_version():
+    first = StateSnapshot(gesture="fist", pen={"x": 0.5, "y": 0.5, "pen_down": True})
+    second = first.evolve(gesture="open_palm")
+
+    assert second.version == first.version + 1
+    assert second.gesture == "open_palm"
+    assert second.pen is first.pen
+    assert first.gesture == "fist"
+    assert first.version == 0
+
+
+def test_snapshots_are_immutable():
+    snapshot = StateSnapshot()
+    with pytest.raises(AttributeError):
+        snapshot.gesture = "fist"
+
+
+def test_publish_wakes_a_waiting_reader():
+    session = app.GestureSession()
+    version = session.snapshot.version
+    gesture_version, _ = session.sections["gesture"].current
+    pen_version, _ = session.sections["pen"].current
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(session.wait_for_change(version, 5.0)))
+    reader.start()
+    time.sleep(0.05)
+    with session.lock:
+        session.publish(session.snapshot.evolve(gesture="fist"))
+    reader.join(2.0)
+
+    assert seen and seen[0].gesture == "fist"
+    # Only the sections whose view changed get a new version
+    assert session.sections["gesture"].current[0] > gesture_version
+    assert session.sections["pen"].current[0] == pen_version
+
+
+def test_wait_for_change_times_out_on_an_unchanged_session():
+    session = app.GestureSession()
+    started = time.time()
+    snapshot = session.wait_for_change(session.snapshot.version, 0.1)
+    assert snapshot is session.snapshot
+    assert time.time() - started >= 0.09
@@ -0,0 +1,83 @@
+import numpy as np
+
+from gesture_features import GESTURE_CODES
+from temporal_gestures import INDEX_TIP, LandmarkHistory, TemporalGestures
+
+FPS = 30.0
+FIST = GESTURE_CODES["fist"]
+
+
+def hand(x, y, tip=None):
+    """Landmarks of a hand centered on (x, y), index tip at tip (default: on the palm)."""
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, 0], landmarks[:, 1] = x, y
+    if tip is not None:
+        landmarks[INDEX_TIP, :2] = tip
+    return landmarks
+
+
+def run(gestures, frames, start=100.0, code=FIST):
+    """Feed (x, y[, tip]) per frame; returns the events that fired."""
+    events = []
+    for i, frame in enumerate(frames):
+        landmarks = None if frame is None else hand(*frame)
+        event = gestures.update(start + i / FPS, landmarks, code)
+        if event:
+            events.append(event)
+    return events
+
+
+def test_history_window_is_chronological_across_wraparound():
+    history = LandmarkHistory(capacity=4)
+    for t in range(6):
+        history.push(float(t), hand(t / 10, 0.5))
+    indices = history.window(3.0)
+    assert list(history.times[indices]) == [3.0, 4.0, 5.0]
+    assert history.count == 4
+
+
+def test_swipe_right_fires_once():
+    frames = [(0.2 + 0.05 * i, 0.5) for i in range(12)]
+    assert run(TemporalGestures(), frames, code=0) == [("swipe_right", None)]
+
+
+def test_swipe_left():
+    frames = [(0.8 - 0.05 * i, 0.5) for i in range(12)]
+    assert run(TemporalGestures(), frames, code=0) == [("swipe_left", None)]
+
+
+def test_vertical_or_interrupted_motion_is_not_a_swipe():
+    vertical = [(0.5, 0.1 + 0.05 * i) for i in range(12)]
+    assert run(TemporalGestures(), vertical, code=0) == []
+    dropout = [(0.2 + 0.05 * i, 0.5) if i % 3 else None for i in range(12)]
+    assert run(TemporalGestures(), dropout, code=0) == []
+
+
+def test_hold_fires_once_with_the_held_gesture():
+    still = [(0.5, 0.5)] * int(2 * FPS)
+    assert run(TemporalGestures(), still) == [("hold", "fist")]
+
+
+def test_hold_rearms_after_the_pose_breaks():
+    gestures = TemporalGestures()
+    frames = [(0.5, 0.5)] * 30 + [None] + [(0.5, 0.5)] * 30
+    assert run(gestures, frames) == [("hold", "fist")] * 2
+
+
+def test_unknown_pose_is_not_held():
+    still = [(0.5, 0.5)] * int(2 * FPS)
+    assert run(TemporalGestures(), still, code=GESTURE_CODES["unknown"]) == []
+
+
+def circle(direction, frames=30, radius=0.1):
+    angles = direction * np.linspace(0, 2 * np.pi, frames)
+    return [(0.5, 0.5, (0.5 + radius * np.cos(a), 0.5 + radius * np.sin(a))) for a in angles]
+
+
+def test_circles_in_both_directions():
+    assert run(TemporalGestures(), circle(1), code=0) == [("circle_cw", None)]
+    assert run(TemporalGestures(), circle(-1), code=0) == [("circle_ccw", None)]
+
+
+def test_half_circle_is_not_a_circle():
+    assert run(TemporalGestures(), circle(1)[:15], code=0) == []
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from versioned_state import VersionedState
+
+
+def test_version_only_moves_on_change():
+    state = VersionedState({"gesture": None})
+    version, _ = state.current
+    assert state.set({"gesture": None}) == version
+    assert state.set({"gesture": "fist"}) > version
+
+
+def test_wait_returns_at_once_for_a_stale_version():
+    state = VersionedState("a")
+    version, _ = state.current
+    state.set("b")
+    started = time.time()
+    assert state.wait(version, 5.0)[1] == "b"
+    assert time.time() - started < 1.0
+
+
+def test_wait_times_out_without_changes():
+    state = VersionedState("a")
+    version, _ = state.current
+    started = time.time()
+    assert state.wait(version, 0.05) == (version, "a")
+    assert time.time() - started >= 0.04
+
+
+def test_wait_wakes_on_set():
+    state = VersionedState("a")
+    version, _ = state.current
+    threading.Timer(0.05, state.set, args=("b",)).start()
+    started = time.time()
+    new_version, value = state.wait(version, 5.0)
+    assert value == "b" and new_version != version
+    assert time.time() - started < 1.0
+
+
+def test_versions_never_repeat_across_sources():
+    first, second = VersionedState(), VersionedState()
+    assert first.current[0] != second.current[0]
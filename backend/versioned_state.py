@@ -0,0 +1,56 @@
+"""
+Versioned state sources for conditional GET and long-polling.
+
+A VersionedState holds the current value of one state endpoint and a version
+that only advances when that value actually changes. Versions come from one
+process-wide counter, so they increase monotonically per source and never
+repeat across sources - a source re-created after a session is evicted can't
+accidentally match a version a client still holds.
+"""
+import itertools
+import threading
+
+_versions = itertools.count(1)
+
+
+class VersionedState:
+    """Current value + version of one state source.
+
+    Args:
+        value: Initial value.
+        condition: threading.Condition notified on changes. Pass a shared one to
+            publish several sources under one lock with set_locked().
+    """
+    __slots__ = ("changed", "_current")
+
+    def __init__(self, value=None, condition=None):
+        self.changed = condition or threading.Condition()
+        self._current = (next(_versions), value)
+
+    @property
+    def current(self):
+        """(version, value) - a single atomic read, no lock."""
+        return self._current
+
+    def set(self, value):
+        """Store value; if it differs, bump the version and wake waiters. Returns the version."""
+        with self.changed:
+            if self.set_locked(value):
+                self.changed.notify_all()
+            return self._current[0]
+
+    def set_locked(self, value):
+        """set() for callers that hold self.changed and notify themselves; True if changed."""
+        if value == self._current[1]:
+            return False
+        self._current = (next(_versions), value)
+        return True
+
+    def wait(self, since, timeout):
+        """(version, value) once the version differs from since, or after timeout."""
+        current = self._current
+        if current[0] == since and timeout > 0:
+            with self.changed:
+                self.changed.wait_for(lambda: self._current[0] != since, timeout)
+            current = self._current
+        return current
@@ -183,6 +183,12 @@ firebase.auth().onAuthStateChanged(async (user) => {
   }
 });
 
+// Per-tab id so the backend pins one hand detector and one gesture pipeline
+// (debounce timers, pen smoothing, whiteboard state) to this client
+const frameSessionId = (window.crypto && crypto.randomUUID)
+  ? crypto.randomUUID()
+  : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
 // Add Firebase ID token to all fetch requests with auto-refresh on 401
 const originalFetch = window.fetch;
 window.fetch = async function(url, options = {}) {
@@ -191,6 +197,13 @@ window.fetch = async function(url, options = {}) {
     options.headers['Authorization'] = `Bearer ${userIdToken}`;
     options.credentials = options.credentials || 'same-origin';
   }
+  // State polls must read the same session the frames are sent to
+  if (!url.startsWith('http') || url.startsWith(BACKEND_URL)) {
+    options.headers = options.headers || {};
+    if (!options.headers['X-Session-Id']) {
+      options.headers['X-Session-Id'] = frameSessionId;
+    }
+  }
   
   const response = await originalFetch(url, options);
   
@@ -648,6 +661,7 @@ function clearAppInterval(id) {
 function clearAllIntervals() {
   appIntervals.forEach(id => clearInterval(id));
   appIntervals.clear();
+  closeGestureStream();
   
   // Clear screen-specific intervals
   Object.keys(screenStates).forEach(screenId => {
@@ -1274,6 +1288,7 @@ if (stopCameraBtn) {
       clearInterval(window.frameProcessingInterval);
       window.frameProcessingInterval = null;
     }
+    closeFrameSocket();
     
     cameraActive = false;
     cameraRequested = false;
@@ -1308,6 +1323,134 @@ if (stopCameraBtn) {
 // Frame processing function
 let lastGesture = 'none';
 
+// Persistent frame channel (falls back to HTTP POST when unavailable)
+let frameSocket = null;
+let frameSeq = 0;
+let lastResultSeq = -1;
+let framesInFlight = 0;
+let frameSocketMode = null;
+const MAX_FRAMES_IN_FLIGHT = 2;
+
+// Binary result records (backend/binary_state.py, schema 1): 26 bytes instead of ~300 of JSON
+const STATE_SCHEMA_VERSION = 1;
+const STATE_GESTURES = ['unknown', 'one_finger_up', 'two_fingers_up', 'three_fingers_up',
+  'pinky_finger_up', 'thumbs_up', 'fist', 'open_palm'];
+const STATE_ACTIONS = [null, 'draw', 'erase', 'color_change', 'clear_canvas'];
+const STATE_MOTION_EVENTS = [null, 'swipe_left', 'swipe_right', 'hold', 'circle_cw', 'circle_ccw'];
+
+function decodeStateRecord(buffer) {
+  const view = new DataView(buffer);
+  if (view.getUint8(0) !== STATE_SCHEMA_VERSION) throw new Error('Unsupported state schema');
+  const flags = view.getUint8(1);
+  const unit = (offset) => view.getUint16(offset, true) / 65535;
+  const gestureName = (code) => (code === 255 ? null : STATE_GESTURES[code]);
+  const record = {
+    gesture: gestureName(view.getUint8(2)) || 'none',
+    action: STATE_ACTIONS[view.getUint8(3)],
+    hand_position: { x: unit(4), y: unit(6), z: view.getInt16(8, true) / 32767, visible: !!(flags & 1) },
+    pen: { x: unit(10), y: unit(12), pen_down: !!(flags & 2) },
+    stroke_size: view.getUint8(14),
+    motion: { event: STATE_MOTION_EVENTS[view.getUint8(15)], seq: view.getUint16(16, true), gesture: gestureName(view.getUint8(21)) },
+    hand_detected: !!(flags & 4),
+    cached: !!(flags & 8),
+    dropped: !!(flags & 16),
+    error: (flags & 32) ? 'Frame failed on the server' : undefined,
+    result_age: view.getUint16(18, true) / 1000,
+    queue_depth: view.getUint8(20),
+    seq: view.getUint32(22, true)
+  };
+  if (flags & 64) {
+    const points = new Uint16Array(buffer.slice(26, 26 + 126));
+    record.landmarks = [];
+    for (let i = 0; i < 63; i += 3) {
+      record.landmarks.push([points[i] / 65535, points[i + 1] / 65535, points[i + 2] / 65535 * 2 - 1]);
+    }
+  }
+  return record;
+}
+
+function openFrameSocket(backendUrl) {
+  if (!('WebSocket' in window)) return null;
+  
+  const base = backendUrl || window.location.origin;
+  let socket;
+  try {
+    socket = new WebSocket(`${base.replace(/^http/, 'ws')}/ws/frames?session=${encodeURIComponent(frameSessionId)}&format=binary`);
+  } catch (error) {
+    console.warn('[Frame Socket] Unavailable, using HTTP:', error);
+    return null;
+  }
+  socket.binaryType = 'arraybuffer';
+  
+  socket.onopen = () => {
+    console.log('[Frame Socket] Connected');
+    framesInFlight = 0;
+    frameSocketMode = null;
+  };
+  
+  socket.onmessage = (event) => {
+    // Results are binary records; text messages are control replies (e.g. pong)
+    const data = (event.data instanceof ArrayBuffer) ? decodeStateRecord(event.data) : JSON.parse(event.data);
+    if (data.seq === undefined) return;
+    
+    framesInFlight = Math.max(0, framesInFlight - 1);
+    // Drop results that arrive after a newer frame's result
+    if (data.seq <= lastResultSeq || data.error) return;
+    lastResultSeq = data.seq;
+    handleFrameResult(data);
+  };
+  
+  socket.onclose = () => {
+    console.log('[Frame Socket] Closed');
+    if (frameSocket === socket) frameSocket = null;
+    framesInFlight = 0;
+  };
+  
+  return socket;
+}
+
+// Tells the backend which inference resolution to use (pen tracking needs more detail)
+function currentFrameMode() {
+  if (screens.whiteboard && screens.whiteboard.classList.contains('active')) return 'whiteboard';
+  if (screens.games && screens.games.classList.contains('active')) return 'game';
+  return 'gesture';
+}
+
+function closeFrameSocket() {
+  if (frameSocket) {
+    frameSocket.close();
+    frameSocket = null;
+  }
+}
+
+function handleFrameResult(data) {
+  // Superseded by a newer frame on the server - nothing to show
+  if (data.dropped) return;
+  
+  // Update gesture display
+  if (data.gesture !== lastGesture) {
+    lastGesture = data.gesture;
+    console.log('[Gesture]', data.gesture);
+    
+    // Update dashboard
+    const dashLastGesture = document.getElementById('dashboard-last-gesture');
+    if (dashLastGesture) {
+      dashLastGesture.textContent = data.gesture || 'None';
+    }
+    
+    const dashDetectionStatus = document.getElementById('dashboard-detection-status');
+    if (dashDetectionStatus) {
+      if (data.gesture && data.gesture !== 'none' && data.gesture !== 'unknown') {
+        dashDetectionStatus.textContent = 'Detecting';
+        dashDetectionStatus.style.color = '#34d399';
+      } else {
+        dashDetectionStatus.textContent = 'Standby';
+        dashDetectionStatus.style.color = '#94a3b8';
+      }
+    }
+  }
+}
+
 function startFrameProcessing() {
   const video = document.getElementById('video');
   const canvas = document.getElementById('canvas');
@@ -1322,9 +1465,19 @@ function startFrameProcessing() {
     clearInterval(window.frameProcessingInterval);
   }
   
+  // Use backend URL from config (fallback to relative path for local dev)
+  const backendUrl = typeof BACKEND_URL !== 'undefined' ? BACKEND_URL : '';
+  
+  closeFrameSocket();
+  frameSocket = openFrameSocket(backendUrl);
+  
   window.frameProcessingInterval = setInterval(async () => {
     if (!video.videoWidth || !cameraActive) return;
     
+    const socketOpen = frameSocket && frameSocket.readyState === WebSocket.OPEN;
+    // Don't queue frames behind a slow server - skip this tick instead
+    if (socketOpen && framesInFlight >= MAX_FRAMES_IN_FLIGHT) return;
+    
     canvas.width = video.videoWidth;
     canvas.height = video.videoHeight;
     
@@ -1336,20 +1489,37 @@ function startFrameProcessing() {
     ctx.drawImage(video, -canvas.width, 0, canvas.width, canvas.height);
     ctx.restore();
     
-    // ✅ STEP 5 — FRONTEND MUST SEND BASE64 FRAME
-    const frame = canvas.toDataURL('image/jpeg', 0.7);
+    // ✅ STEP 5 — SEND RAW JPEG BYTES (no base64/JSON overhead)
+    const frame = await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', 0.7));
+    if (!frame) return;
+    
+    const mode = currentFrameMode();
     
-    // Use backend URL from config (fallback to relative path for local dev)
-    const backendUrl = typeof BACKEND_URL !== 'undefined' ? BACKEND_URL : '';
+    if (socketOpen && frameSocket.readyState === WebSocket.OPEN) {
+      if (mode !== frameSocketMode) {
+        frameSocket.send(JSON.stringify({ type: 'mode', mode }));
+        frameSocketMode = mode;
+      }
+      // [4-byte big-endian seq][image bytes]
+      const seq = frameSeq = (frameSeq + 1) >>> 0;
+      const message = new Uint8Array(4 + frame.size);
+      new DataView(message.buffer).setUint32(0, seq);
+      message.set(new Uint8Array(await frame.arrayBuffer()), 4);
+      framesInFlight++;
+      frameSocket.send(message);
+      return;
+    }
     
     try {
       const res = await fetch(`${backendUrl}/process-frame`, {
         method: 'POST',
         headers: { 
-          'Content-Type': 'application/json',
+          'Content-Type': 'image/jpeg',
+          'X-Session-Id': frameSessionId,
+          'X-Frame-Mode': mode,
           'Authorization': userIdToken ? `Bearer ${userIdToken}` : ''
         },
-        body: JSON.stringify({ frame })
+        body: frame
       });
       
       if (!res.ok) {
@@ -1357,30 +1527,7 @@ function startFrameProcessing() {
         return;
       }
       
-      const data = await res.json();
-      
-      // Update gesture display
-      if (data.gesture !== lastGesture) {
-        lastGesture = data.gesture;
-        console.log('[Gesture]', data.gesture);
-        
-        // Update dashboard
-        const dashLastGesture = document.getElementById('dashboard-last-gesture');
-        if (dashLastGesture) {
-          dashLastGesture.textContent = data.gesture || 'None';
-        }
-        
-        const dashDetectionStatus = document.getElementById('dashboard-detection-status');
-        if (dashDetectionStatus) {
-          if (data.gesture && data.gesture !== 'none' && data.gesture !== 'unknown') {
-            dashDetectionStatus.textContent = 'Detecting';
-            dashDetectionStatus.style.color = '#34d399';
-          } else {
-            dashDetectionStatus.textContent = 'Standby';
-            dashDetectionStatus.style.color = '#94a3b8';
-          }
-        }
-      }
+      handleFrameResult(await res.json());
       
     } catch (error) {
       console.error('[Frame Processing] Error:', error);
@@ -1747,6 +1894,9 @@ function startGestureDetection(screenId) {
   
   screenStates[screenId].gestureUpdateActive = true;
   gestureActive = true;
+
+  // Prefer the pushed state stream; poll only if it's unavailable
+  if (openGestureStream(screenId)) return;
   
   // Start gesture polling for this screen
   screenStates[screenId].gestureInterval = setAppInterval(() => {
@@ -1765,17 +1915,7 @@ function startGestureDetection(screenId) {
         }
         return response.json();
       })
-      .then(data => {
-        // Update gesture UI for this screen
-        updateGestureUIForScreen(screenId, data.gesture);
-        
-        // Screen-specific gesture handling
-        if (screenId === 'games' && data.gesture && data.gesture !== 'unknown') {
-          handleGameGesture(data.gesture);
-        } else if (screenId === 'presentation' && data.gesture && data.gesture !== 'unknown') {
-          handlePresentationGesture(data.gesture);
-        }
-      })
+      .then(data => handleGestureUpdate(screenId, data))
       .catch(error => {
         console.error('Error fetching gesture:', error);
         updateGestureUIForScreen(screenId, null);
@@ -1783,9 +1923,110 @@ function startGestureDetection(screenId) {
   }, 200, screenId); // Balanced polling for stable gesture detection
 }
 
+function handleGestureUpdate(screenId, data) {
+  // Update gesture UI for this screen
+  updateGestureUIForScreen(screenId, data.gesture);
+  
+  // Screen-specific gesture handling
+  if (screenId === 'games' && data.gesture && data.gesture !== 'unknown') {
+    handleGameGesture(data.gesture);
+  } else if (screenId === 'presentation' && data.gesture && data.gesture !== 'unknown') {
+    handlePresentationGesture(data.gesture);
+  }
+  if (screenId === 'presentation' && data.motion) {
+    handlePresentationMotion(data.motion);
+  }
+}
+
+// Server-Sent Events: the backend pushes state only when it changes (no per-poll auth)
+let gestureStream = null;
+let gestureStreamScreen = null; // Screen the open (or opening) stream belongs to
+let gestureStreamFailed = false; // Stay on polling once the stream is refused
+let gestureStreamRetries = 0;
+const GESTURE_STREAM_MAX_RETRIES = 3;
+
+function openGestureStream(screenId) {
+  if (!window.EventSource || !userIdToken || gestureStreamFailed) return false;
+  closeGestureStream();
+  gestureStreamScreen = screenId;
+  gestureStreamRetries = 0;
+  connectGestureStream(screenId);
+  return true;
+}
+
+async function connectGestureStream(screenId) {
+  // The ID token stays in the Authorization header; the stream URL only carries a
+  // short-lived, single-use ticket (URLs end up in server and proxy logs)
+  let ticket = null;
+  try {
+    const response = await fetch(`${BACKEND_URL}/state_stream/ticket`, {
+      method: 'POST',
+      headers: { 'Authorization': `Bearer ${userIdToken}` }
+    });
+    if (response.ok) ticket = (await response.json()).ticket;
+  } catch (error) {
+    console.error('Error fetching stream ticket:', error);
+  }
+  // Stream closed or moved to another screen while the ticket was on its way
+  if (gestureStreamScreen !== screenId) return;
+  if (!ticket) {
+    fallBackToGesturePolling(screenId);
+    return;
+  }
+
+  const params = new URLSearchParams({ ticket, session: frameSessionId });
+  const stream = new EventSource(`${BACKEND_URL}/state_stream?${params}`);
+  gestureStream = stream;
+  stream.onopen = () => { gestureStreamRetries = 0; };
+  stream.onmessage = (event) => {
+    if (!screenStates[screenId].gestureUpdateActive) return;
+    handleGestureUpdate(screenId, JSON.parse(event.data));
+  };
+  // The server ends the stream when the ID token expires: reconnect with a fresh one
+  stream.addEventListener('reauth', async () => {
+    stream.close();
+    if (gestureStream !== stream) return;
+    gestureStream = null;
+    await refreshFirebaseToken();
+    connectGestureStream(screenId);
+  });
+  stream.onerror = () => {
+    // A ticket is single-use, so EventSource's own retry can't succeed - reconnect
+    // with a new ticket a few times, then fall back to polling (e.g. server full)
+    stream.close();
+    if (gestureStream !== stream) return;
+    gestureStream = null;
+    if (gestureStreamRetries < GESTURE_STREAM_MAX_RETRIES) {
+      gestureStreamRetries++;
+      setTimeout(() => {
+        if (gestureStreamScreen === screenId) connectGestureStream(screenId);
+      }, 1000 * gestureStreamRetries);
+      return;
+    }
+    fallBackToGesturePolling(screenId);
+  };
+}
+
+function fallBackToGesturePolling(screenId) {
+  console.warn('[Gesture] State stream unavailable - falling back to polling');
+  gestureStreamScreen = null;
+  gestureStreamFailed = true;
+  screenStates[screenId].gestureUpdateActive = false;
+  startGestureDetection(screenId);
+}
+
+function closeGestureStream() {
+  gestureStreamScreen = null;
+  if (gestureStream) {
+    gestureStream.close();
+    gestureStream = null;
+  }
+}
+
 function stopGestureDetection() {
   // Stop gesture detection for all screens
   gestureActive = false;
+  closeGestureStream();
   Object.keys(screenStates).forEach(screenId => {
     if (screenStates[screenId].gestureInterval) {
       clearAppInterval(screenStates[screenId].gestureInterval);
@@ -2752,6 +2993,7 @@ let slideUrls = [];
 let lastPresentationGesture = null;
 let lastPresentationGestureTime = 0;
 const PRESENTATION_GESTURE_COOLDOWN = 1200; // 1200ms (1.2 seconds) to prevent rapid slide advancement
+let lastMotionSeq = null; // seq of the last temporal gesture (swipe) seen from the backend
 
 // Custom file picker
 document.getElementById('selectFileBtn')?.addEventListener('click', () => {
@@ -2997,6 +3239,23 @@ function handlePresentationGesture(gesture) {
   }
 }
 
+function handlePresentationMotion(motion) {
+  // The first poll only syncs the counter so an old swipe isn't replayed
+  const isNew = lastMotionSeq !== null && motion.seq !== lastMotionSeq;
+  lastMotionSeq = motion.seq;
+  if (!isNew || !presentationActive) return;
+
+  // Swipe left = Next, swipe right = Previous (like paging on a touchscreen)
+  if (motion.event === 'swipe_left') {
+    nextSlideAlternative();
+  } else if (motion.event === 'swipe_right') {
+    previousSlideAlternative();
+  } else {
+    return;
+  }
+  lastPresentationGestureTime = Date.now();
+}
+
 // Button event listeners
 document.getElementById('prev-slide-btn')?.addEventListener('click', previousSlideAlternative);
 document.getElementById('next-slide-btn')?.addEventListener('click', nextSlideAlternative);